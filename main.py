@@ -1,7 +1,23 @@
+import argparse
+import contextlib
+import struct
+import sys
+import time
+from typing import BinaryIO, Iterator
+
 from src.circuits import *
 
 
-def main() -> None:
+# binary records: little-endian A (u64), B (u64), cin (u8) in and
+# o (u64), cout (u8) out
+IN_RECORD = struct.Struct("<QQB")
+OUT_RECORD = struct.Struct("<QB")
+
+# number of records parsed/written per bulk read/write
+CHUNK_RECORDS = 4096
+
+
+def interactive() -> None:
     vdd = VDD()
 
     ksa = KSA64R2Cin(vdd)
@@ -55,5 +71,176 @@ def main() -> None:
             return
 
 
+def parse_text(
+    lines: list[bytes], first_line: int = 1
+) -> list[tuple[int, int, int]]:
+    """Parse ``A B cin`` lines (numbered from ``first_line`` in error
+    messages).
+
+    """
+
+    mask = (1 << 64) - 1
+    chunk = list()
+
+    for number, line in enumerate(lines, first_line):
+        fields = line.split()
+        if not fields:
+            continue
+        if len(fields) != 3:
+            raise ValueError(
+                f"line {number}: expected 'A B cin', got {line!r}"
+            )
+        try:
+            a, b, c = (int(f, 0) for f in fields)
+        except ValueError:
+            raise ValueError(
+                f"line {number}: invalid integer in {line!r}"
+            ) from None
+        if not (0 <= a <= mask and 0 <= b <= mask and c in (0, 1)):
+            raise ValueError(
+                f"line {number}: operand out of range: {line!r}"
+            )
+        chunk.append((a, b, c))
+
+    return chunk
+
+
+def read_text(stream: BinaryIO) -> Iterator[list[tuple[int, int, int]]]:
+    """Yield chunks of ``(A, B, cin)`` triples from whitespace-separated
+    text (one triple per line; any base accepted by ``int(x, 0)``).
+
+    """
+
+    pending = b""
+    first_line = 1
+
+    while True:
+        data = stream.read(CHUNK_RECORDS * 48)
+        if not data:
+            break
+
+        lines = (pending + data).split(b"\n")
+        pending = lines.pop()
+        yield parse_text(lines, first_line)
+        first_line += len(lines)
+
+    if pending:
+        yield parse_text([pending], first_line)
+
+
+def read_binary(stream: BinaryIO) -> Iterator[list[tuple[int, int, int]]]:
+    """Yield chunks of ``(A, B, cin)`` triples from packed records
+    (numbered from 0 in error messages).
+
+    """
+
+    size = IN_RECORD.size
+    first_record = 0
+
+    while True:
+        data = stream.read(CHUNK_RECORDS * size)
+        if not data:
+            return
+
+        if len(data) % size:
+            # short read; top up to a whole number of records
+            rest = stream.read(size - (len(data) % size))
+            data += rest
+            if len(data) % size:
+                raise ValueError("Truncated binary input record")
+
+        chunk = list(IN_RECORD.iter_unpack(data))
+        for index, (_, _, c) in enumerate(chunk, first_record):
+            if c > 1:
+                raise ValueError(
+                    f"record {index}: carry-in out of range: {c}"
+                )
+        yield chunk
+        first_record += len(chunk)
+
+
+def batch(args: argparse.Namespace) -> None:
+    vdd = VDD()
+    adder = AdderInterface(KSA64R2Cin(vdd))
+    vdd.energize()
+
+    reader = read_binary if args.format == "binary" else read_text
+    pack = OUT_RECORD.pack
+    add = adder.add
+    count = 0
+    start = time.perf_counter()
+
+    try:
+        with contextlib.ExitStack() as stack:
+            if args.input == "-":
+                infile = sys.stdin.buffer
+            else:
+                infile = stack.enter_context(open(args.input, "rb"))
+            if args.output == "-":
+                outfile = sys.stdout.buffer
+            else:
+                outfile = stack.enter_context(open(args.output, "wb"))
+            stack.callback(outfile.flush)
+
+            for chunk in reader(infile):
+                if args.format == "binary":
+                    out = b"".join(pack(*add(a, b, c)) for a, b, c in chunk)
+                else:
+                    out = "".join(
+                        f"{o} {int(cout)}\n" for o, cout in (
+                            add(a, b, c) for a, b, c in chunk
+                        )
+                    ).encode()
+
+                outfile.write(out)
+                count += len(chunk)
+    except (OSError, ValueError) as e:
+        sys.exit(f"error: {e}")
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else 0.0
+        print(
+            f"{count} additions in {elapsed:.3f}s ({rate:.1f} additions/s,"
+            f" {1e6 / rate if rate else 0.0:.1f}us/addition)",
+            file=sys.stderr
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Simulate additions on a 64-bit Kogge-Stone adder."
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="read operand triples non-interactively and stream results"
+    )
+    parser.add_argument(
+        "-i", "--input", default="-",
+        help="batch input file ('-' for stdin, the default)"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="batch output file ('-' for stdout, the default)"
+    )
+    parser.add_argument(
+        "-f", "--format", choices=("text", "binary"), default="text",
+        help=(
+            "batch record format: 'A B cin' text lines in, 'o cout' lines"
+            " out; or packed '<QQB' records in, '<QB' records out"
+        )
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true",
+        help="do not print throughput statistics to stderr"
+    )
+    args = parser.parse_args()
+
+    if args.batch:
+        batch(args)
+    else:
+        interactive()
+
+
 if __name__ == "__main__":
     main()
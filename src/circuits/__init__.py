@@ -1,3 +1,21 @@
 from .core import *
 from .standard_cells import *
 from .macrocells import *
+from .drivers import *
+from .aio import *
+from .vectors import *
+from .cache import *
+from .state import *
+from .netlist import *
+from .faults import *
+from .symbolic import *
+from .coverage import *
+from .fuzz import *
+from .metrics import *
+from .sequential import *
+from .timing import *
+from .structural import *
+from .partition import *
+from .names import *
+from .lifetime import *
+from .eco import *
@@ -0,0 +1,210 @@
+from __future__ import annotations
+import asyncio
+import concurrent.futures
+from typing import Callable, Optional, Sequence, Union
+
+from .drivers import AdderInterface
+
+
+__all__ = (
+    "AsyncAdder",
+)
+
+
+Operands = tuple[int, int, int]
+Result = tuple[int, bool]
+
+
+class AsyncAdder:
+    """An asyncio front-end for an energized adder macro-cell.
+
+    Concurrent calls to :meth:`add` are queued, and a background task
+    gathers them into batches of up to ``max_batch`` requests (waiting at
+    most ``window`` seconds after the first request of a batch). Each
+    batch is evaluated off the event loop in ``executor`` before the
+    callers' futures resolve.
+
+    """
+
+    def __init__(
+        self,
+        adder: AdderInterface,
+        *,
+        max_batch: int = 256,
+        window: float = 0.001,
+        executor: Optional[concurrent.futures.Executor] = None,
+        evaluate: Optional[
+            Callable[[Sequence[Operands]], Sequence[Result]]
+        ] = None,
+    ) -> None:
+        """
+        :param adder: The interface of the (energized) adder.
+        :type adder: AdderInterface
+        :param max_batch: The maximum number of requests per batch.
+        :type max_batch: int
+        :param window: The maximum time (in seconds) to wait for more
+            requests after the first request of a batch arrives.
+        :type window: float
+        :param executor: The executor batches are evaluated in. A circuit
+            holds mutable state, so the default is a private
+            single-threaded executor; a custom executor must not run two
+            batches for the same circuit at once.
+        :type executor: Optional[concurrent.futures.Executor]
+        :param evaluate: An alternate batch evaluation path taking a
+            sequence of ``(i0, i1, cin)`` operands and returning the
+            ``(o, cout)`` results in the same order. Defaults to driving
+            ``adder`` once per request.
+
+        """
+
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+
+        self.adder = adder
+        self.max_batch = max_batch
+        self.window = window
+        self.evaluate = self._evaluate if evaluate is None else evaluate
+        self._owns_executor = executor is None
+        self._executor = executor
+        self._queue: Optional[asyncio.Queue[
+            Union[tuple[Operands, asyncio.Future[Result]], None]
+        ]] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self.num_requests: int = 0
+        self.num_batches: int = 0
+
+    async def __aenter__(self) -> AsyncAdder:
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """Start the batching task on the running event loop (again, if
+        the adder was closed or its task was cancelled).
+
+        """
+
+        if self._task is not None and not self._task.done():
+            return
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(1)
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """Finish all queued requests and stop the batching task.
+
+        The private executor is shut down; :meth:`add` and :meth:`start`
+        create a new one.
+
+        """
+
+        if self._task is None:
+            return
+
+        try:
+            # a cancelled task has already cancelled its requests
+            if not self._task.done():
+                self._queue.put_nowait(None)
+                await self._task
+        finally:
+            self._task = None
+            self._queue = None
+
+            if self._owns_executor and self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    async def add(self, i0: int, i1: int, cin: int = 0) -> Result:
+        """Queue an addition and wait for its ``(o, cout)`` result."""
+        self.start()
+        future: asyncio.Future[Result] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._queue.put_nowait(((i0, i1, cin), future))
+        return await future
+
+    def _evaluate(self, operands: Sequence[Operands]) -> list[Result]:
+        add = self.adder.add
+        return [add(*ops) for ops in operands]
+
+    async def _collect(
+        self, batch: list[tuple[Operands, asyncio.Future[Result]]]
+    ) -> bool:
+        # fills ``batch`` in place, so that the requests taken from the
+        # queue so far are known if the task is cancelled
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+
+        first = await queue.get()
+        if first is None:
+            return True
+        batch.append(first)
+
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            # take whatever is already queued without waiting
+            if queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = queue.get_nowait()
+
+            if item is None:
+                return True
+            batch.append(item)
+
+        return False
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        batch = list()
+        done = False
+
+        try:
+            while not done:
+                batch = list()
+                done = await self._collect(batch)
+                if not batch:
+                    continue
+
+                operands = [ops for ops, _ in batch]
+                try:
+                    results = await loop.run_in_executor(
+                        self._executor, self.evaluate, operands
+                    )
+                    if len(results) != len(batch):
+                        raise RuntimeError(
+                            f"evaluate returned {len(results)} results for"
+                            f" {len(batch)} requests"
+                        )
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for (_, future), result in zip(batch, results):
+                        if not future.done():
+                            future.set_result(result)
+
+                self.num_requests += len(batch)
+                self.num_batches += 1
+        finally:
+            # if the task was cancelled, nobody is left to resolve the
+            # requests taken from the queue or still in it (after a normal
+            # close every request is already resolved)
+            for _, future in batch:
+                future.cancel()
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None:
+                    item[1].cancel()
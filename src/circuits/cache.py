@@ -0,0 +1,162 @@
+from __future__ import annotations
+import collections
+import dataclasses
+from typing import Sequence
+
+from .core import Reachable, SignalInterface, Via, netlist_revision
+from .drivers import AdderInterface
+
+
+__all__ = (
+    "CacheInfo",
+    "CachedInterface",
+    "CachedAdder",
+)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachedInterface:
+    """A size-bounded LRU cache of a circuit's output signals keyed by
+    its input signals.
+
+    A hit returns the cached outputs without setting the inputs at all,
+    so no state is propagated and the circuit keeps the state of the
+    last miss. The cache is cleared automatically whenever the circuit
+    the interfaces belong to is modified (see :func:`netlist_revision`);
+    changes to other circuits leave it intact.
+
+    Stuck-at faults are not seen by the cache: they are only injected
+    into compiled netlists (see :class:`~circuits.faults.FaultSimulator`),
+    never into a live circuit. Call :meth:`invalidate` after anything
+    else that changes what the circuit computes for the same inputs.
+
+    """
+
+    def __init__(
+        self,
+        inputs: Sequence[SignalInterface],
+        outputs: Sequence[SignalInterface],
+        maxsize: int = 4096,
+    ) -> None:
+        """
+        :param inputs: The interfaces of the circuit's inputs.
+        :type inputs: Sequence[SignalInterface]
+        :param outputs: The interfaces of the circuit's outputs.
+        :type outputs: Sequence[SignalInterface]
+        :param maxsize: The maximum number of cached entries.
+        :type maxsize: int
+
+        """
+
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.maxsize = maxsize
+        self._cache: collections.OrderedDict[
+            tuple[int, ...], tuple[int, ...]
+        ] = collections.OrderedDict()
+        self._revision = netlist_revision()
+        self._vias = self._reachable()
+        self._circuit_revision = netlist_revision(self._vias)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def evaluate(self, *signals: int) -> tuple[int, ...]:
+        """Return the output signals for the given input signals."""
+        if len(signals) != len(self.inputs):
+            raise ValueError(
+                f"Expected {len(self.inputs)} signals, got {len(signals)}"
+            )
+
+        revision = netlist_revision()
+        if revision != self._revision:
+            # some netlist changed; check that it is this one
+            self._revision = revision
+            if netlist_revision(self._vias) != self._circuit_revision:
+                self.invalidate()
+                self._vias = self._reachable()
+                self._circuit_revision = netlist_revision(self._vias)
+
+        cache = self._cache
+        result = cache.get(signals)
+
+        if result is not None:
+            cache.move_to_end(signals)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        for interface, signal in zip(self.inputs, signals):
+            interface.set_signal(signal)
+        result = tuple(o.get_signal() for o in self.outputs)
+
+        cache[signals] = result
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self.evictions += 1
+
+        return result
+
+    def _reachable(self) -> tuple[Via, ...]:
+        return Reachable.from_roots(
+            *(v for i in (*self.inputs, *self.outputs) for v in i.vias)
+        ).vias
+
+    def invalidate(self) -> None:
+        """Drop all cached entries."""
+        if self._cache:
+            self._cache.clear()
+            self.invalidations += 1
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+            size=len(self._cache),
+            maxsize=self.maxsize,
+        )
+
+
+class CachedAdder(CachedInterface):
+    """A :class:`CachedInterface` over an :class:`AdderInterface`, usable
+    anywhere the adder interface is (it has the same :meth:`add`).
+
+    """
+
+    def __init__(self, adder: AdderInterface, maxsize: int = 4096) -> None:
+        super().__init__(
+            (adder.i0, adder.i1, adder.cin), (adder.o, adder.cout), maxsize
+        )
+        self.adder = adder
+        self.width = adder.width
+
+    @property
+    def mask(self) -> int:
+        return self.adder.mask
+
+    def add(self, i0: int, i1: int, cin: int = 0) -> tuple[int, bool]:
+        o, cout = self.evaluate(i0, i1, cin)
+        return o, not not cout
@@ -1,8 +1,12 @@
 from __future__ import annotations
 import dataclasses
 import operator
+import sys
 from typing import *
 
+if TYPE_CHECKING:
+    from .state import CircuitFork
+
 
 __all__ = (
     "Components",
@@ -22,10 +26,183 @@ __all__ = (
     "Interconnect",
     "FinFET",
     "PTypeFinFET",
+    "Bus",
     "SignalInterface",
+    "Reachable",
+    "netlist_revision",
+    "OscillationError",
+    "PropagationGuard",
 )
 
 
+# incremented whenever any via's connections change; used to invalidate
+# anything derived from the structure of a circuit
+_revision: int = 0
+
+
+def netlist_revision(vias: Optional[Iterable[Via]] = None) -> int:
+    """Return a counter that changes whenever a netlist is modified
+    (i.e. a state effector is registered on any via).
+
+    :param vias: Only count the modifications of these vias (e.g. the
+        :attr:`Reachable.vias` of a circuit, which cover every change
+        to it, since connecting or disconnecting anything modifies one
+        of them). Summing their counters is linear in their number, so
+        check the (global) counter first.
+    :type vias: Optional[Iterable[Via]]
+
+    """
+
+    if vias is None:
+        return _revision
+    return sum(v.revision for v in vias)
+
+
+def _bump_revision(*vias: Via) -> None:
+    global _revision
+    _revision += 1
+    for v in vias:
+        v.revision += 1
+
+
+# maps bytes of 0/1 flags to ascii binary digits
+_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+_get_energized = operator.attrgetter("energized")
+
+
+def _bitset(flags: bytes) -> int:
+    # bit i is set when flags[i] is set
+    return int(flags.translate(_DIGITS)[::-1] or b"0", 2)
+
+
+# the active propagation guard, if any
+_guard: Optional[PropagationGuard] = None
+
+# the active event counters (see metrics.py), notified of every state
+# effector callback
+_counters: list[Any] = list()
+
+
+class OscillationError(RuntimeError):
+    """Raised by a :class:`PropagationGuard` when an input change does
+    not converge.
+
+    """
+
+    def __init__(
+        self, message: str, vias: tuple[Via, ...], events: int
+    ) -> None:
+        super().__init__(message)
+        self.vias = vias
+        """The vias of the feedback loop the propagation was stuck in
+        (empty if none was found)"""
+
+        self.events = events
+
+
+class PropagationGuard:
+    """Bounds the propagation of every input change (a :meth:`Via.set_state`
+    call made outside of propagation) while active, i.e. inside a
+    ``with`` block.
+
+    An input change that takes more than ``max_events`` state effector
+    callbacks does not converge. Neither does one whose nested callbacks
+    pass the same via again once they are ``max_depth`` deep: it is stuck
+    in a feedback loop (e.g. a ring of inverters) that would otherwise
+    recurse until ``RecursionError``. Deep propagation without a repeated
+    via (e.g. a carry rippling through a long adder) is not an error. An
+    :class:`OscillationError` is raised instead, naming the loop (the
+    part of the current propagation path between two visits of the same
+    via). The circuit's state is undefined afterwards, so discard it or
+    restore a :class:`~circuits.state.Checkpoint`.
+
+    The guard applies to all circuits while active.
+
+    """
+
+    def __init__(
+        self,
+        max_events: int = 1_000_000,
+        max_depth: Optional[int] = None,
+    ) -> None:
+        """
+        :param max_events: The event budget of each input change.
+        :type max_events: int
+        :param max_depth: The nesting of events at which (and at every
+            multiple of which) the propagation path is checked for a
+            feedback loop (a quarter of the recursion limit by default).
+        :type max_depth: Optional[int]
+
+        """
+
+        self.max_events = max_events
+        self.max_depth = (
+            sys.getrecursionlimit() // 4 if max_depth is None else max_depth
+        )
+        self.events = 0
+        """The number of events of the last input change"""
+
+        self._path: list[Via] = list()
+        self._previous: Optional[PropagationGuard] = None
+
+    def __enter__(self) -> PropagationGuard:
+        global _guard
+        self._previous = _guard
+        _guard = self
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        global _guard
+        _guard = self._previous
+        self._previous = None
+
+    def _loop(self, via: Via) -> tuple[Via, ...]:
+        # the part of the path between the last two visits of a via
+        path = (*self._path, via)
+        seen: dict[int, int] = dict()
+        for i, v in enumerate(path):
+            if id(v) in seen:
+                return path[seen[id(v)]:i]
+            seen[id(v)] = i
+        return ()
+
+    def _propagate(
+        self, via: Via, effector: StateEffector, state_changed: bool
+    ) -> None:
+        path = self._path
+        if not path:
+            self.events = 0
+
+        self.events += 1
+        if self.events > self.max_events:
+            loop = self._loop(via)
+            message = (
+                f"Propagation did not converge after {self.events} events"
+            )
+            if loop:
+                message += f" ({len(loop)} vias in the feedback loop)"
+            raise OscillationError(message, loop, self.events)
+
+        depth = len(path)
+        if depth and depth % self.max_depth == 0:
+            # only a via revisited deeper down the path is an oscillation
+            loop = self._loop(via)
+            if loop:
+                raise OscillationError(
+                    f"Propagation did not converge after {self.events}"
+                    f" events ({len(loop)} vias in the feedback loop)",
+                    loop,
+                    self.events,
+                )
+
+        path.append(via)
+        try:
+            effector.callback(via, state_changed)
+        finally:
+            path.pop()
+
+
 @dataclasses.dataclass(eq=False, frozen=True, slots=True)
 class Components:
     cells: tuple[Cell, ...]
@@ -100,7 +277,7 @@ class TempComponents:
 
 
 class Cell:
-    __slots__ = ("components",)
+    __slots__ = ("components", "__weakref__")
 
     components: Components
 
@@ -121,6 +298,15 @@ class Cell:
     def _init(self, vdd: VDD) -> None:
         raise NotImplementedError
 
+    def fork(self) -> CircuitFork:
+        """Fork the state of this (energized) cell. See
+        :class:`~circuits.state.CircuitFork`.
+
+        """
+
+        from .state import CircuitState
+        return CircuitState.of(self).fork()
+
 
 class StateEffector:
     __slots__ = ("id", "callback", "energized")
@@ -154,7 +340,10 @@ class Cap(StateEffector):
             type(self) if identity is None else identity, self._callback
         )
 
-    def _callback(self, via: Via, state_changed: bool, /) -> None:
+    # static, so that the effector does not reference itself through a
+    # bound method (and is freed without a cyclic GC pass)
+    @staticmethod
+    def _callback(via: Via, state_changed: bool, /) -> None:
         return
 
 
@@ -162,6 +351,13 @@ class Via:
     def __init__(self) -> None:
         self.effectors: dict[int, StateEffector] = dict()
         self.opposing_effectors: dict[int, StateEffector] = dict()
+        # incremented whenever the state effectors change (see
+        # netlist_revision)
+        self.revision: int = 0
+        # the set this via is added to whenever one of its state
+        # effectors is written, while its circuit has forks (see
+        # state.py)
+        self.log: Optional[set[Via]] = None
 
     def __repr__(self) -> str:
         effectors = tuple(
@@ -170,6 +366,8 @@ class Via:
         return f"{type(self).__name__}[{effectors[0]} {effectors[1]}]"
 
     def register(self, effector: StateEffector) -> None:
+        _bump_revision(self)
+
         if not self.effectors:
             self.effectors[effector.id] = effector
             return
@@ -195,15 +393,24 @@ class Via:
         # if we only have one effector, we don't need to deal with
         # callbacks
         if not self.opposing_effectors:
-            a0.set_state(state)
+            if a0.set_state(state) and self.log is not None:
+                self.log.add(self)
             return
 
         a1 = self.opposing_effectors[id_]
         was_double_off = not (a0.energized or a1.energized)
 
         if a0.set_state(state):
+            if self.log is not None:
+                self.log.add(self)
             state_changed = was_double_off or not (state or a1.energized)
-            a1.callback(self, state_changed)
+            if _counters:
+                for counter in _counters:
+                    counter._count(self)
+            if _guard is None:
+                a1.callback(self, state_changed)
+            else:
+                _guard._propagate(self, a1, state_changed)
 
     @property
     def energized(self) -> bool:
@@ -301,7 +508,10 @@ class VDDStateEffector(StateEffector):
         super().__init__(power_rail, self._callback)
         object.__setattr__(self, "power_rail", power_rail)
 
-    def _callback(self, via: Via, state_changed: bool, /) -> None:
+    # static, so that the effector does not reference itself through a
+    # bound method (and is freed without a cyclic GC pass)
+    @staticmethod
+    def _callback(via: Via, state_changed: bool, /) -> None:
         return
 
     def set_state(self, energized: bool, /) -> bool:
@@ -489,26 +699,215 @@ class PTypeFinFET(FinFET):
         super().__init__(True)
 
 
+class Bus(tuple[Via, ...]):
+    """A group of parallel vias (bit 0 first) with bulk wiring and packed
+    integer state.
+
+    A bus is a tuple, so it can be used wherever a group of vias is
+    (e.g. as a ``Via64``). Its state is read with a few integer
+    operations over the vias' state effectors (cached until the netlist
+    changes, see :func:`netlist_revision`), and writes only touch the
+    bits that change.
+
+    """
+
+    def __new__(cls, vias: Union[int, Iterable[Via]] = 0) -> Bus:
+        """
+        :param vias: The vias, or the number of new vias to create.
+        :type vias: Union[int, Iterable[Via]]
+
+        """
+
+        if isinstance(vias, int):
+            vias = [Via() for _ in range(vias)]
+        return super().__new__(cls, vias)
+
+    @overload
+    def __getitem__(self, index: SupportsIndex, /) -> Via: ...
+
+    @overload
+    def __getitem__(self, index: slice, /) -> Bus: ...
+
+    def __getitem__(
+        self, index: Union[SupportsIndex, slice], /
+    ) -> Union[Via, Bus]:
+        if isinstance(index, slice):
+            return Bus(super().__getitem__(index))
+        return super().__getitem__(index)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}[{self.get_signal():#x}/{len(self)}]"
+
+    @property
+    def width(self) -> int:
+        return len(self)
+
+    def bind(self, other: Iterable[Via], /) -> tuple[Binding, ...]:
+        """Bind every via to the via of the same bit of ``other``."""
+        return Binding.parallel(self, other)
+
+    def interconnect(
+        self, *others: Iterable[Via]
+    ) -> tuple[Interconnect, ...]:
+        """Interconnect every via with the vias of the same bit of
+        ``others``.
+
+        """
+
+        return Interconnect.parallel(self, *others)
+
+    def _sides(self) -> tuple[tuple[StateEffector, ...], ...]:
+        # the (up to) two state effectors of every via
+        cache = self.__dict__.get("_cache")
+        if cache is not None and cache[0] == _revision:
+            return cache[1]
+
+        side0 = list()
+        side1 = list()
+        for v in self:
+            effectors = (*v.effectors.values(), _UNCONNECTED, _UNCONNECTED)
+            side0.append(effectors[0])
+            side1.append(effectors[1])
+        sides = (tuple(side0), tuple(side1))
+        self.__dict__["_cache"] = (_revision, sides)
+        return sides
+
+    def get_signal(self) -> int:
+        """The state of every via, packed into an integer."""
+        side0, side1 = self._sides()
+        return (
+            _bitset(bytes(map(_get_energized, side0)))
+            | _bitset(bytes(map(_get_energized, side1)))
+        )
+
+    def set_signal(self, identity: Any, signal: int, /) -> None:
+        """Set the state of the state effectors of ``identity`` (which
+        must be registered on every via) to the bits of ``signal``, in
+        order from bit 0.
+
+        """
+
+        id_ = id(identity)
+        side0, side1 = self._sides()
+        current = 0
+        for side in (side0, side1):
+            current |= _bitset(bytes(
+                e.energized and e.id == id_ for e in side
+            ))
+
+        changed = (current ^ signal) & ((1 << len(self)) - 1)
+        while changed:
+            bit = changed & -changed
+            super().__getitem__(bit.bit_length() - 1).set_state(
+                identity, not not signal & bit
+            )
+            changed ^= bit
+
+
+# stands in for the state effectors of vias that have fewer than two
+_UNCONNECTED = StateEffector(None, lambda via, state_changed: None)
+
+
 class SignalInterface:
     def __init__(self, vias: Iterable[Via]) -> None:
         """
         :param vias: An iterable of vias where the first element is the
-            first bit (LSB) and the last element is the last bit (MSB).
+            first bit (LSB) and the last element is the last bit (MSB)
+            (e.g. a :class:`Bus`).
         :type vias: Iterable[Via]
 
         """
 
-        self.vias = tuple(vias)
+        self.vias = vias if isinstance(vias, Bus) else Bus(vias)
 
         for v in self.vias:
             v.register(Cap())
 
     def set_signal(self, signal: int, /):
-        for i, v in enumerate(self.vias):
-            v.set_state(Cap, not not ((signal >> i) & 1))
+        self.vias.set_signal(Cap, signal)
 
     def get_signal(self) -> int:
-        signal: int = 0
-        for i, v in enumerate(self.vias):
-            signal |= v.energized << i
-        return signal
+        return self.vias.get_signal()
+
+
+@dataclasses.dataclass(eq=False, frozen=True, slots=True)
+class Reachable:
+    """Every via, transistor, connection and power rail reachable from
+    a set of roots by following the state effectors registered on vias.
+
+    Unlike :class:`Components`, this also covers vias and connections
+    created outside of any cell (e.g. connections made by the user).
+
+    """
+
+    vias: tuple[Via, ...]
+    finfets: tuple[FinFET, ...]
+    interconnects: tuple[Interconnect, ...]
+    bindings: tuple[Binding, ...]
+    rails: tuple[VDD, ...]
+
+    @classmethod
+    def from_roots(
+        cls, *roots: Union[Cell, Via], exclude: Iterable[Cell] = ()
+    ) -> Reachable:
+        """
+        :param exclude: Cells whose FinFETs are left out (and not walked
+            through), e.g. to cut sequential cells out of a netlist.
+        :type exclude: Iterable[Cell]
+
+        """
+
+        excluded: set[int] = set()
+        for c in exclude:
+            excluded.update(
+                id(f) for f in (c, *c.components.all_cells())
+                if isinstance(f, FinFET)
+            )
+
+        vias: dict[int, Via] = dict()
+        finfets: dict[int, FinFET] = dict()
+        interconnects: dict[int, Interconnect] = dict()
+        bindings: dict[int, Binding] = dict()
+        rails: dict[int, VDD] = dict()
+
+        stack: list[Via] = list()
+        for r in reversed(roots):
+            if isinstance(r, Cell):
+                stack.extend(reversed(tuple(r.components.all_vias())))
+            else:
+                stack.append(r)
+
+        while stack:
+            via = stack.pop()
+            if id(via) in vias:
+                continue
+            vias[id(via)] = via
+
+            for e in via.effectors.values():
+                if isinstance(e, VDDStateEffector):
+                    rails.setdefault(id(e.power_rail), e.power_rail)
+                    continue
+
+                owner = getattr(e.callback, "__self__", None)
+                if isinstance(owner, FinFET):
+                    if id(owner) in excluded:
+                        continue
+                    if id(owner) not in finfets:
+                        finfets[id(owner)] = owner
+                        stack.extend((owner.drain, owner.gate, owner.source))
+                elif isinstance(owner, Interconnect):
+                    if id(owner) not in interconnects:
+                        interconnects[id(owner)] = owner
+                        stack.extend(reversed(owner.vias))
+                elif isinstance(owner, Binding):
+                    if id(owner) not in bindings:
+                        bindings[id(owner)] = owner
+                        stack.extend(reversed(owner.vias))
+
+        return cls(
+            vias=tuple(vias.values()),
+            finfets=tuple(finfets.values()),
+            interconnects=tuple(interconnects.values()),
+            bindings=tuple(bindings.values()),
+            rails=tuple(rails.values()),
+        )
@@ -0,0 +1,253 @@
+from __future__ import annotations
+import dataclasses
+import operator
+import os
+import struct
+from typing import Optional, Union
+
+from .core import Bus, Cell, Via, FinFET
+from .netlist import Netlist, cell_paths
+
+
+__all__ = (
+    "Coverage",
+    "CoverageCollector",
+)
+
+
+# magic, net count, transistor count, interconnect count, count stride
+HEADER = struct.Struct("<4sIIII")
+MAGIC = b"CCOV"
+
+_get_num_energized = operator.attrgetter("num_energized")
+
+
+def _bits(value: int, num_bits: int) -> bytes:
+    return value.to_bytes((num_bits + 7) // 8, "little")
+
+
+@dataclasses.dataclass(eq=False, slots=True)
+class Coverage:
+    """Toggle and state coverage bitsets of a design.
+
+    Bit ``n`` of ``high``/``low`` is set once net ``n`` has been observed
+    energized/de-energized, and bit ``c`` of ``counts[i]`` once
+    interconnect ``i`` has been observed with ``c`` energy providers.
+    Coverage of the same design merges with a bitwise or, so it can be
+    collected in separate workers and combined afterwards.
+
+    """
+
+    num_nets: int
+    num_transistors: int
+    count_stride: int
+    high: int = 0
+    low: int = 0
+    counts: list[int] = dataclasses.field(default_factory=list)
+
+    def merge(self, other: Coverage) -> None:
+        if (
+            self.num_nets != other.num_nets
+            or self.num_transistors != other.num_transistors
+            or len(self.counts) != len(other.counts)
+        ):
+            raise ValueError("Cannot merge coverage of different designs")
+
+        self.high |= other.high
+        self.low |= other.low
+        self.counts = [a | b for a, b in zip(self.counts, other.counts)]
+
+    def to_bytes(self) -> bytes:
+        stride = self.count_stride
+        counts = 0
+        for i, c in enumerate(self.counts):
+            counts |= c << (i * stride)
+
+        return b"".join((
+            HEADER.pack(
+                MAGIC,
+                self.num_nets,
+                self.num_transistors,
+                len(self.counts),
+                stride,
+            ),
+            _bits(self.high, self.num_nets),
+            _bits(self.low, self.num_nets),
+            _bits(counts, stride * len(self.counts)),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Coverage:
+        if len(data) < HEADER.size:
+            raise ValueError("Not a coverage file")
+        magic, num_nets, num_transistors, num_counts, stride = (
+            HEADER.unpack_from(data)
+        )
+        if magic != MAGIC:
+            raise ValueError("Not a coverage file")
+
+        net_size = (num_nets + 7) // 8
+        size = HEADER.size + 2 * net_size + (stride * num_counts + 7) // 8
+        if len(data) != size:
+            raise ValueError(
+                f"Coverage data has {len(data)} bytes, expected {size}"
+            )
+        offset = HEADER.size
+        high = int.from_bytes(data[offset:offset + net_size], "little")
+        offset += net_size
+        low = int.from_bytes(data[offset:offset + net_size], "little")
+        offset += net_size
+        packed = int.from_bytes(data[offset:], "little")
+        mask = (1 << stride) - 1
+
+        return cls(
+            num_nets=num_nets,
+            num_transistors=num_transistors,
+            count_stride=stride,
+            high=high,
+            low=low,
+            counts=[(packed >> (i * stride)) & mask for i in range(num_counts)],
+        )
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> Coverage:
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def toggled(self) -> int:
+        """The bitset of nets observed both energized and de-energized."""
+        return self.high & self.low
+
+
+class CoverageCollector:
+    """Samples the settled state of an energized cell into a
+    :class:`Coverage`.
+
+    Call :meth:`sample` after every input change. A FinFET is covered
+    once it has been observed both conducting and not conducting (i.e.
+    its gate net has toggled).
+
+    """
+
+    def __init__(self, cell: Cell, name: Optional[str] = None) -> None:
+        """
+        :param cell: The cell to collect coverage of.
+        :type cell: Cell
+        :param name: The name of the cell in reported paths (its type
+            name by default).
+        :type name: Optional[str]
+
+        """
+
+        netlist = Netlist(cell)
+        self.cell = cell
+        self.name = name
+        self.netlist = netlist
+
+        # one via per net to sample
+        samples: list[Optional[Via]] = [None] * netlist.num_nets
+        for v in netlist.reachable.vias:
+            n = netlist.net(v)
+            if samples[n] is None:
+                samples[n] = v
+        # read like a signal, so that state effectors registered later
+        # (e.g. by a SignalInterface) are sampled too
+        self._nets = Bus(samples)
+        self._interconnects = netlist.reachable.interconnects
+
+        self.coverage = Coverage(
+            num_nets=netlist.num_nets,
+            num_transistors=len(netlist.transistors),
+            count_stride=1 + max(
+                (len(i.vias) for i in self._interconnects), default=0
+            ),
+            counts=[0] * len(self._interconnects),
+        )
+
+    def sample(self) -> None:
+        """Record the current state of every net and interconnect."""
+        coverage = self.coverage
+        high = self._nets.get_signal()
+        coverage.high |= high
+        coverage.low |= ~high & ((1 << coverage.num_nets) - 1)
+
+        counts = coverage.counts
+        for i, c in enumerate(map(_get_num_energized, self._interconnects)):
+            counts[i] |= 1 << c
+
+    def covered_transistors(self) -> list[bool]:
+        toggled = self.coverage.toggled()
+        return [(toggled >> gate) & 1 == 1 for gate, _, _, _ in (
+            self.netlist.transistors
+        )]
+
+    def _net_paths(self) -> list[tuple[str, ...]]:
+        # each net belongs to the deepest cell containing all of its vias
+        # (the vias of a FinFET belong to the cell containing the FinFET)
+        owner: dict[int, tuple[str, ...]] = dict()
+        for path, cell in cell_paths(self.cell, self.name):
+            if isinstance(cell, FinFET):
+                path = path[:-1]
+            for v in cell.components.vias:
+                owner[id(v)] = path
+        root = (type(self.cell).__name__ if self.name is None else self.name,)
+
+        paths: list[Optional[tuple[str, ...]]] = [None] * self.netlist.num_nets
+        for v in self.netlist.reachable.vias:
+            n = self.netlist.net(v)
+            path = owner.get(id(v), root)
+            current = paths[n]
+            if current is None:
+                paths[n] = path
+                continue
+
+            i = 0
+            while i < min(len(current), len(path)) and current[i] == path[i]:
+                i += 1
+            paths[n] = current[:i]
+
+        return [root if p is None else p for p in paths]
+
+    def uncovered_by_hierarchy(self) -> dict[str, list[int]]:
+        """The untoggled nets grouped by the path of the cell that
+        contains them.
+
+        """
+
+        toggled = self.coverage.toggled()
+        groups: dict[str, list[int]] = dict()
+        for n, path in enumerate(self._net_paths()):
+            if n in self.netlist.powered or (toggled >> n) & 1:
+                continue
+            groups.setdefault("/".join(path), list()).append(n)
+        return groups
+
+    def report(self) -> str:
+        coverage = self.coverage
+        netlist = self.netlist
+        num_nets = netlist.num_nets - len(netlist.powered)
+        toggled = bin(coverage.toggled()).count("1")
+        transistors = sum(self.covered_transistors())
+        counts = sum(bin(c).count("1") for c in coverage.counts)
+        total_counts = sum(len(i.vias) + 1 for i in self._interconnects)
+
+        def pct(a: int, b: int) -> str:
+            return f"{a}/{b} ({100 * a / b if b else 100.0:.1f}%)"
+
+        lines = [
+            f"nets toggled: {pct(toggled, num_nets)}",
+            f"transistors switched: {pct(transistors, len(netlist.transistors))}",
+            f"interconnect provider counts: {pct(counts, total_counts)}",
+        ]
+
+        uncovered = self.uncovered_by_hierarchy()
+        if uncovered:
+            lines.append("uncovered nets:")
+            for path in sorted(uncovered):
+                lines.append(f"  {path}: {len(uncovered[path])}")
+
+        return "\n".join(lines)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+import contextlib
+import sys
+from typing import Any, Iterable, Iterator
+
+from .core import SignalInterface
+
+
+__all__ = (
+    "AdderInterface",
+    "StreamingAdder",
+)
+
+
+# the Python frames propagation may nest per bit of a carry chain (about
+# 19 on RCA64Cin), and the frames needed besides
+_FRAMES_PER_BIT = 32
+_BASE_FRAMES = 1000
+
+
+@contextlib.contextmanager
+def _recursion_limit(limit: int) -> Iterator[None]:
+    # raise the recursion limit to at least `limit` in the block
+    previous = sys.getrecursionlimit()
+    if previous >= limit:
+        yield
+        return
+
+    sys.setrecursionlimit(limit)
+    try:
+        yield
+    finally:
+        sys.setrecursionlimit(previous)
+
+
+class AdderInterface:
+    """Drives a macro-cell with the ``i0``, ``i1``, ``cin``, ``o`` and
+    ``cout`` port layout (e.g. ``KSA64R2Cin``) using integers.
+
+    Propagation recurses once per state change along a path, so a carry
+    rippling through every bit (e.g. all-ones plus ``cin`` on
+    ``RCA64Cin``) nests deeper than Python's default recursion limit.
+    While setting inputs, the limit is raised to fit the adder's width.
+
+    """
+
+    def __init__(self, cell: Any) -> None:
+        """
+        :param cell: The adder macro-cell. Interfaces may be created
+            before or after the power rail is energized.
+
+        """
+
+        self.cell = cell
+        self.width: int = len(cell.o)
+        self.recursion_limit = _BASE_FRAMES + _FRAMES_PER_BIT * (
+            self.width + 1
+        )
+        """The recursion limit inputs are set with (at least)"""
+
+        self.i0 = SignalInterface(cell.i0)
+        self.i1 = SignalInterface(cell.i1)
+        self.cin = SignalInterface((cell.cin,))
+        self.o = SignalInterface(cell.o)
+        self.cout = SignalInterface((cell.cout,))
+
+    @property
+    def mask(self) -> int:
+        return (1 << self.width) - 1
+
+    def set_inputs(self, i0: int, i1: int, cin: int) -> None:
+        with _recursion_limit(self.recursion_limit):
+            self.i0.set_signal(i0)
+            self.i1.set_signal(i1)
+            self.cin.set_signal(cin)
+
+    def get_outputs(self) -> tuple[int, bool]:
+        return self.o.get_signal(), self.cell.cout.energized
+
+    def add(self, i0: int, i1: int, cin: int = 0) -> tuple[int, bool]:
+        """Set the inputs and return the ``(o, cout)`` pair."""
+        self.set_inputs(i0, i1, cin)
+        return self.get_outputs()
+
+
+class StreamingAdder:
+    """Streams additions through a pipelined adder (e.g. ``PKSA64R2Cin``)
+    at one vector per clock cycle.
+
+    Combinational adders (without a ``clk``) are streamed too, with a
+    latency of zero, so their throughput can be compared in cycles.
+
+    """
+
+    def __init__(self, cell: Any, compiled: bool = False) -> None:
+        """
+        :param cell: The adder macro-cell. The interfaces and clock are
+            created here, before or after the power rail is energized.
+        :param compiled: Run cycles on a
+            :class:`~circuits.sequential.CycleSimulator` instead of
+            clocking the live circuit.
+        :type compiled: bool
+
+        """
+
+        from .sequential import Clock, CycleSimulator
+
+        self.cell = cell
+        self.latency: int = getattr(cell, "latency", 0)
+        self.cycles = 0
+        self.adder = AdderInterface(cell)
+        self.width = self.adder.width
+
+        self.clock = None
+        if getattr(cell, "clk", None) is not None:
+            self.clock = Clock(cell.clk, cell.clkn)
+
+        self.simulator = None
+        if compiled:
+            self.simulator = CycleSimulator(
+                cell,
+                (cell.i0, cell.i1, (cell.cin,)),
+                (cell.o, (cell.cout,)),
+            )
+
+    def _cycle(self, i0: int, i1: int, cin: int) -> tuple[int, bool]:
+        # returns the outputs seen during the cycle, i.e. of the vector
+        # that entered `latency` cycles ago
+        self.cycles += 1
+        if self.simulator is not None:
+            o, cout = self.simulator.step(i0, i1, cin)
+            return o, not not cout
+
+        if self.clock is None:
+            return self.adder.add(i0, i1, cin)
+
+        outputs = self.adder.get_outputs()
+        self.adder.set_inputs(i0, i1, cin)
+        with _recursion_limit(self.adder.recursion_limit):
+            self.clock.tick()
+        return outputs
+
+    def stream(
+        self, vectors: Iterable[tuple[int, int, int]]
+    ) -> Iterator[tuple[int, bool]]:
+        """Feed one ``(i0, i1, cin)`` vector per cycle and yield the
+        ``(o, cout)`` result of each vector in order, flushing the
+        pipeline with zero vectors at the end.
+
+        """
+
+        latency = self.latency
+        n = 0
+        for i0, i1, cin in vectors:
+            outputs = self._cycle(i0, i1, cin)
+            if n >= latency:
+                yield outputs
+            n += 1
+
+        if not n:
+            return
+
+        # cycle k yields the result of vector k - latency
+        for k in range(n, n + latency):
+            outputs = self._cycle(0, 0, 0)
+            if k >= latency:
+                yield outputs
@@ -0,0 +1,521 @@
+from __future__ import annotations
+import dataclasses
+from typing import Any, Callable, Iterable, Mapping, Optional, Union
+
+from . import core
+from .core import (
+    Binding, Cap, Cell, FinFET, Interconnect, VDD, VDDStateEffector, Via,
+)
+from .names import _ports
+from .state import _indexes
+
+
+__all__ = (
+    "CircuitEditor",
+)
+
+
+# the identity of the caps terminating vias left open by an edit
+_OPEN = object()
+
+_Connection = Union[Interconnect, Binding]
+
+
+def _ignore(via: Via, state_changed: bool, /) -> None:
+    return
+
+
+def _port_vias(cell: Cell) -> dict[str, Via]:
+    # every via a cell exposes, by attribute name (e.g. "i[0]")
+    vias: dict[str, Via] = dict()
+
+    def add(name: str, value: Any) -> None:
+        if isinstance(value, Via):
+            vias[name] = value
+        elif isinstance(value, (tuple, list)):
+            for i, v in enumerate(value):
+                add(f"{name}[{i}]", v)
+
+    for attr, value in _ports(cell):
+        add(attr, value)
+    return vias
+
+
+def _unregister(via: Via, id_: int) -> None:
+    # remove a state effector without notifying the other one
+    del via.effectors[id_]
+    via.opposing_effectors = dict()
+    via.revision += 1
+
+
+def _num_effectors(via: Via) -> int:
+    # the number of state effectors, not counting an open cap
+    return len(via.effectors) - (id(_OPEN) in via.effectors)
+
+
+def _dropped(outside: Iterable[Any]) -> bool:
+    # whether a via is only connected to the owners being detached (and
+    # maybe a power rail), given its state effectors that are not theirs
+    return all(isinstance(e, VDDStateEffector) for e in outside)
+
+
+def _groups(pairs: Iterable[tuple[Via, Via]]) -> list[list[Via]]:
+    # the vias joined by pairs (vias shared by several pairs end up in
+    # one group)
+    groups: dict[int, list[Via]] = dict()
+    for a, b in pairs:
+        group_a = groups.setdefault(id(a), [a])
+        group_b = groups.get(id(b))
+        if group_b is None:
+            group_a.append(b)
+            groups[id(b)] = group_a
+        elif group_b is not group_a:
+            group_a.extend(group_b)
+            for v in group_b:
+                groups[id(v)] = group_a
+    return list({id(g): g for g in groups.values()}.values())
+
+
+def _check_groups(
+    groups: Iterable[list[Via]],
+    num_effectors: Callable[[Via], int] = _num_effectors,
+) -> None:
+    # every via joined to others must have a free side
+    for group in groups:
+        for v in group:
+            if num_effectors(v) > 1:
+                raise ValueError(
+                    f"{v!r} already has two state pairs registered"
+                )
+
+
+def _check_not_wire(cell: Cell, ports: Mapping[str, Via]) -> None:
+    # cells exposing a via as several ports (e.g. BUF1, whose i is its
+    # o) are plain wires: the state effectors on both sides of the via
+    # are the circuit's, and which of them belongs to which port is not
+    # known, so there is nothing to detach or to reconnect
+    seen: dict[int, str] = dict()
+    for name, v in ports.items():
+        other = seen.setdefault(id(v), name)
+        if other != name:
+            raise ValueError(
+                f"{type(cell).__name__} is a wire ({other} is {name}) and"
+                " cannot be removed or replaced"
+            )
+
+
+def _substitute(value: Any, old: Cell, new: Optional[Cell]) -> Any:
+    # value with every reference to old (in lists and tuples) replaced
+    if value is old:
+        return new
+    if isinstance(value, list):
+        value[:] = (_substitute(v, old, new) for v in value)
+    elif type(value) is tuple:
+        replaced = tuple(_substitute(v, old, new) for v in value)
+        if any(a is not b for a, b in zip(replaced, value)):
+            return replaced
+    return value
+
+
+class CircuitEditor:
+    """Engineering changes to a (possibly energized) circuit: adding,
+    removing and replacing sub-cells and connections in place.
+
+    New cells are built on a separate, unenergized power rail (so
+    :class:`~circuits.core.Cell` accepts them), connected, and then moved
+    onto the circuit's rail. Connections are made and broken by
+    propagating the state changes they cause, like any other state
+    change, so only the cone of the edit is re-evaluated rather than the
+    whole circuit being rebuilt and re-energized.
+
+    The edited cells' ``components`` are updated, and their attributes
+    that refer to a replaced cell (directly or in lists and tuples) are
+    pointed at the new one. Vias left with nothing connected to one side
+    are terminated with a :class:`~circuits.core.Cap` (and are *open*:
+    :meth:`connect` takes the cap off again), and attributes that refer
+    to a removed cell are set to ``None``. State indexes and netlists
+    built before an edit do not apply afterwards and must be rebuilt.
+
+    Wire cells (exposing one via as several ports, like
+    :class:`~circuits.standard_cells.BUF1`) cannot be removed or
+    replaced; edit the connections on either side instead.
+
+    """
+
+    __slots__ = ("root", "vdd", "_parents")
+
+    def __init__(self, root: Cell, vdd: VDD) -> None:
+        """
+        :param root: The cell to edit (and whose sub-cells are edited).
+        :type root: Cell
+        :param vdd: The power rail of ``root``.
+        :type vdd: VDD
+
+        """
+
+        self.root = root
+        self.vdd = vdd
+
+        # the cell whose components contain each cell and connection
+        self._parents: dict[int, Cell] = dict()
+        self._index(root)
+
+    def _index(self, cell: Cell) -> None:
+        stack = [cell]
+        while stack:
+            c = stack.pop()
+            cmp = c.components
+            for x in (*cmp.cells, *cmp.interconnects, *cmp.bindings):
+                self._parents[id(x)] = c
+            stack.extend(cmp.cells)
+
+    def _unindex(self, cell: Cell) -> None:
+        self._parents.pop(id(cell), None)
+        for c in (cell, *cell.components.all_cells()):
+            cmp = c.components
+            for x in (*cmp.cells, *cmp.interconnects, *cmp.bindings):
+                self._parents.pop(id(x), None)
+
+    def parent(self, obj: Union[Cell, _Connection]) -> Cell:
+        """The cell whose components contain ``obj``.
+
+        :raises KeyError: If ``obj`` is not part of the edited circuit
+            (or is the root).
+
+        """
+
+        return self._parents[id(obj)]
+
+    def _update(
+        self,
+        parent: Cell,
+        remove: Iterable[Any] = (),
+        cells: Iterable[Cell] = (),
+        vias: Iterable[Via] = (),
+        connections: Iterable[_Connection] = (),
+    ) -> None:
+        removed = {id(x) for x in remove}
+        cmp = parent.components
+        connections = tuple(connections)
+        known = {id(v) for v in cmp.vias}
+        vias = {id(v): v for v in vias if id(v) not in known}.values()
+        parent.components = dataclasses.replace(
+            cmp,
+            cells=(*(c for c in cmp.cells if id(c) not in removed), *cells),
+            vias=(*cmp.vias, *vias),
+            interconnects=(
+                *(x for x in cmp.interconnects if id(x) not in removed),
+                *(x for x in connections if isinstance(x, Interconnect)),
+            ),
+            bindings=(
+                *(x for x in cmp.bindings if id(x) not in removed),
+                *(x for x in connections if isinstance(x, Binding)),
+            ),
+        )
+        for x in (*cells, *connections):
+            self._parents[id(x)] = parent
+        _indexes.pop(self.root, None)
+
+    def _detach(
+        self, owners: dict[int, Any], vias: Iterable[Via]
+    ) -> list[Via]:
+        # remove the state effectors of owners (FinFETs and connections)
+        # from vias, propagating the loss of the state they provided,
+        # and return the vias still connected to something else
+        vias = {id(v): v for v in vias}.values()
+
+        # owners being removed must not react to the changes below
+        for v in vias:
+            for e in v.effectors.values():
+                if e.id in owners:
+                    object.__setattr__(e, "callback", _ignore)
+
+        boundary: list[Via] = list()
+        dropped: set[int] = set()
+        rails: dict[int, VDD] = dict()
+        for v in vias:
+            inside = [e for e in v.effectors.values() if e.id in owners]
+            outside = [e for e in v.effectors.values() if e.id not in owners]
+
+            if _dropped(outside):
+                # only connected to the owners (and maybe a power rail)
+                for e in outside:
+                    rails[id(e.power_rail)] = e.power_rail
+                dropped.add(id(v))
+                v.effectors.clear()
+                v.opposing_effectors = dict()
+                v.revision += 1
+                continue
+
+            for e in inside:
+                if e.energized:
+                    v.set_state(owners[e.id], False)
+                _unregister(v, e.id)
+            boundary.append(v)
+
+        for rail in rails.values():
+            rail.vias[:] = (v for v in rail.vias if id(v) not in dropped)
+        core._bump_revision()
+        return boundary
+
+    def _remaining(
+        self, owners: dict[int, Any], vias: Iterable[Via]
+    ) -> dict[int, int]:
+        # the number of state effectors (not counting an open cap) that
+        # _detach would leave on each via still connected to something
+        remaining: dict[int, int] = dict()
+        for v in vias:
+            outside = [e for e in v.effectors.values() if e.id not in owners]
+            if not _dropped(outside):
+                remaining[id(v)] = sum(e.id != id(_OPEN) for e in outside)
+        return remaining
+
+    def _join(self, vias: Iterable[Via]) -> Interconnect:
+        # interconnect vias, propagating the state that flows through
+        x = Interconnect()
+        for v in vias:
+            if id(_OPEN) in v.effectors:
+                _unregister(v, id(_OPEN))
+            x.register_via(v)
+
+            # the interconnect powers the vias that aren't providers,
+            # and the via may be a new provider
+            if x.num_energized:
+                v.set_state(x, True)
+            if v.opposing_effectors and v.get_ose(x).energized:
+                x._handle_state_change(v, True)
+        return x
+
+    def _open(self, vias: Iterable[Via]) -> None:
+        for v in vias:
+            if len(v.effectors) == 1 and not isinstance(
+                next(iter(v.effectors.values())), Cap
+            ):
+                v.register(Cap(_OPEN))
+
+    def _build(self, factory: Callable[[VDD], Cell]) -> tuple[Cell, VDD]:
+        staging = VDD()
+        return factory(staging), staging
+
+    def _power(self, staging: VDD) -> None:
+        # move the vias of a new cell from its staging rail to ours
+        vdd = self.vdd
+        for v in staging.vias:
+            _unregister(v, id(staging))
+            vdd.register(v)
+
+        if vdd.energized:
+            for v in staging.vias:
+                v.set_state(vdd, True)
+
+    def _owners(self, cell: Cell) -> tuple[dict[int, Any], list[Via]]:
+        # the FinFETs and connections of cell, and the vias they touch
+        owners: dict[int, Any] = dict()
+        vias: list[Via] = list()
+        for c in (cell, *cell.components.all_cells()):
+            if isinstance(c, FinFET):
+                owners[id(c)] = c
+            vias.extend(c.components.vias)
+        for x in (
+            *cell.components.all_interconnects(),
+            *cell.components.all_bindings(),
+        ):
+            owners[id(x)] = x
+            vias.extend(x.vias)
+        return owners, vias
+
+    def add(
+        self,
+        factory: Callable[[VDD], Cell],
+        ports: Mapping[str, Union[Via, Iterable[Via]]],
+        parent: Optional[Cell] = None,
+    ) -> Cell:
+        """Build a cell and connect it to the circuit.
+
+        :param factory: Builds the cell on the given power rail (e.g. a
+            cell class).
+        :type factory: Callable[[VDD], Cell]
+        :param ports: The vias of the circuit to connect each of the
+            cell's port attributes to (single vias, or groups of vias for
+            attributes holding groups, e.g. ``{"i": (a, b), "o": c}``).
+            Ports left out are open.
+        :type ports: Mapping[str, Union[Via, Iterable[Via]]]
+        :param parent: The cell to add the new cell to (the root by
+            default).
+        :type parent: Optional[Cell]
+        :return: The new cell.
+        :rtype: Cell
+
+        """
+
+        parent = self.root if parent is None else parent
+        cell, staging = self._build(factory)
+        new = _port_vias(cell)
+
+        targets: dict[str, Via] = dict()
+        for attr, value in ports.items():
+            if isinstance(value, Via):
+                targets[attr] = value
+            else:
+                for i, v in enumerate(value):
+                    targets[f"{attr}[{i}]"] = v
+        unknown = targets.keys() - new.keys()
+        if unknown:
+            raise ValueError(
+                f"{type(cell).__name__} has no ports {sorted(unknown)}"
+            )
+
+        connections = self._connect(
+            [(targets[k], new[k]) for k in targets], new.values()
+        )
+        self._power(staging)
+        self._update(parent, cells=(cell,), connections=connections)
+        self._index(cell)
+        return cell
+
+    def _connect(
+        self,
+        pairs: Iterable[tuple[Via, Via]],
+        ports: Iterable[Via],
+    ) -> list[Interconnect]:
+        # join each circuit via to a port of a new cell (vias shared by
+        # several pairs are joined in one group) and open the other ports
+        groups = _groups(pairs)
+        _check_groups(groups)
+
+        connections = list()
+        for group in groups:
+            # vias with no state effectors are plain wires
+            group = [v for v in group if _num_effectors(v)]
+            if len(group) > 1:
+                connections.append(self._join(group))
+        joined = {id(v) for group in groups for v in group}
+        self._open(v for v in ports if id(v) not in joined)
+        return connections
+
+    def remove(self, cell: Cell) -> tuple[Via, ...]:
+        """Disconnect a sub-cell from the circuit and remove it.
+
+        :return: The vias the cell was connected to (now open).
+        :rtype: tuple[Via, ...]
+        :raises ValueError: If the cell is a wire (exposes a via as
+            several ports, e.g. :class:`~circuits.standard_cells.BUF1`).
+
+        """
+
+        parent = self.parent(cell)
+        _check_not_wire(cell, _port_vias(cell))
+        owners, vias = self._owners(cell)
+        boundary = self._detach(owners, vias)
+        self._open(boundary)
+
+        _substitute_attributes(parent, cell, None)
+        self._unindex(cell)
+        self._update(parent, remove=(cell,), vias=boundary)
+        return tuple(boundary)
+
+    def replace(self, cell: Cell, factory: Callable[[VDD], Cell]) -> Cell:
+        """Replace a sub-cell with a new cell with the same port
+        attributes, connected to the same vias.
+
+        :param factory: Builds the new cell on the given power rail (e.g.
+            a cell class).
+        :type factory: Callable[[VDD], Cell]
+        :return: The new cell.
+        :rtype: Cell
+        :raises ValueError: If the new cell does not have the same ports,
+            cannot be connected to the vias of the old one, or the old
+            cell is a wire (exposes a via as several ports, e.g.
+            :class:`~circuits.standard_cells.BUF1`). The circuit is left
+            unchanged.
+
+        """
+
+        parent = self.parent(cell)
+        old_ports = _port_vias(cell)
+        _check_not_wire(cell, old_ports)
+        new, staging = self._build(factory)
+        new_ports = _port_vias(new)
+        if old_ports.keys() != new_ports.keys():
+            raise ValueError(
+                f"{type(new).__name__} does not have the ports of"
+                f" {type(cell).__name__}"
+            )
+
+        # check that the new cell fits before touching the circuit
+        owners, vias = self._owners(cell)
+        remaining = self._remaining(owners, vias)
+        pairs = [
+            (v, new_ports[k]) for k, v in old_ports.items()
+            if id(v) in remaining
+        ]
+        _check_groups(
+            _groups(pairs), lambda v: remaining.get(id(v), _num_effectors(v))
+        )
+
+        boundary = self._detach(owners, vias)
+        connections = self._connect(pairs, new_ports.values())
+        self._open(boundary)
+        self._power(staging)
+
+        _substitute_attributes(parent, cell, new)
+        self._unindex(cell)
+        self._update(
+            parent,
+            remove=(cell,),
+            cells=(new,),
+            vias=boundary,
+            connections=connections,
+        )
+        self._index(new)
+        return new
+
+    def connect(
+        self, *vias: Via, parent: Optional[Cell] = None
+    ) -> Interconnect:
+        """Interconnect vias of the circuit (each must be open, or have
+        a single state effector).
+
+        :param parent: The cell to add the interconnect to (the root by
+            default).
+        :type parent: Optional[Cell]
+
+        """
+
+        for v in vias:
+            if _num_effectors(v) > 1:
+                raise ValueError(
+                    f"{v!r} already has two state pairs registered"
+                )
+            if not _num_effectors(v):
+                raise ValueError(f"{v!r} is not connected to anything")
+        connection = self._join(vias)
+        self._update(
+            self.root if parent is None else parent,
+            connections=(connection,),
+        )
+        return connection
+
+    def disconnect(self, connection: _Connection) -> tuple[Via, ...]:
+        """Remove an interconnect or binding from the circuit.
+
+        :return: The vias it connected (now open).
+        :rtype: tuple[Via, ...]
+
+        """
+
+        parent = self.parent(connection)
+        boundary = self._detach({id(connection): connection}, connection.vias)
+        self._open(boundary)
+        del self._parents[id(connection)]
+        self._update(parent, remove=(connection,))
+        return tuple(boundary)
+
+
+def _substitute_attributes(
+    parent: Cell, old: Cell, new: Optional[Cell]
+) -> None:
+    for attr, value in _ports(parent):
+        replaced = _substitute(value, old, new)
+        if replaced is not value:
+            setattr(parent, attr, replaced)
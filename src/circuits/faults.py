@@ -0,0 +1,286 @@
+from __future__ import annotations
+import concurrent.futures
+import dataclasses
+from typing import Iterable, Literal, Optional, Sequence
+
+from .core import Cell, Via
+from .netlist import Netlist
+
+
+__all__ = (
+    "Fault",
+    "FaultReport",
+    "FaultSimulator",
+    "enumerate_faults",
+)
+
+
+FaultSite = Literal["net", "gate", "drain"]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Fault:
+    """A stuck-at fault.
+
+    ``site`` is ``"net"`` for a whole net (``index`` is a net index), or
+    ``"gate"``/``"drain"`` for a single FinFET's gate input or drain
+    output (``index`` is a transistor index of the netlist). A stuck
+    drain only affects that transistor's contribution to its net.
+
+    """
+
+    site: FaultSite
+    index: int
+    value: bool
+
+    def __str__(self) -> str:
+        return f"{self.site}{self.index}/sa{int(self.value)}"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FaultReport:
+    detected: tuple[Fault, ...]
+    undetected: tuple[Fault, ...]
+    num_vectors: int
+
+    @property
+    def num_faults(self) -> int:
+        return len(self.detected) + len(self.undetected)
+
+    @property
+    def coverage(self) -> float:
+        return len(self.detected) / self.num_faults if self.num_faults else 1.0
+
+
+def enumerate_faults(netlist: Netlist) -> list[Fault]:
+    """Every stuck-at-0 and stuck-at-1 fault on every (unpowered) net and
+    every FinFET gate and drain of ``netlist``.
+
+    """
+
+    faults = list()
+
+    for n in range(netlist.num_nets):
+        if n not in netlist.powered:
+            faults.append(Fault("net", n, False))
+            faults.append(Fault("net", n, True))
+
+    for t in range(len(netlist.transistors)):
+        for site in ("gate", "drain"):
+            faults.append(Fault(site, t, False))
+            faults.append(Fault(site, t, True))
+
+    return faults
+
+
+def _masks(
+    faults: Sequence[Fault], site: FaultSite
+) -> dict[int, tuple[int, int]]:
+    # (stuck-at-0, stuck-at-1) lane masks per faulted net/transistor;
+    # lane 0 is always fault-free
+    masks: dict[int, tuple[int, int]] = dict()
+    for lane, f in enumerate(faults, 1):
+        if f.site != site:
+            continue
+        m0, m1 = masks.get(f.index, (0, 0))
+        if f.value:
+            m1 |= 1 << lane
+        else:
+            m0 |= 1 << lane
+        masks[f.index] = (m0, m1)
+    return masks
+
+
+def _schedule(netlist: Netlist, faults: Sequence[Fault]) -> list[tuple]:
+    # per net (in topological order): the net, whether it is powered,
+    # its fault masks and its driving transistors with their fault masks
+    net_masks = _masks(faults, "net")
+    gate_masks = _masks(faults, "gate")
+    drain_masks = _masks(faults, "drain")
+    transistors = netlist.transistors
+
+    schedule = list()
+    for n in netlist.order:
+        drivers = tuple(
+            (
+                transistors[t][1],
+                transistors[t][0],
+                transistors[t][3],
+                gate_masks.get(t),
+                drain_masks.get(t),
+            )
+            for t in netlist.drivers[n]
+        )
+        schedule.append(
+            (n, n in netlist.powered, net_masks.get(n), drivers)
+        )
+
+    return schedule
+
+
+def _evaluate(
+    netlist: Netlist,
+    schedule: list[tuple],
+    inputs: Sequence[Sequence[int]],
+    vector: Sequence[int],
+    full: int,
+) -> list[int]:
+    values = [0] * netlist.num_nets
+    for nets, signal in zip(inputs, vector):
+        for i, n in enumerate(nets):
+            if (signal >> i) & 1:
+                values[n] = full
+
+    for n, powered, net_mask, drivers in schedule:
+        v = full if powered else values[n]
+        for source, gate, p_type, gate_mask, drain_mask in drivers:
+            g = values[gate]
+            if gate_mask is not None:
+                g = (g & ~gate_mask[0]) | gate_mask[1]
+            c = values[source] & (~g if p_type else g)
+            if drain_mask is not None:
+                c = (c & ~drain_mask[0]) | drain_mask[1]
+            v |= c
+        if net_mask is not None:
+            v = (v & ~net_mask[0]) | net_mask[1]
+        values[n] = v & full
+
+    return values
+
+
+def _simulate(
+    netlist: Netlist,
+    inputs: Sequence[Sequence[int]],
+    outputs: Sequence[Sequence[int]],
+    vectors: Sequence[Sequence[int]],
+    faults: Sequence[Fault],
+) -> int:
+    # returns the lanes (bit n+1 for faults[n]) that were detected
+    full = (1 << (len(faults) + 1)) - 1
+    schedule = _schedule(netlist, faults)
+    output_nets = tuple(n for nets in outputs for n in nets)
+    remaining = full & ~1
+    detected = 0
+
+    for vector in vectors:
+        values = _evaluate(netlist, schedule, inputs, vector, full)
+
+        # compare every lane against the fault-free lane 0
+        diff = 0
+        for n in output_nets:
+            v = values[n]
+            diff |= v ^ (full if v & 1 else 0)
+
+        detected |= diff & remaining
+        remaining &= ~diff
+        if not remaining:
+            break
+
+    return detected
+
+
+class FaultSimulator:
+    """A bit-parallel stuck-at fault simulator.
+
+    Each test vector is evaluated once for a whole batch of faults: lane
+    0 of every net value is the fault-free circuit and lane ``n`` carries
+    the ``n``-th fault of the batch. A fault is detected when any output
+    differs from the fault-free lane; detected faults are dropped from
+    the remaining vectors of their batch.
+
+    """
+
+    def __init__(
+        self,
+        cell: Cell,
+        inputs: Sequence[Sequence[Via]],
+        outputs: Sequence[Sequence[Via]],
+    ) -> None:
+        """
+        :param cell: The cell to fault simulate.
+        :type cell: Cell
+        :param inputs: The input via groups (each mapping LSB to MSB, as
+            with :class:`~circuits.core.SignalInterface`).
+        :param outputs: The output via groups.
+
+        """
+
+        self.netlist = Netlist(cell)
+        self.inputs = tuple(self.netlist.nets(g) for g in inputs)
+        self.outputs = tuple(self.netlist.nets(g) for g in outputs)
+
+    def faults(self) -> list[Fault]:
+        return enumerate_faults(self.netlist)
+
+    def evaluate(
+        self, vector: Sequence[int], fault: Optional[Fault] = None
+    ) -> tuple[int, ...]:
+        """Evaluate a single vector, optionally with a single fault, and
+        return the output signals.
+
+        """
+
+        faults = () if fault is None else (fault,)
+        lane = len(faults)
+        values = _evaluate(
+            self.netlist,
+            _schedule(self.netlist, faults),
+            self.inputs,
+            vector,
+            (1 << (lane + 1)) - 1,
+        )
+
+        return tuple(
+            sum(((values[n] >> lane) & 1) << i for i, n in enumerate(nets))
+            for nets in self.outputs
+        )
+
+    def run(
+        self,
+        vectors: Iterable[Sequence[int]],
+        faults: Optional[Sequence[Fault]] = None,
+        *,
+        lanes: int = 1024,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> FaultReport:
+        """Fault simulate ``vectors`` (tuples of input signals, one per
+        input group) and report the fault coverage.
+
+        :param faults: The faults to simulate (defaults to
+            :meth:`faults`).
+        :param lanes: The number of faults simulated per batch.
+        :type lanes: int
+        :param executor: An optional executor (e.g. a
+            ``ProcessPoolExecutor``) to simulate fault batches in
+            parallel.
+
+        """
+
+        vectors = tuple(tuple(v) for v in vectors)
+        faults = tuple(self.faults() if faults is None else faults)
+        batches = [
+            faults[i:i + lanes] for i in range(0, len(faults), lanes)
+        ]
+        args = (self.netlist, self.inputs, self.outputs, vectors)
+
+        if executor is None:
+            results = [_simulate(*args, batch) for batch in batches]
+        else:
+            results = list(executor.map(
+                _simulate, *zip(*(args + (b,) for b in batches))
+            ))
+
+        detected = list()
+        undetected = list()
+        for batch, mask in zip(batches, results):
+            for lane, fault in enumerate(batch, 1):
+                if (mask >> lane) & 1:
+                    detected.append(fault)
+                else:
+                    undetected.append(fault)
+
+        return FaultReport(
+            detected=tuple(detected),
+            undetected=tuple(undetected),
+            num_vectors=len(vectors),
+        )
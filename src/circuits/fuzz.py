@@ -0,0 +1,265 @@
+from __future__ import annotations
+import dataclasses
+import random
+from typing import Optional
+
+from .core import (
+    Binding,
+    Cell,
+    Interconnect,
+    PTypeFinFET,
+    SignalInterface,
+    TempComponents,
+    VDD,
+    Via,
+)
+from .netlist import Netlist
+
+
+__all__ = (
+    "RandomNetlistParams",
+    "RandomNetlist",
+    "FuzzMismatch",
+    "FuzzResult",
+    "fuzz",
+)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RandomNetlistParams:
+    num_transistors: int
+    num_inputs: int = 8
+    num_outputs: int = 8
+    seed: Optional[int] = None
+
+    window: Optional[int] = None
+    """Only connect gates and sources to the last ``window`` nets (makes
+    deeper netlists)"""
+
+    powered: float = 0.5
+    """The probability of a source being powered by the rail"""
+
+    wired: float = 0.25
+    """The probability of a drain joining an open wired-or net instead of
+    driving a new one"""
+
+
+class RandomNetlist(Cell):
+    """A random but valid (loop-free) PUN netlist of ``PTypeFinFET``\\ s.
+
+    Every transistor's gate and source are taken from the primary inputs
+    or earlier transistors' drains (sources may also be powered by the
+    rail), and its drain either drives a new net or joins a wired-or net
+    that nothing consumes yet, so the netlist can never contain a loop.
+    Nets are joined with bindings (two vias) or interconnects.
+
+    The structure is also recorded in ``spec`` as ``(gate, source,
+    drain)`` net numbers (``source`` is ``None`` when powered, and nets
+    ``0..len(i)-1`` are the inputs), so :meth:`reference` can evaluate it
+    independently of both the event model and :class:`Netlist`.
+
+    """
+
+    __slots__ = ("params", "i", "o", "spec", "outputs", "num_signals")
+
+    params: RandomNetlistParams
+    i: tuple[Via, ...]
+    o: tuple[Via, ...]
+    spec: tuple[tuple[int, Optional[int], int], ...]
+    outputs: tuple[int, ...]
+    """The net number of each output via"""
+
+    num_signals: int
+
+    def __init__(self, vdd: VDD, params: RandomNetlistParams) -> None:
+        self.params = params
+        super().__init__(vdd)
+
+    def _init(self, vdd: VDD) -> None:
+        params = self.params
+        rng = random.Random(params.seed)
+        cmp = TempComponents()
+
+        # the vias on each net, and whether anything consumes it yet
+        nets: list[list[Via]] = list()
+        consumed: list[bool] = list()
+        # the nets nothing consumes yet, and their positions in
+        # open_nets (removed by swapping with the last one)
+        open_nets: list[int] = list()
+        open_positions: dict[int, int] = dict()
+        spec: list[tuple[int, Optional[int], int]] = list()
+
+        inputs = tuple(Via() for _ in range(params.num_inputs))
+        cmp.add(*inputs)
+        for v in inputs:
+            nets.append([v])
+            consumed.append(False)
+
+        def pick() -> int:
+            lo = 0 if params.window is None else max(
+                0, len(nets) - params.window
+            )
+            n = rng.randrange(lo, len(nets))
+            consumed[n] = True
+            i = open_positions.pop(n, None)
+            if i is not None:
+                last = open_nets.pop()
+                if last != n:
+                    open_nets[i] = last
+                    open_positions[last] = i
+            return n
+
+        for _ in range(params.num_transistors):
+            p = PTypeFinFET()
+            cmp.add(p)
+
+            gate = pick()
+            nets[gate].append(p.gate)
+
+            if rng.random() < params.powered:
+                source = None
+                vdd.register(p.source)
+            else:
+                source = pick()
+                nets[source].append(p.source)
+
+            if open_nets and rng.random() < params.wired:
+                drain = rng.choice(open_nets)
+            else:
+                drain = len(nets)
+                nets.append(list())
+                consumed.append(False)
+                open_positions[drain] = len(open_nets)
+                open_nets.append(drain)
+            nets[drain].append(p.drain)
+
+            spec.append((gate, source, drain))
+
+        # outputs: prefer nets nothing consumes
+        candidates = [
+            n for n in range(params.num_inputs, len(nets)) if not consumed[n]
+        ]
+        rng.shuffle(candidates)
+        others = [
+            n for n in range(params.num_inputs, len(nets)) if consumed[n]
+        ]
+        rng.shuffle(others)
+        outputs = (candidates + others)[:params.num_outputs]
+
+        o = tuple(Via() for _ in outputs)
+        cmp.add(*o)
+        for n, v in zip(outputs, o):
+            nets[n].append(v)
+
+        # connect the vias of each net
+        for vias in nets:
+            if len(vias) == 2 and rng.random() < 0.5:
+                cmp.add(Binding(*vias))
+            elif len(vias) > 1:
+                cmp.add(Interconnect(*vias))
+
+        self.i = inputs
+        self.o = o
+        self.spec = tuple(spec)
+        self.outputs = tuple(outputs)
+        self.num_signals = len(nets)
+        self.components = cmp.to_components()
+
+    def reference(self, signal: int) -> int:
+        """Evaluate the output signal for an input signal directly from
+        ``spec``.
+
+        """
+
+        values = [False] * self.num_signals
+        for i in range(len(self.i)):
+            values[i] = not not ((signal >> i) & 1)
+
+        # transistors only read nets created before their drain net, and
+        # wired-or nets are only read after all of their drivers, so the
+        # spec is already in evaluation order
+        for gate, source, drain in self.spec:
+            if not values[gate] and (source is None or values[source]):
+                values[drain] = True
+
+        return sum(values[n] << i for i, n in enumerate(self.outputs))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FuzzMismatch:
+    params: RandomNetlistParams
+    signal: int
+    reference: int
+    event_model: int
+    netlist: int
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FuzzResult:
+    num_netlists: int
+    num_vectors: int
+    num_transistors: int
+    mismatches: tuple[FuzzMismatch, ...]
+
+    def __bool__(self) -> bool:
+        return not self.mismatches
+
+
+def fuzz(
+    params: RandomNetlistParams,
+    num_netlists: int = 1,
+    num_vectors: int = 100,
+) -> FuzzResult:
+    """Differentially test the event model against :class:`Netlist` and
+    an independent reference evaluator over random netlists and inputs.
+
+    Netlist ``k`` is built with seed ``params.seed + k`` (or ``k`` if no
+    seed is given), so any mismatch can be reproduced from its params.
+
+    """
+
+    mismatches = list()
+    num_transistors = 0
+
+    for k in range(num_netlists):
+        netlist_params = dataclasses.replace(
+            params, seed=k if params.seed is None else params.seed + k
+        )
+        rng = random.Random(netlist_params.seed)
+
+        vdd = VDD()
+        cell = RandomNetlist(vdd, netlist_params)
+        i_int = SignalInterface(cell.i)
+        o_int = SignalInterface(cell.o)
+        vdd.energize()
+
+        compiled = Netlist(cell)
+        input_nets = compiled.nets(cell.i)
+        output_nets = compiled.nets(cell.o)
+        num_transistors += len(cell.spec)
+
+        for _ in range(num_vectors):
+            signal = rng.getrandbits(len(cell.i))
+            i_int.set_signal(signal)
+
+            actual = o_int.get_signal()
+            reference = cell.reference(signal)
+            compiled_actual = compiled.evaluate_signals(
+                (input_nets,), (signal,), (output_nets,)
+            )[0]
+
+            if not (actual == reference == compiled_actual):
+                mismatches.append(FuzzMismatch(
+                    params=netlist_params,
+                    signal=signal,
+                    reference=reference,
+                    event_model=actual,
+                    netlist=compiled_actual,
+                ))
+
+    return FuzzResult(
+        num_netlists=num_netlists,
+        num_vectors=num_netlists * num_vectors,
+        num_transistors=num_transistors,
+        mismatches=tuple(mismatches),
+    )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import concurrent.futures
+import contextlib
+import gc
+import multiprocessing
+from typing import Any, Callable, Iterator, Optional, Union
+
+from .core import Cell, Reachable, Via
+
+
+__all__ = (
+    "release",
+    "no_gc",
+    "freeze",
+    "fork_executor",
+)
+
+
+def release(*roots: Union[Cell, Via]) -> int:
+    """Break the reference cycles of the circuits reachable from
+    ``roots``, so that they are freed by reference counting as soon as
+    they are no longer referenced, instead of by a (slow) cyclic garbage
+    collection pass over every object of the circuit.
+
+    Every via references its state effectors, and the state effectors of
+    FinFETs, interconnects and bindings reference their owners (through
+    their callbacks), which reference the via. This unregisters every
+    state effector of every reachable via, so the circuits must not be
+    used afterwards.
+
+    :return: The number of vias released.
+    :rtype: int
+
+    """
+
+    vias = Reachable.from_roots(*roots).vias
+    for v in vias:
+        v.effectors.clear()
+        v.opposing_effectors.clear()
+    return len(vias)
+
+
+@contextlib.contextmanager
+def no_gc() -> Iterator[None]:
+    """Disable automatic garbage collection in the ``with`` block (e.g.
+    while building large circuits, which creates many container objects
+    and so triggers many collections that find nothing to free).
+
+    """
+
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def freeze() -> int:
+    """Collect garbage, then move every object tracked by the garbage
+    collector to a permanent generation that collections ignore (see
+    :func:`gc.freeze`).
+
+    Call this once long-lived circuits are built (and energized): later
+    collections no longer traverse them, and in processes forked
+    afterwards they are not written to by the collector, so their memory
+    stays shared with the parent (refcount changes of the objects a
+    worker uses still copy the pages they are on). :func:`gc.unfreeze`
+    undoes it.
+
+    :return: The number of frozen objects.
+    :rtype: int
+
+    """
+
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def fork_executor(
+    max_workers: Optional[int] = None,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: tuple[Any, ...] = (),
+) -> concurrent.futures.ProcessPoolExecutor:
+    """A process pool whose workers are forked from this process after
+    :func:`freeze`, so circuits built before the call are inherited
+    without pickling or rebuilding them.
+
+    Workers are started eagerly, so circuits built after the call are not
+    inherited. Forking is only available on POSIX systems.
+
+    :param max_workers: The number of workers (the number of CPUs by
+        default).
+    :type max_workers: Optional[int]
+    :param initializer: Called in every worker once it has started.
+    :type initializer: Optional[Callable[..., Any]]
+    :param initargs: The arguments of ``initializer``.
+    :type initargs: tuple[Any, ...]
+
+    """
+
+    context = multiprocessing.get_context("fork")
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers, context, initializer, initargs
+    )
+
+    freeze()
+    try:
+        # executors using fork start every worker with the first task
+        executor.submit(int).result()
+    except BaseException:
+        executor.shutdown()
+        raise
+    finally:
+        gc.unfreeze()
+    return executor
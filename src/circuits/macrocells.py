@@ -1,10 +1,16 @@
-from typing import Generator, ClassVar
+import functools
+from typing import Generator, ClassVar, Iterable, Optional, Union
 
-from .core import Cell, Via, Via16, Via32, Via64, Interconnect, TempComponents, VDD, Binding
-from .standard_cells import PG, PGCin, PGMergeR2, PGHalfMergeR2, BUF1, XOR2
+from .core import Cell, Via, Via16, Via32, Via64, Interconnect, TempComponents, VDD, Binding, Bus
+from .standard_cells import (
+    PG, PGCin, PGMergeR2, PGHalfMergeR2, BUF1, BUF2, XOR2, FullAdder,
+    Register, _PGMergeRN, pg_merge
+)
 
 
-class _KSAR2Cin(Cell):
+class _Adder(Cell):
+    """The port layout and diagrams shared by all adder macro-cells."""
+
     __slots__ = ("i0", "i1", "cin", "o", "cout", "layers")
 
     i0: tuple[Via, ...]
@@ -15,6 +21,104 @@ class _KSAR2Cin(Cell):
     layers: tuple[tuple[Cell, ...]]
     height: ClassVar[int]
 
+    def _diagram(self) -> Generator[str, None, None]:
+        yield " ".join(
+            str(i).ljust(2) for i in range((2 ** self.height) - 1, -1, -1)
+        )
+
+        type_map = {
+            PG: "G ",
+            PGCin: "< ",
+            PGMergeR2: "X ",
+            PGHalfMergeR2: "Y ",
+            BUF1: "| ",
+            BUF2: "| ",
+            XOR2: "S ",
+            FullAdder: "F ",
+            Register: "R ",
+        }
+
+        def convert(value: Cell) -> str:
+            if isinstance(value, _PGMergeRN):
+                return "Y " if value.half else "X "
+            return type_map[type(value)]
+
+        for l in self.layers:
+            yield " ".join(convert(c) for c in reversed(l))
+
+    def diagram(self) -> str:
+        return "\n".join(self._diagram())
+
+    def _state_diagram(self) -> Generator[str, None, None]:
+        yield " ".join(
+            str(i).ljust(3) for i in range(2 ** self.height, -2, -1)
+        )
+
+        c_grey = "\033[90m"
+        c_red = "\033[31m"
+        c_blue = "\033[34m"
+        c_green = "\033[32m"
+        c_cyan = "\033[96m"
+        c_clr = "\033[0m"
+
+        type_map = {
+            PG: f"{c_grey}G",
+            PGCin: f"{c_grey}<",
+            PGMergeR2: f"{c_grey}X",
+            PGHalfMergeR2: f"{c_grey}Y",
+            BUF1: f"{c_grey}|",
+            BUF2: f"{c_grey}|",
+            XOR2: f"{c_grey}S",
+            FullAdder: f"{c_grey}F",
+            Register: f"{c_grey}R",
+        }
+        dual_out = (PG, PGCin, PGMergeR2, BUF2)
+        single_out = (PGHalfMergeR2, BUF1, XOR2)
+
+        def ie(via: Via) -> int:
+            return int(via.energized)
+
+        def convert(value: Cell) -> str:
+            if isinstance(value, _PGMergeRN):
+                tp = PGHalfMergeR2 if value.half else PGMergeR2
+            else:
+                tp = type(value)
+            p = type_map[tp]
+
+            if issubclass(tp, dual_out):
+                return f"{p}{c_red}{ie(value.o[0])}{c_blue}{ie(value.o[1])}"
+            elif issubclass(tp, single_out):
+                return f"{p}{c_green}{ie(value.o)} "
+            elif issubclass(tp, FullAdder):
+                return f"{p}{c_green}{ie(value.s)}{c_blue}{ie(value.cout)}"
+            elif issubclass(tp, Register):
+                return f"{p}{c_cyan}{ie(value.q[0])}{ie(value.q[1])}"
+            else:
+                return "???"
+
+        last_layer = len(self.layers) - 1
+
+        for i, l in enumerate(self.layers):
+            l_str = " ".join(convert(c) for c in reversed(l))
+            if not i and i == last_layer:
+                yield (
+                    f"{c_grey}Co{c_cyan}{ie(self.cout)} {l_str}"
+                    f" {c_grey}Ci{c_cyan}{ie(self.cin)}{c_clr}"
+                )
+            elif not i:
+                yield f"    {l_str} {c_grey}Ci{c_cyan}{ie(self.cin)}{c_clr}"
+            elif i == last_layer:
+                yield f"{c_grey}Co{c_cyan}{ie(self.cout)} {l_str}{c_clr}"
+            else:
+                yield f"    {l_str}{c_clr}"
+
+    def state_diagram(self) -> str:
+        return "\n".join(self._state_diagram())
+
+
+class _KSAR2Cin(_Adder):
+    __slots__ = ()
+
     def _init(self, vdd: VDD) -> None:
         cmp = TempComponents()
         layers: list[Cell] = list()
@@ -97,102 +201,504 @@ class _KSAR2Cin(Cell):
         cout = gos[-1]
 
         # BINDINGS
-        self.i0 = tuple(pg.i[0] for pg in pgs)
-        self.i1 = tuple(pg.i[1] for pg in pgs)
+        self.i0 = Bus(pg.i[0] for pg in pgs)
+        self.i1 = Bus(pg.i[1] for pg in pgs)
         self.cin = cin
-        self.o = sums
+        self.o = Bus(sums)
         self.cout = cout
         self.layers = layers
         self.components = cmp.to_components()
 
-    def _diagram(self) -> Generator[str, None, None]:
-        yield " ".join(
-            str(i).ljust(2) for i in range((2 ** self.height) - 1, -1, -1)
-        )
 
-        type_map = {
-            PG: "G ",
-            PGCin: "< ",
-            PGMergeR2: "X ",
-            PGHalfMergeR2: "Y ",
-            BUF1: "| ",
-            XOR2: "S ",
-        }
+class KSA16R2Cin(_KSAR2Cin):
+    height = 4
+    i0: Via16
+    i1: Via16
+    o: Via16
 
-        for l in self.layers:
-            yield " ".join(type_map[type(c)] for c in reversed(l))
 
-    def diagram(self) -> str:
-        return "\n".join(self._diagram())
+class KSA32R2Cin(_KSAR2Cin):
+    height = 5
+    i0: Via32
+    i1: Via32
+    o: Via32
 
-    def _state_diagram(self) -> Generator[str, None, None]:
-        yield " ".join(
-            str(i).ljust(3) for i in range(2 ** self.height, -2, -1)
-        )
 
-        c_grey = "\033[90m"
-        c_red = "\033[31m"
-        c_blue = "\033[34m"
-        c_green = "\033[32m"
-        c_cyan = "\033[96m"
-        c_clr = "\033[0m"
+class KSA64R2Cin(_KSAR2Cin):
+    height = 6
+    i0: Via64
+    i1: Via64
+    o: Via64
 
-        type_map = {
-            PG: f"{c_grey}G",
-            PGCin: f"{c_grey}<",
-            PGMergeR2: f"{c_grey}X",
-            PGHalfMergeR2: f"{c_grey}Y",
-            BUF1: f"{c_grey}|",
-            XOR2: f"{c_grey}S",
-        }
-        dual_out = (PG, PGCin, PGMergeR2)
-        single_out = (PGHalfMergeR2, BUF1, XOR2)
 
-        def ie(via: Via) -> int:
-            return int(via.energized)
+class _PrefixAdderCin(_Adder):
+    """A carry-in parallel-prefix adder built from a prefix graph.
 
-        def convert(value: Cell) -> str:
-            tp = type(value)
-            p = type_map[tp]
+    Subclasses describe the graph with :meth:`_prefix`. Each column
+    ``i`` holds the group PG of the columns ``[low, i]``, and a merge
+    ``(i, j)`` combines it with the group of column ``j = low - 1``.
+    Higher radix merges ``(i, (j0, j1, ...))`` combine it with several
+    adjacent groups, each ending directly below the previous one. Merges
+    reaching column 0 only produce a generate bit (grey cells), and
+    columns without a merge in a layer are carried by buffers.
 
-            if isinstance(value, dual_out):
-                return f"{p}{c_red}{ie(value.o[0])}{c_blue}{ie(value.o[1])}"
-            elif isinstance(value, single_out):
-                return f"{p}{c_green}{ie(value.o)} "
-            else:
-                return "???"
+    Registers are inserted after the layers in ``pipeline`` (layer 0
+    being the generate layer), making the adder a pipeline of
+    ``latency`` stages clocked by ``clk`` and ``clkn`` (see
+    :class:`~circuits.sequential.Clock`). Each column's register holds
+    its group output, its original propagate bit and (for column 0) the
+    carry-in.
 
-        last_layer = len(self.layers) - 1
+    """
 
-        for i, l in enumerate(self.layers):
-            l_str = " ".join(convert(c) for c in reversed(l))
-            if not i:
-                yield f"    {l_str} {c_grey}Ci{c_cyan}{ie(self.cin)}{c_clr}"
-            elif i == last_layer:
-                yield f"{c_grey}Co{c_cyan}{ie(self.cout)} {l_str}{c_clr}"
+    __slots__ = ("clk", "clkn", "registers")
+
+    clk: Optional[Via]
+    clkn: Optional[Via]
+    registers: tuple[tuple[Register, ...], ...]
+    """The registers of each pipeline stage, by column"""
+
+    pipeline: ClassVar[tuple[int, ...]] = ()
+
+    @property
+    def latency(self) -> int:
+        return len(self.pipeline)
+
+    @classmethod
+    def _prefix(cls, width: int) -> Iterable[
+        Iterable[tuple[int, Union[int, tuple[int, ...]]]]
+    ]:
+        """Return the ``(i, j)`` merges of each layer."""
+        raise NotImplementedError
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+        layers: list[tuple[Cell, ...]] = list()
+        width = 2 ** self.height
+
+        # the consumers of each produced via, connected at the end
+        fanout: dict[int, tuple[Via, list[Via]]] = dict()
+
+        def connect(
+            src: Union[Via, tuple[Via, ...]], dst: Union[Via, tuple[Via, ...]]
+        ) -> None:
+            if isinstance(src, Via):
+                src, dst = (src,), (dst,)
+            for s, d in zip(src, dst):
+                fanout.setdefault(id(s), (s, list()))[1].append(d)
+
+        # GENERATE
+        pgs = (PGCin(vdd), *tuple(PG(vdd) for _ in range(width - 1)))
+        cmp.add(*pgs)
+        layers.append(pgs)
+
+        # the group output of each column (only g once it reaches column
+        # 0) and the lowest column of its group
+        outs: list[Union[Via, tuple[Via, ...]]] = [
+            pgs[0].o[1], *(pg.o for pg in pgs[1:])
+        ]
+        lows = list(range(width))
+
+        # the original propagate bits and carry-in, as seen by the sums
+        cin = Via()
+        cmp.add(cin)
+        connect(cin, pgs[0].cin)
+        ps = [pg.o[0] for pg in pgs]
+        late_cin = cin
+
+        registers: list[tuple[Register, ...]] = list()
+
+        def stage(index: int) -> None:
+            nonlocal late_cin
+            if index not in self.pipeline:
+                return
+
+            stage_registers = list()
+            for i in range(width):
+                signals = (
+                    *((outs[i],) if isinstance(outs[i], Via) else outs[i]),
+                    ps[i],
+                    *((late_cin,) if not i else ()),
+                )
+                reg = Register(vdd, len(signals))
+                connect(signals, reg.d)
+                stage_registers.append(reg)
+
+                out_len = 1 if isinstance(outs[i], Via) else 2
+                outs[i] = reg.q[0] if out_len == 1 else reg.q[:2]
+                ps[i] = reg.q[out_len]
+                if not i:
+                    late_cin = reg.q[-1]
+
+            cmp.add(*stage_registers)
+            layers.append(tuple(stage_registers))
+            registers.append(tuple(stage_registers))
+
+        stage(0)
+
+        # GROUP PG
+        for index, merges in enumerate(self._prefix(width), 1):
+            merges = dict(merges)
+            layer: list[Cell] = list()
+            new_outs = list(outs)
+
+            for i in range(width):
+                if i not in merges:
+                    buf = BUF1(vdd) if not lows[i] else BUF2(vdd)
+                    connect(outs[i], buf.i)
+                    new_outs[i] = buf.o
+                    layer.append(buf)
+                    continue
+
+                js = merges[i]
+                group = (i, *((js,) if isinstance(js, int) else js))
+                for k, j in zip(group, group[1:]):
+                    if not lows[k] or j != lows[k] - 1:
+                        raise ValueError(f"Invalid prefix merge ({i}, {js})")
+
+                half = not lows[group[-1]]
+                if len(group) == 2:
+                    cell = (PGHalfMergeR2 if half else PGMergeR2)(vdd)
+                    ports = (cell.i0, cell.i1)
+                else:
+                    cell = pg_merge(len(group), half)(vdd)
+                    ports = cell.i
+                for k, port in zip(group, ports):
+                    connect(outs[k], port)
+                new_outs[i] = cell.o
+                layer.append(cell)
+
+            merged = {i: js if isinstance(js, int) else js[-1] for i, js in (
+                merges.items()
+            )}
+            lows = [lows[merged[i]] if i in merged else lows[i] for i in (
+                range(width)
+            )]
+
+            cmp.add(*layer)
+            layers.append(tuple(layer))
+            outs = new_outs
+            stage(index)
+
+        if any(lows):
+            raise ValueError("Prefix graph does not reach column 0")
+
+        # SUMS AND COUT
+        sum_xors = tuple(XOR2(vdd) for _ in range(width))
+        cmp.add(*sum_xors)
+        layers.append(sum_xors)
+
+        for i, xor in enumerate(sum_xors):
+            connect(ps[i], xor.i[0])
+            connect(outs[i - 1] if i else late_cin, xor.i[1])
+
+        # CLOCK
+        if registers:
+            self.clk = Via()
+            self.clkn = Via()
+            cmp.add(self.clk, self.clkn)
+            all_registers = tuple(r for rs in registers for r in rs)
+            cmp.add(
+                Interconnect(self.clk, *(r.clk for r in all_registers)),
+                Interconnect(self.clkn, *(r.clkn for r in all_registers))
+            )
+        else:
+            self.clk = self.clkn = None
+
+        for src, dsts in fanout.values():
+            if len(dsts) == 1:
+                cmp.add(Binding(src, dsts[0]))
             else:
-                yield f"    {l_str}{c_clr}"
+                cmp.add(Interconnect(src, *dsts))
 
-    def state_diagram(self) -> str:
-        return "\n".join(self._state_diagram())
+        # BINDINGS
+        self.i0 = Bus(pg.i[0] for pg in pgs)
+        self.i1 = Bus(pg.i[1] for pg in pgs)
+        self.cin = cin
+        self.o = Bus(x.o for x in sum_xors)
+        self.cout = outs[-1]
+        self.layers = tuple(layers)
+        self.registers = tuple(registers)
+        self.components = cmp.to_components()
 
 
-class KSA16R2Cin(_KSAR2Cin):
+class _BKAR2Cin(_PrefixAdderCin):
+    """Brent-Kung: a binary tree of merges followed by an inverse tree
+    (``2 log2(n) - 1`` layers, fewest cells).
+
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _prefix(cls, width: int) -> Iterable[Iterable[tuple[int, int]]]:
+        height = width.bit_length() - 1
+        for layer in range(height):
+            step = 2 ** (layer + 1)
+            yield (
+                (i, i - step // 2) for i in range(step - 1, width, step)
+            )
+        for layer in range(height - 2, -1, -1):
+            step = 2 ** (layer + 1)
+            yield (
+                (i, i - step // 2)
+                for i in range(step + step // 2 - 1, width, step)
+            )
+
+
+class _SKAR2Cin(_PrefixAdderCin):
+    """Sklansky: divide and conquer (``log2(n)`` layers, high fan-out)."""
+
+    __slots__ = ()
+
+    @classmethod
+    def _prefix(cls, width: int) -> Iterable[Iterable[tuple[int, int]]]:
+        for layer in range(width.bit_length() - 1):
+            yield (
+                (i, ((i >> layer) << layer) - 1)
+                for i in range(width) if (i >> layer) & 1
+            )
+
+
+class _HCAR2Cin(_PrefixAdderCin):
+    """Han-Carlson: Kogge-Stone over the odd columns, with a final layer
+    for the even columns (``log2(n) + 1`` layers, half the cells of
+    Kogge-Stone).
+
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _prefix(cls, width: int) -> Iterable[Iterable[tuple[int, int]]]:
+        yield ((i, i - 1) for i in range(1, width, 2))
+        for layer in range(1, width.bit_length() - 1):
+            offset = 2 ** layer
+            yield ((i, i - offset) for i in range(offset + 1, width, 2))
+        yield ((i, i - 1) for i in range(2, width, 2))
+
+
+class BKA16R2Cin(_BKAR2Cin):
     height = 4
     i0: Via16
     i1: Via16
     o: Via16
 
 
-class KSA32R2Cin(_KSAR2Cin):
+class BKA32R2Cin(_BKAR2Cin):
     height = 5
     i0: Via32
     i1: Via32
     o: Via32
 
 
-class KSA64R2Cin(_KSAR2Cin):
+class BKA64R2Cin(_BKAR2Cin):
+    height = 6
+    i0: Via64
+    i1: Via64
+    o: Via64
+
+
+class SKA16R2Cin(_SKAR2Cin):
+    height = 4
+    i0: Via16
+    i1: Via16
+    o: Via16
+
+
+class SKA32R2Cin(_SKAR2Cin):
+    height = 5
+    i0: Via32
+    i1: Via32
+    o: Via32
+
+
+class SKA64R2Cin(_SKAR2Cin):
+    height = 6
+    i0: Via64
+    i1: Via64
+    o: Via64
+
+
+class HCA16R2Cin(_HCAR2Cin):
+    height = 4
+    i0: Via16
+    i1: Via16
+    o: Via16
+
+
+class HCA32R2Cin(_HCAR2Cin):
+    height = 5
+    i0: Via32
+    i1: Via32
+    o: Via32
+
+
+class HCA64R2Cin(_HCAR2Cin):
+    height = 6
+    i0: Via64
+    i1: Via64
+    o: Via64
+
+
+class _RCACin(_Adder):
+    """A ripple-carry adder: a chain of ``FullAdder``\\ s."""
+
+    __slots__ = ()
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+        width = 2 ** self.height
+
+        fas = tuple(FullAdder(vdd) for _ in range(width))
+        cmp.add(*fas)
+
+        # carry chain
+        for fa0, fa1 in zip(fas, fas[1:]):
+            cmp.add(Binding(fa0.cout, fa1.cin))
+
+        # BINDINGS
+        self.i0 = Bus(fa.i[0] for fa in fas)
+        self.i1 = Bus(fa.i[1] for fa in fas)
+        self.cin = fas[0].cin
+        self.o = Bus(fa.s for fa in fas)
+        self.cout = fas[-1].cout
+        self.layers = (fas,)
+        self.components = cmp.to_components()
+
+
+class RCA16Cin(_RCACin):
+    height = 4
+    i0: Via16
+    i1: Via16
+    o: Via16
+
+
+class RCA32Cin(_RCACin):
+    height = 5
+    i0: Via32
+    i1: Via32
+    o: Via32
+
+
+class RCA64Cin(_RCACin):
     height = 6
     i0: Via64
     i1: Via64
     o: Via64
+
+
+class _KSARNCin(_PrefixAdderCin):
+    """A Kogge-Stone adder of a higher radix: every layer merges each
+    column with up to ``radix - 1`` groups below it, so it needs only
+    ``ceil(log_radix(n))`` layers.
+
+    """
+
+    __slots__ = ()
+
+    radix: ClassVar[int]
+
+    @classmethod
+    def _prefix(cls, width: int) -> Iterable[
+        Iterable[tuple[int, tuple[int, ...]]]
+    ]:
+        span = 1
+        while span < width:
+            yield (
+                (i, tuple(range(i - span, -1, -span))[:cls.radix - 1])
+                for i in range(span, width)
+            )
+            span *= cls.radix
+
+
+class _KSAR4Cin(_KSARNCin):
+    __slots__ = ()
+
+    radix = 4
+
+
+class KSA16R4Cin(_KSAR4Cin):
+    height = 4
+    i0: Via16
+    i1: Via16
+    o: Via16
+
+
+class KSA32R4Cin(_KSAR4Cin):
+    height = 5
+    i0: Via32
+    i1: Via32
+    o: Via32
+
+
+class KSA64R4Cin(_KSAR4Cin):
+    height = 6
+    i0: Via64
+    i1: Via64
+    o: Via64
+
+
+class _PKSAR2Cin(_KSARNCin):
+    """A pipelined radix-2 carry-in Kogge-Stone adder. Subclasses may
+    override ``pipeline`` to move, add or remove register stages.
+
+    Without registers, its layers hold the same cells as those of
+    :class:`_KSAR2Cin`, which wires its layers directly and so has no
+    place to insert registers; the prefix generator builds them instead.
+
+    """
+
+    __slots__ = ()
+
+    radix = 2
+
+
+class PKSA16R2Cin(_PKSAR2Cin):
+    height = 4
+    pipeline = (2, 4)
+    i0: Via16
+    i1: Via16
+    o: Via16
+
+
+class PKSA32R2Cin(_PKSAR2Cin):
+    height = 5
+    pipeline = (2, 4)
+    i0: Via32
+    i1: Via32
+    o: Via32
+
+
+class PKSA64R2Cin(_PKSAR2Cin):
+    height = 6
+    pipeline = (2, 4, 6)
+    i0: Via64
+    i1: Via64
+    o: Via64
+
+
+@functools.cache
+def ksa_r2cin(width: int) -> type[_KSAR2Cin]:
+    """Return the radix-2 carry-in Kogge-Stone adder class of ``width``
+    bits (any power of two of at least 2), e.g. ``ksa_r2cin(256)``.
+
+    The built adder has ``9 * width * log2(width) + width + 24``
+    transistors, so construction time and memory grow as
+    ``O(n log n)``.
+
+    """
+
+    if width < 2 or width & (width - 1):
+        raise ValueError("Width must be a power of two of at least 2")
+
+    height = width.bit_length() - 1
+    for cls in (KSA16R2Cin, KSA32R2Cin, KSA64R2Cin):
+        if cls.height == height:
+            return cls
+
+    return type(
+        f"KSA{width}R2Cin",
+        (_KSAR2Cin,),
+        {"height": height, "__module__": __name__},
+    )
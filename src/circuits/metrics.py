@@ -0,0 +1,158 @@
+from __future__ import annotations
+import dataclasses
+import random
+from typing import Any, Iterable, Optional, Union
+
+from .core import Cell, Via, Reachable, _counters
+from .drivers import StreamingAdder
+from .netlist import Netlist
+from .standard_cells import DFF
+
+
+__all__ = (
+    "EventCounter",
+    "AdderMetrics",
+    "adder_metrics",
+    "compare_adders",
+)
+
+
+class EventCounter:
+    """Counts propagation events (state effector callbacks) in the
+    circuits reachable from a set of roots.
+
+    Counting is only active inside a ``with`` block. The circuits are
+    not modified, so they can be forked and edited while counting.
+
+    """
+
+    def __init__(self, *roots: Union[Cell, Via]) -> None:
+        self.reachable = Reachable.from_roots(*roots)
+        self.count = 0
+        self._vias = frozenset(map(id, self.reachable.vias))
+
+    def _count(self, via: Via) -> None:
+        if id(via) in self._vias:
+            self.count += 1
+
+    def __enter__(self) -> EventCounter:
+        if self not in _counters:
+            _counters.append(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self in _counters:
+            _counters.remove(self)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class AdderMetrics:
+    name: str
+    width: int
+    num_transistors: int
+    depth: int
+    """The longest transistor chain from an input or register to an
+    output or register (i.e. the clock period of a pipelined adder)"""
+
+    events_per_addition: float
+    latency: int = 0
+    """The number of pipeline stages"""
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.num_transistors} transistors, depth"
+            f" {self.depth}, latency {self.latency},"
+            f" {self.events_per_addition:.1f} events/addition"
+        )
+
+
+def adder_metrics(
+    cell: Any,
+    num_additions: int = 100,
+    seed: Optional[int] = None,
+    name: Optional[str] = None,
+) -> AdderMetrics:
+    """Measure an adder macro-cell with the ``i0``, ``i1``, ``cin``,
+    ``o`` and ``cout`` port layout (its power rail is energized here if
+    it is not yet).
+
+    Events are counted over ``num_additions`` random additions (each
+    starting from the state the previous one left behind), streamed one
+    per clock cycle through pipelined adders (so their events include
+    the clock's).
+
+    :param cell: The adder. Its ports must not have state effectors
+        registered by the caller yet (a :class:`StreamingAdder` is
+        created to drive it).
+    :param name: The name in the report (the cell's type name by
+        default).
+
+    """
+
+    registers = tuple(
+        c for c in cell.components.all_cells() if isinstance(c, DFF)
+    )
+    netlist = Netlist(cell, exclude=registers)
+    levels = netlist.levels()
+    ends = (
+        *netlist.nets(cell.o),
+        netlist.net(cell.cout),
+        *netlist.nets(r.d for r in registers),
+    )
+
+    adder = StreamingAdder(cell)
+    for rail in Reachable.from_roots(cell).rails:
+        if not rail.energized:
+            rail.energize()
+
+    rng = random.Random(seed)
+    vectors = [
+        (
+            rng.getrandbits(adder.width),
+            rng.getrandbits(adder.width),
+            rng.getrandbits(1),
+        )
+        for _ in range(num_additions)
+    ]
+    with EventCounter(cell) as counter:
+        for _ in adder.stream(vectors):
+            pass
+
+    return AdderMetrics(
+        name=type(cell).__name__ if name is None else name,
+        width=adder.width,
+        num_transistors=len(Reachable.from_roots(cell).finfets),
+        depth=max(levels[n] for n in ends),
+        events_per_addition=counter.count / num_additions,
+        latency=adder.latency,
+    )
+
+
+def compare_adders(
+    metrics: Iterable[AdderMetrics],
+) -> str:
+    """Format adder metrics as a comparison table."""
+    metrics = tuple(metrics)
+    rows = [(
+        "adder", "width", "transistors", "depth", "latency", "events/addition"
+    )]
+    rows.extend(
+        (
+            m.name,
+            str(m.width),
+            str(m.num_transistors),
+            str(m.depth),
+            str(m.latency),
+            f"{m.events_per_addition:.1f}",
+        )
+        for m in metrics
+    )
+
+    widths = [max(len(r[i]) for r in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            c.ljust(w) if not i else c.rjust(w)
+            for i, (c, w) in enumerate(zip(r, widths))
+        )
+        for r in rows
+    )
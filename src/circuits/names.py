@@ -0,0 +1,256 @@
+from __future__ import annotations
+import fnmatch
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, Union
+
+from .core import Binding, Bus, Cell, Interconnect, Via
+from .netlist import Netlist, cell_paths
+from .timing import TimedSimulator
+
+
+__all__ = (
+    "NameIndex",
+    "ProbeSet",
+)
+
+
+_Named = Union[Cell, Via, Interconnect, Binding]
+
+
+def _ports(cell: Cell) -> Iterator[tuple[str, Any]]:
+    # the attributes a cell exposes, in declaration order
+    for tp in reversed(type(cell).__mro__):
+        for attr in tp.__dict__.get("__slots__", ()):
+            if attr not in ("components", "__weakref__"):
+                yield attr, getattr(cell, attr, None)
+
+
+class NameIndex:
+    """Hierarchical path names of every cell, via, interconnect and
+    binding of a circuit, with O(1) lookups both ways.
+
+    Cells are named as by :func:`~circuits.netlist.cell_paths`, joined
+    by dots (e.g. ``KSA16R2Cin.PGMergeR2_17.AND2_0``). A via is named
+    after the cell attribute it is exposed as (e.g.
+    ``KSA16R2Cin.PGMergeR2_17.AND2_0.o``, ``KSA16R2Cin.i0[3]``, or
+    ``StructuralCell.inputs.a`` for a port in a dict), or else after its
+    position in its cell's components (``via_2``), and interconnects and
+    bindings after their type and position (``Interconnect_0``). Cells exposed as attributes (e.g.
+    ``KSA16R2Cin.layers[3][17]``) get an alias.
+
+    An object reachable under several names (e.g. a port of a cell that
+    is also a port of its parent) can be looked up by any of them; its
+    canonical name is the one closest to the root.
+
+    """
+
+    __slots__ = ("root", "_objects", "_names")
+
+    def __init__(self, cell: Cell, name: Optional[str] = None) -> None:
+        """
+        :param cell: The root cell.
+        :type cell: Cell
+        :param name: The name of the root cell (its type name by
+            default).
+        :type name: Optional[str]
+
+        """
+
+        self.root = cell
+        self._objects: dict[str, _Named] = dict()
+        self._names: dict[int, str] = dict()
+
+        for path, c in cell_paths(cell, name):
+            prefix = ".".join(path)
+            self._add(prefix, c)
+
+            for attr, value in _ports(c):
+                self._add_port(f"{prefix}.{attr}", value)
+
+            components = c.components
+            for i, v in enumerate(components.vias):
+                self._add(f"{prefix}.via_{i}", v)
+            for i, x in enumerate(components.interconnects):
+                self._add(f"{prefix}.Interconnect_{i}", x)
+            for i, x in enumerate(components.bindings):
+                self._add(f"{prefix}.Binding_{i}", x)
+
+    def _add(self, name: str, obj: _Named) -> None:
+        self._objects[name] = obj
+        self._names.setdefault(id(obj), name)
+
+    def _add_port(self, name: str, value: Any) -> None:
+        if isinstance(value, Via):
+            self._add(name, value)
+        elif isinstance(value, Cell):
+            # only an alias, cells keep their path names
+            self._objects[name] = value
+        elif isinstance(value, (tuple, list)):
+            for i, v in enumerate(value):
+                self._add_port(f"{name}[{i}]", v)
+        elif isinstance(value, Mapping):
+            for key, v in value.items():
+                self._add_port(f"{name}.{key}", v)
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._objects)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._objects
+
+    def __getitem__(self, name: str) -> _Named:
+        return self._objects[name]
+
+    def get(
+        self, name: str, default: Optional[_Named] = None
+    ) -> Optional[_Named]:
+        return self._objects.get(name, default)
+
+    def via(self, name: str) -> Via:
+        """Like ``index[name]``, but raises :class:`TypeError` if
+        ``name`` is not a via.
+
+        """
+
+        v = self._objects[name]
+        if not isinstance(v, Via):
+            raise TypeError(f"{name!r} is a {type(v).__name__}, not a Via")
+        return v
+
+    def name(self, obj: _Named) -> str:
+        """The canonical name of ``obj``."""
+        return self._names[id(obj)]
+
+    def add(self, name: str, obj: _Named) -> None:
+        """Name an object (e.g. a via created outside of any cell).
+
+        :raises ValueError: If ``name`` is already taken by another
+            object.
+
+        """
+
+        existing = self._objects.get(name)
+        if existing is not None and existing is not obj:
+            raise ValueError(f"{name!r} is already taken")
+        self._add(name, obj)
+
+    def glob(self, pattern: str) -> list[str]:
+        """Every name matching a shell-style ``pattern`` (e.g.
+        ``"KSA16R2Cin.PGMergeR2_*.o"``), in index order. This is a scan of
+        the whole index.
+
+        """
+
+        return fnmatch.filter(self._objects, pattern)
+
+    def net_names(self, netlist: Netlist) -> list[Optional[str]]:
+        """The canonical name of the first named via of every net of
+        ``netlist`` (``None`` for nets without one).
+
+        """
+
+        names: list[Optional[str]] = [None] * netlist.num_nets
+        for name, obj in self._objects.items():
+            if not isinstance(obj, Via):
+                continue
+            n = netlist._net_of.get(id(obj))
+            if n is not None and names[n] is None:
+                names[n] = self._names[id(obj)]
+        return names
+
+    def probes(self, *patterns: str) -> ProbeSet:
+        """A probe set of the vias named by ``patterns`` (names or
+        shell-style patterns), in order.
+
+        :raises KeyError: If a pattern matches no via.
+
+        """
+
+        probes: dict[str, Via] = dict()
+        for pattern in patterns:
+            if pattern in self._objects:
+                names = [pattern]
+            else:
+                names = self.glob(pattern)
+
+            matched = False
+            for name in names:
+                v = self._objects[name]
+                if isinstance(v, Via):
+                    probes[name] = v
+                    matched = True
+            if not matched:
+                raise KeyError(pattern)
+        return ProbeSet(probes)
+
+
+class ProbeSet:
+    """A named set of vias to observe, on the live circuit or on a
+    compiled :class:`~circuits.netlist.Netlist` of it.
+
+    """
+
+    __slots__ = ("names", "vias")
+
+    def __init__(
+        self, probes: Union[Mapping[str, Via], Iterable[tuple[str, Via]]]
+    ) -> None:
+        """
+        :param probes: The vias by name.
+        :type probes: Union[Mapping[str, Via], Iterable[tuple[str, Via]]]
+
+        """
+
+        probes = dict(probes)
+        self.names = tuple(probes)
+        self.vias = Bus(probes.values())
+        """The probed vias, in the order of :attr:`names`"""
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}{self.names!r}"
+
+    def sample(self) -> dict[str, bool]:
+        """The current state of every probe."""
+        signal = self.vias.get_signal()
+        return {n: bool(signal >> i & 1) for i, n in enumerate(self.names)}
+
+    def get_signal(self) -> int:
+        """The current state of every probe, packed LSB first."""
+        return self.vias.get_signal()
+
+    def nets(self, netlist: Netlist) -> tuple[int, ...]:
+        """The net of every probe in ``netlist``."""
+        return netlist.nets(self.vias)
+
+    def values(
+        self, netlist: Netlist, values: Sequence[int]
+    ) -> dict[str, int]:
+        """The value of every probe in ``values`` (e.g. the result of
+        :meth:`Netlist.evaluate` or :attr:`TimedSimulator.values`).
+
+        """
+
+        return {
+            name: values[n] for name, n in zip(self.names, self.nets(netlist))
+        }
+
+    def waveforms(
+        self, simulator: TimedSimulator
+    ) -> dict[str, list[tuple[int, int]]]:
+        """The waveform of every probe since the last input change (see
+        :meth:`TimedSimulator.waveform`).
+
+        """
+
+        return {
+            name: simulator.waveform(n)
+            for name, n in zip(self.names, self.nets(simulator.netlist))
+        }
@@ -0,0 +1,318 @@
+from __future__ import annotations
+from typing import Iterable, Iterator, Mapping, Optional, Sequence, Union
+
+from .core import Cell, Via, VDDStateEffector, Reachable
+
+
+__all__ = (
+    "Netlist",
+    "CombinationalLoopError",
+    "cell_paths",
+)
+
+
+def cell_paths(
+    cell: Cell, name: Optional[str] = None
+) -> Iterator[tuple[tuple[str, ...], Cell]]:
+    """Yield the hierarchical path of ``cell`` and of every sub-cell.
+
+    Paths start with ``name`` (the cell's type name by default), and each
+    sub-cell is named after its type and its index among the siblings of
+    the same type (e.g. ``("KSA16R2Cin", "PGMergeR2_17", "AND2_0")``).
+
+    """
+
+    stack = [((type(cell).__name__ if name is None else name,), cell)]
+    while stack:
+        path, c = stack.pop()
+        yield path, c
+
+        counts: dict[str, int] = dict()
+        children = list()
+        for child in c.components.cells:
+            tp = type(child).__name__
+            i = counts[tp] = counts.get(tp, -1) + 1
+            children.append(((*path, f"{tp}_{i}"), child))
+        stack.extend(reversed(children))
+
+
+def _assignment(
+    inputs: Sequence[Sequence[int]], signals: Sequence[int]
+) -> dict[int, int]:
+    # the value of every input net, from signals (nets map LSB first)
+    assignment: dict[int, int] = dict()
+    for nets, signal in zip(inputs, signals):
+        for i, n in enumerate(nets):
+            assignment[n] = (signal >> i) & 1
+    return assignment
+
+
+def _signals(
+    values: Sequence[int], outputs: Sequence[Sequence[int]]
+) -> tuple[int, ...]:
+    # the values of groups of nets, packed into signals (LSB first)
+    return tuple(
+        sum(values[n] << i for i, n in enumerate(nets)) for nets in outputs
+    )
+
+
+class CombinationalLoopError(ValueError):
+    """Raised when compiling a netlist with a loop that does not pass
+    through an excluded cell.
+
+    """
+
+    def __init__(
+        self, message: str, nets: tuple[int, ...], vias: tuple[Via, ...]
+    ) -> None:
+        super().__init__(message)
+        self.nets = nets
+        """The nets of one loop, each driving the next (through a gate or
+        source) and the last driving the first"""
+
+        self.vias = vias
+        """A via of each net of the loop"""
+
+
+class Netlist:
+    """A flattened view of a circuit's transistor netlist.
+
+    Vias joined by interconnects and bindings collapse into a single
+    *net* (they are always in the same state once settled), and each
+    FinFET becomes a ``(gate, source, drain, p_type)`` tuple of net
+    indices. A net is energized when it is powered by a power rail, set
+    externally, or driven by a conducting FinFET whose source net is
+    energized.
+
+    Transistor ``i`` is ``reachable.finfets[i]``. Pickling (e.g. to share
+    the netlist with worker processes) drops ``reachable`` and the via
+    lookup, leaving only integers.
+
+    """
+
+    __slots__ = (
+        "num_nets",
+        "transistors",
+        "powered",
+        "drivers",
+        "order",
+        "reachable",
+        "_net_of",
+    )
+
+    num_nets: int
+    transistors: tuple[tuple[int, int, int, bool], ...]
+    powered: frozenset[int]
+    drivers: tuple[tuple[int, ...], ...]
+    """The transistors whose drain is on each net"""
+
+    order: tuple[int, ...]
+    """All nets in topological order (drivers before the nets they
+    drive)"""
+
+    def __init__(
+        self, *roots: Union[Cell, Via], exclude: Iterable[Cell] = ()
+    ) -> None:
+        """
+        :param exclude: Cells whose FinFETs are left out of the netlist
+            (see :meth:`Reachable.from_roots`).
+        :type exclude: Iterable[Cell]
+
+        """
+
+        reachable = Reachable.from_roots(*roots, exclude=exclude)
+        index = {id(v): i for i, v in enumerate(reachable.vias)}
+
+        # union-find over connected vias
+        parent = list(range(len(reachable.vias)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for c in (*reachable.interconnects, *reachable.bindings):
+            i0 = find(index[id(c.vias[0])])
+            for v in c.vias[1:]:
+                i = find(index[id(v)])
+                if i != i0:
+                    parent[i] = i0
+
+        # number nets in order of first appearance
+        net_ids: dict[int, int] = dict()
+        net_of: dict[int, int] = dict()
+        powered: set[int] = set()
+        for i, v in enumerate(reachable.vias):
+            net = net_ids.setdefault(find(i), len(net_ids))
+            net_of[id(v)] = net
+            if any(
+                isinstance(e, VDDStateEffector) for e in v.effectors.values()
+            ):
+                powered.add(net)
+
+        transistors = tuple(
+            (
+                net_of[id(f.gate)],
+                net_of[id(f.source)],
+                net_of[id(f.drain)],
+                f.p_type,
+            )
+            for f in reachable.finfets
+        )
+
+        drivers: list[list[int]] = [list() for _ in range(len(net_ids))]
+        for i, (_, _, drain, _) in enumerate(transistors):
+            drivers[drain].append(i)
+
+        self.num_nets = len(net_ids)
+        self.transistors = transistors
+        self.powered = frozenset(powered)
+        self.drivers = tuple(tuple(d) for d in drivers)
+        self.reachable: Optional[Reachable] = reachable
+        self._net_of = net_of
+        self.order = self._topological_order()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}[nets={self.num_nets}"
+            f" transistors={len(self.transistors)}]"
+        )
+
+    def _topological_order(self) -> tuple[int, ...]:
+        fanout: list[list[int]] = [list() for _ in range(self.num_nets)]
+        pending = [0] * self.num_nets
+
+        for gate, source, drain, _ in self.transistors:
+            for n in (gate, source):
+                fanout[n].append(drain)
+                pending[drain] += 1
+
+        order = [n for n in range(self.num_nets) if not pending[n]]
+        for n in order:
+            for d in fanout[n]:
+                pending[d] -= 1
+                if not pending[d]:
+                    order.append(d)
+
+        if len(order) != self.num_nets:
+            loop = self._find_loop(pending)
+            vias = {n: None for n in loop}
+            for v in self.reachable.vias:
+                n = self._net_of[id(v)]
+                if n in vias and vias[n] is None:
+                    vias[n] = v
+            raise CombinationalLoopError(
+                f"Netlist contains a combinational loop through {len(loop)}"
+                " nets",
+                loop,
+                tuple(vias.values()),
+            )
+
+        return tuple(order)
+
+    def _find_loop(self, pending: list[int]) -> tuple[int, ...]:
+        # every net left pending has a pending net driving it; walk back
+        # through them until one repeats
+        n = next(n for n in range(self.num_nets) if pending[n])
+        seen: dict[int, int] = dict()
+        path: list[int] = list()
+        while n not in seen:
+            seen[n] = len(path)
+            path.append(n)
+            n = next(
+                i for t in self.drivers[n]
+                for i in self.transistors[t][:2] if pending[i]
+            )
+        return tuple(reversed(path[seen[n]:]))
+
+    def net(self, via: Via, /) -> int:
+        """Return the index of the net ``via`` belongs to."""
+        return self._net_of[id(via)]
+
+    def nets(self, vias: Iterable[Via], /) -> tuple[int, ...]:
+        return tuple(self._net_of[id(v)] for v in vias)
+
+    def inputs(self) -> tuple[int, ...]:
+        """The nets that are neither powered nor driven by a FinFET."""
+        return tuple(
+            n for n in range(self.num_nets)
+            if not self.drivers[n] and n not in self.powered
+        )
+
+    def levels(self) -> list[int]:
+        """The logic level of every net: the length of the longest chain
+        of transistors (through gates or sources) from an input or
+        powered net.
+
+        """
+
+        levels = [0] * self.num_nets
+        transistors = self.transistors
+        for n in self.order:
+            level = 0
+            for t in self.drivers[n]:
+                gate, source, _, _ = transistors[t]
+                level = max(level, levels[gate] + 1, levels[source] + 1)
+            levels[n] = level
+        return levels
+
+    def evaluate(
+        self, inputs: Mapping[int, int], mask: int = 1
+    ) -> list[int]:
+        """Evaluate every net.
+
+        Each value is a bit vector of independent lanes: ``inputs`` maps
+        input nets to their values in each lane, and ``mask`` has one bit
+        set per lane (the default evaluates a single lane).
+
+        :return: The value of every net, indexed by net.
+
+        """
+
+        values = [0] * self.num_nets
+        transistors = self.transistors
+        drivers = self.drivers
+        powered = self.powered
+
+        for n in self.order:
+            if n in powered:
+                values[n] = mask
+                continue
+
+            v = inputs.get(n, 0)
+            for t in drivers[n]:
+                gate, source, _, p_type = transistors[t]
+                if p_type:
+                    v |= values[source] & ~values[gate]
+                else:
+                    v |= values[source] & values[gate]
+            values[n] = v & mask
+
+        return values
+
+    def evaluate_signals(
+        self,
+        inputs: Sequence[Sequence[int]],
+        signals: Sequence[int],
+        outputs: Sequence[Sequence[int]],
+    ) -> tuple[int, ...]:
+        """Evaluate a single lane using integer signals, like
+        :class:`~circuits.core.SignalInterface` (nets map LSB first).
+
+        """
+
+        values = self.evaluate(_assignment(inputs, signals))
+        return _signals(values, outputs)
+
+    def __getstate__(self) -> dict[str, object]:
+        return {
+            k: getattr(self, k) for k in self.__slots__
+            if k not in ("reachable", "_net_of")
+        }
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        for k, v in state.items():
+            setattr(self, k, v)
+        self.reachable = None
+        self._net_of = dict()
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import concurrent.futures
+import os
+import sys
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from .netlist import Netlist, _assignment, _signals
+
+
+__all__ = (
+    "gil_enabled",
+    "PartitionedNetlist",
+)
+
+
+def gil_enabled() -> bool:
+    """Whether the GIL is enabled (always on builds without free
+    threading).
+
+    """
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+# a partition: the nets of its cone in topological order, each with its
+# drivers' (gate, source, p_type) (None for powered nets)
+_Program = tuple[
+    tuple[int, Optional[tuple[tuple[int, int, bool], ...]]], ...
+]
+
+
+def _run(
+    program: _Program,
+    num_nets: int,
+    inputs: Mapping[int, int],
+    mask: int,
+) -> list[int]:
+    values = [0] * num_nets
+    for n, drivers in program:
+        if drivers is None:
+            values[n] = mask
+            continue
+
+        v = inputs.get(n, 0)
+        for gate, source, p_type in drivers:
+            if p_type:
+                v |= values[source] & ~values[gate]
+            else:
+                v |= values[source] & values[gate]
+        values[n] = v & mask
+    return values
+
+
+class PartitionedNetlist:
+    """Evaluates a :class:`Netlist` as partitions on a thread pool.
+
+    Each partition is the fan-in cone of a contiguous slice of the
+    outputs (e.g. a group of bit-slices of an adder, or one of several
+    independent macro-cells), so partitions never wait on each other:
+    nets shared by several cones are evaluated by each of them, and the
+    results are merged by taking every net from the first partition
+    containing it.
+
+    Threads only pay off when the GIL is disabled (free-threaded CPython
+    builds); otherwise the netlist is evaluated in the calling thread as
+    usual.
+
+    """
+
+    def __init__(
+        self,
+        netlist: Netlist,
+        num_partitions: Optional[int] = None,
+        outputs: Optional[Iterable[int]] = None,
+        *,
+        parallel: Optional[bool] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        """
+        :param netlist: The netlist.
+        :type netlist: Netlist
+        :param num_partitions: The number of partitions (the number of
+            CPUs by default).
+        :type num_partitions: Optional[int]
+        :param outputs: The nets to partition by, in slice order (by
+            default every net without fan-out, in net order). Other nets
+            are only evaluated if an output depends on them.
+        :param parallel: Evaluate partitions on threads (by default only
+            when the GIL is disabled).
+        :type parallel: Optional[bool]
+        :param executor: The executor partitions are evaluated in (by
+            default a thread pool with one thread per partition, created
+            on first use).
+        :type executor: Optional[concurrent.futures.Executor]
+
+        """
+
+        if num_partitions is None:
+            num_partitions = os.cpu_count() or 1
+        if num_partitions < 1:
+            raise ValueError("num_partitions must be at least 1")
+
+        transistors = netlist.transistors
+        if outputs is None:
+            fanout = [False] * netlist.num_nets
+            for gate, source, _, _ in transistors:
+                fanout[gate] = fanout[source] = True
+            outputs = (n for n in range(netlist.num_nets) if not fanout[n])
+        outputs = tuple(outputs)
+        num_partitions = max(1, min(num_partitions, len(outputs)))
+
+        # split the outputs into contiguous slices and collect their cones
+        position = {n: i for i, n in enumerate(netlist.order)}
+        partitions: list[tuple[int, ...]] = list()
+        for k in range(num_partitions):
+            start = k * len(outputs) // num_partitions
+            end = (k + 1) * len(outputs) // num_partitions
+            cone: set[int] = set()
+            stack = list(outputs[start:end])
+            while stack:
+                n = stack.pop()
+                if n in cone:
+                    continue
+                cone.add(n)
+                for t in netlist.drivers[n]:
+                    gate, source, _, _ = transistors[t]
+                    stack.extend((gate, source))
+            partitions.append(tuple(sorted(cone, key=position.__getitem__)))
+
+        self.netlist = netlist
+        self.partitions = tuple(partitions)
+        """The nets of each partition, in topological order"""
+
+        self.owner = [-1] * netlist.num_nets
+        """The partition each net is taken from (-1 for nets no output
+        depends on)"""
+
+        for k in reversed(range(len(partitions))):
+            for n in partitions[k]:
+                self.owner[n] = k
+        self._owned = tuple(
+            tuple(n for n in p if self.owner[n] == k)
+            for k, p in enumerate(partitions)
+        )
+
+        self._programs: tuple[_Program, ...] = tuple(
+            tuple(
+                (
+                    n,
+                    None if n in netlist.powered else tuple(
+                        (gate, source, p_type)
+                        for gate, source, _, p_type in (
+                            transistors[t] for t in netlist.drivers[n]
+                        )
+                    ),
+                )
+                for n in p
+            )
+            for p in partitions
+        )
+
+        self.parallel = not gil_enabled() if parallel is None else parallel
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    @property
+    def duplication(self) -> float:
+        """The number of net evaluations per evaluated net (1 when the
+        partitions are independent).
+
+        """
+
+        evaluated = sum(n >= 0 for n in self.owner)
+        return sum(map(len, self.partitions)) / max(1, evaluated)
+
+    def __enter__(self) -> PartitionedNetlist:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut the thread pool down (if it was created here)."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def evaluate(
+        self, inputs: Mapping[int, int], mask: int = 1
+    ) -> list[int]:
+        """Evaluate every net, like :meth:`Netlist.evaluate` (when
+        evaluating in parallel, nets no output depends on are 0).
+
+        """
+
+        if not self.parallel:
+            return self.netlist.evaluate(inputs, mask)
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                len(self.partitions)
+            )
+
+        num_nets = self.netlist.num_nets
+        futures = [
+            self._executor.submit(_run, program, num_nets, inputs, mask)
+            for program in self._programs
+        ]
+
+        # merge in partition order
+        values = [0] * num_nets
+        for owned, future in zip(self._owned, futures):
+            result = future.result()
+            for n in owned:
+                values[n] = result[n]
+        return values
+
+    def evaluate_signals(
+        self,
+        inputs: Sequence[Sequence[int]],
+        signals: Sequence[int],
+        outputs: Sequence[Sequence[int]],
+    ) -> tuple[int, ...]:
+        """Like :meth:`Netlist.evaluate_signals`."""
+        values = self.evaluate(_assignment(inputs, signals))
+        return _signals(values, outputs)
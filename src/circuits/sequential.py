@@ -0,0 +1,165 @@
+from __future__ import annotations
+from typing import Iterable, Optional, Sequence
+
+from .core import Cap, Cell, Via
+from .netlist import Netlist
+from .standard_cells import DFF
+
+
+__all__ = (
+    "Clock",
+    "CycleSimulator",
+)
+
+
+class Clock:
+    """Drives the non-overlapping clock phases of an energized circuit.
+
+    A rising edge de-energizes ``clkn`` before energizing ``clk``, and a
+    falling edge de-energizes ``clk`` before energizing ``clkn``. The
+    clock starts low.
+
+    """
+
+    def __init__(self, clk: Via, clkn: Optional[Via] = None) -> None:
+        """
+        :param clk: The clock via (e.g. a via interconnected with the
+            ``clk`` of every ``DFF``). A ``Cap`` is registered on it.
+        :type clk: Via
+        :param clkn: The inverted clock via (interconnected with every
+            ``clkn``), if any.
+        :type clkn: Optional[Via]
+
+        """
+
+        self.vias = (clk,) if clkn is None else (clk, clkn)
+        self.cycles = 0
+        for v in self.vias:
+            v.register(Cap(self))
+        self.fall()
+
+    @property
+    def level(self) -> bool:
+        return self.vias[0].energized
+
+    def rise(self) -> None:
+        for v in reversed(self.vias):
+            v.set_state(self, v is self.vias[0])
+
+    def fall(self) -> None:
+        for v in self.vias:
+            v.set_state(self, v is not self.vias[0])
+
+    def tick(self, cycles: int = 1) -> None:
+        """Run full clock cycles (a rising edge followed by a falling
+        edge).
+
+        """
+
+        for _ in range(cycles):
+            self.rise()
+            self.fall()
+            self.cycles += 1
+
+
+class CycleSimulator:
+    """A cycle-based simulator of a synchronous design of ``DFF``\\ s and
+    combinational logic.
+
+    The design is compiled once, with every ``DFF`` cut out of the
+    netlist: their ``q``/``qn`` become inputs and their ``d`` an output
+    of the combinational logic. Each cycle evaluates the logic once and
+    then updates all registers at once, as a rising clock edge would,
+    instead of propagating every event of the live circuit.
+
+    """
+
+    def __init__(
+        self,
+        cell: Cell,
+        inputs: Sequence[Sequence[Via]],
+        outputs: Sequence[Sequence[Via]],
+        registers: Optional[Iterable[DFF]] = None,
+    ) -> None:
+        """
+        :param cell: The design.
+        :type cell: Cell
+        :param inputs: The primary input via groups (each mapping LSB to
+            MSB, as with :class:`~circuits.core.SignalInterface`).
+        :param outputs: The output via groups.
+        :param registers: The registers of the design (every ``DFF`` in
+            ``cell`` by default). Register ``k`` is bit ``k`` of
+            :attr:`state`.
+
+        :raises ValueError: If the design has a combinational loop that
+            does not pass through a register.
+
+        """
+
+        if registers is None:
+            registers = (
+                c for c in cell.components.all_cells() if isinstance(c, DFF)
+            )
+        self.registers: tuple[DFF, ...] = tuple(
+            {id(r): r for r in registers}.values()
+        )
+
+        netlist = Netlist(cell, exclude=self.registers)
+        self.netlist = netlist
+        self.inputs = tuple(netlist.nets(g) for g in inputs)
+        self.outputs = tuple(netlist.nets(g) for g in outputs)
+        self._d = netlist.nets(r.d for r in self.registers)
+        self._q = netlist.nets(r.q for r in self.registers)
+        self._qn = netlist.nets(r.qn for r in self.registers)
+
+        self.state = 0
+        """The value of every register (bit ``k`` is register ``k``)"""
+
+        self.cycles = 0
+
+    def read_state(self) -> None:
+        """Load :attr:`state` from the registers of the live circuit."""
+        self.state = sum(
+            r.q.energized << k for k, r in enumerate(self.registers)
+        )
+
+    def step(self, *signals: int) -> tuple[int, ...]:
+        """Run one clock cycle with the given input signals (one per
+        input group).
+
+        :return: The output signals before the clock edge (i.e. of the
+            current state and inputs).
+
+        """
+
+        assignment: dict[int, int] = dict()
+        for nets, signal in zip(self.inputs, signals):
+            for i, n in enumerate(nets):
+                assignment[n] = (signal >> i) & 1
+
+        state = self.state
+        for k, (q, qn) in enumerate(zip(self._q, self._qn)):
+            bit = (state >> k) & 1
+            assignment[q] = bit
+            assignment[qn] = bit ^ 1
+
+        values = self.netlist.evaluate(assignment)
+
+        # clock edge
+        self.state = sum(values[d] << k for k, d in enumerate(self._d))
+        self.cycles += 1
+
+        return tuple(
+            sum(values[n] << i for i, n in enumerate(nets))
+            for nets in self.outputs
+        )
+
+    def run(
+        self, stimuli: Iterable[Sequence[int]]
+    ) -> list[tuple[int, ...]]:
+        """Run one cycle per item of ``stimuli`` (tuples of input
+        signals) and return the outputs of each cycle.
+
+        """
+
+        return [self.step(*signals) for signals in stimuli]
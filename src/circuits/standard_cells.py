@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Generator
+import functools
+from typing import ClassVar, Generator, Union
 
 from .core import (
     PTypeFinFET,
@@ -9,6 +10,8 @@ from .core import (
     Via16,
     Via2,
     Binding,
+    Bus,
+    Cap,
     Cell,
     TempComponents,
 )
@@ -486,3 +489,306 @@ class PGHalfMergeR2(Cell):
         self.i1 = and2.i[0]
         self.o = or2.o
         self.components = cmp.to_components()
+
+
+class SRLatch(Cell):
+    """A set-reset latch of two cross-coupled ``NOR2``\\ s (``s`` and
+    ``r`` must not both be energized).
+
+    """
+
+    __slots__ = ("s", "r", "q", "qn")
+
+    s: Via
+    r: Via
+    q: Via
+    qn: Via
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+
+        # cells
+        nor2_q = NOR2(vdd)
+        nor2_qn = NOR2(vdd)
+        cmp.add(nor2_q, nor2_qn)
+
+        # vias
+        q = Via()
+        qn = Via()
+        cmp.add(q, qn)
+
+        # interconnects and bindings
+        cmp.add(
+            Interconnect(nor2_q.o, nor2_qn.i[1], q),
+            Interconnect(nor2_qn.o, nor2_q.i[1], qn)
+        )
+
+        # expose vias
+        self.s = nor2_qn.i[0]
+        self.r = nor2_q.i[0]
+        self.q = q
+        self.qn = qn
+        self.components = cmp.to_components()
+
+
+class DLatch(Cell):
+    """A gated D latch: ``q`` follows ``d`` while ``e`` is energized, and
+    holds its value otherwise.
+
+    """
+
+    __slots__ = ("d", "e", "q", "qn")
+
+    d: Via
+    e: Via
+    q: Via
+    qn: Via
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+
+        # cells
+        not_d = NOT(vdd)
+        and2_s = AND2(vdd)
+        and2_r = AND2(vdd)
+        sr = SRLatch(vdd)
+        cmp.add(not_d, and2_s, and2_r, sr)
+
+        # vias
+        d = Via()
+        e = Via()
+        cmp.add(d, e)
+
+        # interconnects and bindings
+        cmp.add(
+            Interconnect(d, and2_s.i[0], not_d.i),
+            Interconnect(e, and2_s.i[1], and2_r.i[1]),
+            Binding(not_d.o, and2_r.i[0]),
+            Binding(and2_s.o, sr.s),
+            Binding(and2_r.o, sr.r)
+        )
+
+        # expose vias
+        self.d = d
+        self.e = e
+        self.q = sr.q
+        self.qn = sr.qn
+        self.components = cmp.to_components()
+
+
+class DFF(Cell):
+    """A master-slave D flip-flop capturing ``d`` on the rising edge of
+    ``clk``.
+
+    The master latch is enabled by ``clkn`` and the slave latch by
+    ``clk``, which must be driven as non-overlapping complementary
+    phases (``clkn`` falls before ``clk`` rises, and ``clk`` falls before
+    ``clkn`` rises), as :class:`~circuits.sequential.Clock` does.
+    Propagation has no delay, so a single clock with a local inverter
+    would let a register's new output race through the logic into
+    registers that have not seen the edge yet.
+
+    """
+
+    __slots__ = ("d", "clk", "clkn", "q", "qn")
+
+    d: Via
+    clk: Via
+    clkn: Via
+    q: Via
+    qn: Via
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+
+        # cells
+        master = DLatch(vdd)
+        slave = DLatch(vdd)
+        cmp.add(master, slave)
+
+        # interconnects and bindings
+        cmp.add(Binding(master.q, slave.d))
+
+        # terminate the unused output
+        master.qn.register(Cap())
+
+        # expose vias
+        self.d = master.d
+        self.clk = slave.e
+        self.clkn = master.e
+        self.q = slave.q
+        self.qn = slave.qn
+        self.components = cmp.to_components()
+
+
+class Register(Cell):
+    """A bank of ``DFF``\\ s sharing their clock phases."""
+
+    __slots__ = ("width", "d", "clk", "clkn", "q")
+
+    width: int
+    d: tuple[Via, ...]
+    clk: Via
+    clkn: Via
+    q: tuple[Via, ...]
+
+    def __init__(self, vdd: VDD, width: int) -> None:
+        self.width = width
+        super().__init__(vdd)
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+
+        # cells
+        dffs = tuple(DFF(vdd) for _ in range(self.width))
+        cmp.add(*dffs)
+
+        # vias
+        clk = Via()
+        clkn = Via()
+        cmp.add(clk, clkn)
+
+        # interconnects and bindings
+        cmp.add(
+            Interconnect(clk, *(dff.clk for dff in dffs)),
+            Interconnect(clkn, *(dff.clkn for dff in dffs))
+        )
+
+        # terminate the unused outputs
+        for dff in dffs:
+            dff.qn.register(Cap())
+
+        # expose vias
+        self.d = Bus(dff.d for dff in dffs)
+        self.clk = clk
+        self.clkn = clkn
+        self.q = Bus(dff.q for dff in dffs)
+        self.components = cmp.to_components()
+
+
+class _PGMergeRN(Cell):
+    """Merges ``radix`` adjacent PG groups into one.
+
+    The output is the sum of products ``G = g[0] | p[0]g[1] | p[0]p[1]g[2]
+    | ...`` (and ``P = p[0]p[1]...``) over the inputs from the highest
+    group to the lowest, built from ``AND2`` chains and an ``OR2`` tree.
+
+    """
+
+    __slots__ = ("i", "o")
+
+    i: tuple[Union[Via2, Via], ...]
+    """The PG pairs ``(p, g)`` of each group, from the highest group to
+    the lowest"""
+
+    o: Union[Via2, Via]
+    """The output PG pair"""
+
+    radix: ClassVar[int]
+    half: ClassVar[bool] = False
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+        radix = self.radix
+
+        # the consumers of each via, connected at the end
+        fanout: dict[int, tuple[Via, list[Via]]] = dict()
+
+        def connect(src: Via, dst: Via) -> None:
+            fanout.setdefault(id(src), (src, list()))[1].append(dst)
+
+        # vias
+        ps = tuple(Via() for _ in range(radix - self.half))
+        gs = tuple(Via() for _ in range(radix))
+        cmp.add(*ps, *gs)
+
+        # prefix products of the propagates (qs[k] = p[0]...p[k]), and
+        # the generate of each group gated by the propagates above it
+        qs = [ps[0]]
+        terms = [gs[0]]
+        for k in range(1, radix):
+            and_g = AND2(vdd)
+            cmp.add(and_g)
+            connect(qs[-1], and_g.i[0])
+            connect(gs[k], and_g.i[1])
+            terms.append(and_g.o)
+
+            if k < len(ps):
+                and_p = AND2(vdd)
+                cmp.add(and_p)
+                connect(qs[-1], and_p.i[0])
+                connect(ps[k], and_p.i[1])
+                qs.append(and_p.o)
+
+        # or tree
+        while len(terms) > 1:
+            next_terms = list()
+            for t0, t1 in zip(terms[::2], terms[1::2]):
+                or2 = OR2(vdd)
+                cmp.add(or2)
+                connect(t0, or2.i[0])
+                connect(t1, or2.i[1])
+                next_terms.append(or2.o)
+            if len(terms) % 2:
+                next_terms.append(terms[-1])
+            terms = next_terms
+
+        for src, dsts in fanout.values():
+            if len(dsts) == 1:
+                cmp.add(Binding(src, dsts[0]))
+            else:
+                cmp.add(Interconnect(src, *dsts))
+
+        # expose vias
+        self.i = (*zip(ps, gs), *gs[len(ps):])
+        self.o = terms[0] if self.half else (qs[-1], terms[0])
+        self.components = cmp.to_components()
+
+
+class PGMergeR3(_PGMergeRN):
+    radix = 3
+
+
+class PGMergeR4(_PGMergeRN):
+    radix = 4
+
+
+class PGHalfMergeR3(_PGMergeRN):
+    """A radix-3 merge whose lowest group (and output) is only a
+    generate bit.
+
+    """
+
+    radix = 3
+    half = True
+
+
+class PGHalfMergeR4(_PGMergeRN):
+    """A radix-4 merge whose lowest group (and output) is only a
+    generate bit.
+
+    """
+
+    radix = 4
+    half = True
+
+
+@functools.cache
+def pg_merge(radix: int, half: bool = False) -> type[_PGMergeRN]:
+    """Return the (half) merge cell of ``radix`` groups, for any radix of
+    at least 3 (``PGMergeR2`` and ``PGHalfMergeR2`` cover radix 2).
+
+    """
+
+    if radix < 3:
+        raise ValueError("Radix must be at least 3")
+
+    for cls in (PGMergeR3, PGMergeR4, PGHalfMergeR3, PGHalfMergeR4):
+        if cls.radix == radix and cls.half == half:
+            return cls
+
+    return type(
+        f"PG{'Half' if half else ''}MergeR{radix}",
+        (_PGMergeRN,),
+        {"radix": radix, "half": half, "__module__": __name__},
+    )
@@ -0,0 +1,383 @@
+from __future__ import annotations
+import array
+import collections
+import dataclasses
+import itertools
+import operator
+import weakref
+from typing import Any, Optional, Union
+
+from .core import Cell, Via, StateEffector, Reachable
+
+
+__all__ = (
+    "Checkpoint",
+    "CircuitState",
+    "CircuitFork",
+)
+
+
+_get_energized = operator.attrgetter("energized")
+_get_num_energized = operator.attrgetter("num_energized")
+_setattr = object.__setattr__
+
+# block size used when diffing captured flags against a base
+_DIFF_BLOCK = 64
+
+# shared indexes used by Cell.fork()
+_indexes: weakref.WeakKeyDictionary[Cell, CircuitState] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _consume(iterator: object) -> None:
+    collections.deque(iterator, maxlen=0)
+
+
+def _record(delta: dict[int, int], index: int, value: int, base: int) -> None:
+    # keep only the entries that differ from the base
+    if value == base:
+        delta.pop(index, None)
+    else:
+        delta[index] = int(value)
+
+
+@dataclasses.dataclass(eq=False, frozen=True, slots=True)
+class Checkpoint:
+    """The packed state of a circuit, as captured by
+    :meth:`CircuitState.capture`.
+
+    """
+
+    state: CircuitState
+    flags: bytes
+    """One byte per state effector, then one per power rail"""
+
+    counts: array.array
+    """The ``num_energized`` of each interconnect, then each binding"""
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Checkpoint):
+            return NotImplemented
+        return (
+            self.state is other.state
+            and self.flags == other.flags
+            and self.counts == other.counts
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.state), self.flags, self.counts.tobytes()))
+
+
+class CircuitState:
+    """An index over all mutable state of a circuit: the ``energized``
+    flag of every state effector on every reachable via, the
+    ``num_energized`` of every interconnect and binding, and the power
+    rails.
+
+    Capturing and restoring checkpoints is a bulk copy over this index;
+    no state is propagated. The index must be rebuilt if the circuit is
+    modified.
+
+    """
+
+    def __init__(self, *roots: Union[Cell, Via]) -> None:
+        reachable = Reachable.from_roots(*roots)
+        self._active: Optional[CircuitFork] = None
+        self._stack: list[CircuitFork] = list()
+        # vias written since the last sync, and whether the whole state
+        # was overwritten (by restore) since
+        self._touched: Optional[set[Via]] = None
+        self._rescan = False
+        # the number of forks handed out that are still alive
+        self._forks = 0
+        self._positions: dict[int, int] = dict()
+        self._connection_positions: dict[int, int] = dict()
+
+        self.reachable = reachable
+        self.effectors: tuple[StateEffector, ...] = tuple(
+            e for v in reachable.vias for e in v.effectors.values()
+        )
+        self.connections = (*reachable.interconnects, *reachable.bindings)
+        self.rails = reachable.rails
+
+    def __len__(self) -> int:
+        return len(self.effectors) + len(self.connections) + len(self.rails)
+
+    @classmethod
+    def of(cls, cell: Cell) -> CircuitState:
+        """Return the index shared by all forks of ``cell``."""
+        state = _indexes.get(cell)
+        if state is None:
+            state = _indexes[cell] = cls(cell)
+        return state
+
+    def capture(self) -> Checkpoint:
+        flags = bytes(map(_get_energized, self.effectors))
+        flags += bytes(map(_get_energized, self.rails))
+        return Checkpoint(
+            state=self,
+            flags=flags,
+            counts=array.array(
+                "L", map(_get_num_energized, self.connections)
+            ),
+        )
+
+    def restore(self, checkpoint: Checkpoint) -> None:
+        """Restore the state in ``checkpoint`` without propagation."""
+        if checkpoint.state is not self:
+            raise ValueError("Checkpoint was captured from a different index")
+
+        flags = checkpoint.flags
+        num_effectors = len(self.effectors)
+
+        _consume(map(
+            _setattr,
+            self.effectors,
+            itertools.repeat("energized"),
+            map(bool, flags[:num_effectors])
+        ))
+        _consume(map(
+            _setattr,
+            self.connections,
+            itertools.repeat("num_energized"),
+            checkpoint.counts
+        ))
+        for rail, energized in zip(self.rails, flags[num_effectors:]):
+            rail.energized = not not energized
+
+        # not seen by the write log
+        self._rescan = True
+
+    def fork(self) -> CircuitFork:
+        """Fork the live state (or the state of the active fork).
+
+        The first fork turns the live state into a root fork, which is
+        what the circuit returns to when no other fork is active.
+
+        """
+
+        if self._active is None:
+            self._track()
+            self._active = CircuitFork(self, self.capture(), {}, {})
+        else:
+            self._sync()
+
+        parent = self._active
+        return self._new_fork(
+            parent.base, dict(parent._flags), dict(parent._counts)
+        )
+
+    def _new_fork(
+        self, base: Checkpoint, flags: dict[int, int], counts: dict[int, int]
+    ) -> CircuitFork:
+        fork = CircuitFork(self, base, flags, counts)
+        self._forks += 1
+        weakref.finalize(fork, self._release)
+        return fork
+
+    def _release(self) -> None:
+        # once no fork is left (so none is active either), the live state
+        # is the root fork's and nothing needs to be logged any more
+        self._forks -= 1
+        if not self._forks and self._active is not None:
+            self._untrack()
+
+    def _set_flag(self, index: int, value: int) -> None:
+        if index < len(self.effectors):
+            _setattr(self.effectors[index], "energized", not not value)
+        else:
+            self.rails[index - len(self.effectors)].energized = not not value
+
+    def _track(self) -> None:
+        # log the vias of this circuit written from now on, so that
+        # syncing the active fork only visits the entries its
+        # propagation touched
+        vias = self.reachable.vias
+        if any(v.log is not None for v in vias):
+            raise ValueError("Circuit is already forked through another index")
+
+        self._positions = {id(e): i for i, e in enumerate(self.effectors)}
+        self._connection_positions = {
+            id(c): i for i, c in enumerate(self.connections)
+        }
+        self._touched = touched = set()
+        for v in vias:
+            v.log = touched
+
+    def _untrack(self) -> None:
+        touched = self._touched
+        for v in self.reachable.vias:
+            if v.log is touched:
+                v.log = None
+        self._touched = None
+        self._rescan = False
+        self._active = None
+
+    def _sync(self) -> None:
+        # fold the writes made to the live state since the last sync
+        # into the active fork's delta against its base
+        fork = self._active
+        base = fork.base
+        touched = self._touched
+
+        if self._rescan:
+            self._rescan = False
+            touched.clear()
+            self._scan()
+            return
+
+        flags = fork._flags
+        counts = fork._counts
+        positions = self._positions
+        connection_positions = self._connection_positions
+
+        for via in touched:
+            for e in via.effectors.values():
+                i = positions.get(id(e))
+                if i is None:
+                    # registered after the index was built
+                    continue
+                _record(flags, i, e.energized, base.flags[i])
+
+                owner = getattr(e.callback, "__self__", None)
+                i = connection_positions.get(id(owner))
+                if i is not None:
+                    _record(counts, i, owner.num_energized, base.counts[i])
+        touched.clear()
+
+        for i, rail in enumerate(self.rails, len(self.effectors)):
+            _record(flags, i, rail.energized, base.flags[i])
+
+    def _scan(self) -> None:
+        # diff the whole live state against the active fork's base
+        fork = self._active
+        base = fork.base
+        live = self.capture()
+        flags: dict[int, int] = dict()
+
+        old, new = memoryview(base.flags), memoryview(live.flags)
+        for start in range(0, len(new), _DIFF_BLOCK):
+            stop = start + _DIFF_BLOCK
+            if old[start:stop] == new[start:stop]:
+                continue
+            for i in range(start, min(stop, len(new))):
+                if old[i] != new[i]:
+                    flags[i] = new[i]
+
+        fork._flags = flags
+        fork._counts = {
+            i: b for i, (a, b) in enumerate(zip(base.counts, live.counts))
+            if a != b
+        }
+
+    def _activate(self, fork: CircuitFork) -> None:
+        active = self._active
+        if active is fork:
+            return
+
+        self._sync()
+
+        if active.base is fork.base:
+            # only entries either fork has written can differ
+            base = fork.base
+            for i in active._flags.keys() | fork._flags.keys():
+                self._set_flag(i, fork._flags.get(i, base.flags[i]))
+            for i in active._counts.keys() | fork._counts.keys():
+                _setattr(
+                    self.connections[i],
+                    "num_energized",
+                    fork._counts.get(i, base.counts[i])
+                )
+        else:
+            self.restore(fork.base)
+            for i, value in fork._flags.items():
+                self._set_flag(i, value)
+            for i, value in fork._counts.items():
+                _setattr(self.connections[i], "num_energized", value)
+
+        # the live state is exactly the fork's
+        self._rescan = False
+        self._active = fork
+
+
+class CircuitFork:
+    """A copy-on-write fork of the state of an energized circuit.
+
+    Forks share the circuit's structure: only one fork is live in the
+    circuit at a time, and it is driven through the circuit's own vias
+    (and any existing :class:`~circuits.core.SignalInterface`). Each fork
+    stores a base checkpoint shared with the fork it came from plus a
+    sparse delta of the entries its propagation has written, so
+    switching between forks only copies the entries that differ.
+
+    The first fork of a circuit captures a full checkpoint; after that,
+    the writes to the circuit's vias are logged (until none of its forks
+    is left), and switching, forking and :meth:`num_changes` only visit
+    those. :meth:`CircuitState.restore` makes the next of them
+    diff the whole state again.
+
+    Use a fork as a context manager to make it live; the previously live
+    fork is restored on exit::
+
+        base = ksa.fork()
+        with base.fork():
+            i0_int.set_signal(...)
+
+    """
+
+    __slots__ = ("state", "base", "_flags", "_counts", "__weakref__")
+
+    def __init__(
+        self,
+        state: CircuitState,
+        base: Checkpoint,
+        flags: dict[int, int],
+        counts: dict[int, int],
+    ) -> None:
+        self.state = state
+        self.base = base
+        self._flags = flags
+        self._counts = counts
+
+    def __enter__(self) -> CircuitFork:
+        state = self.state
+        state._stack.append(state._active)
+        state._activate(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        state = self.state
+        state._activate(state._stack.pop())
+
+    @property
+    def active(self) -> bool:
+        return self.state._active is self
+
+    def fork(self) -> CircuitFork:
+        """Fork this fork's current state."""
+        if self.active:
+            return self.state.fork()
+
+        return self.state._new_fork(
+            self.base, dict(self._flags), dict(self._counts)
+        )
+
+    def checkpoint(self) -> Checkpoint:
+        """Materialize this fork's state as a full checkpoint."""
+        if self.active:
+            return self.state.capture()
+
+        flags = bytearray(self.base.flags)
+        for i, value in self._flags.items():
+            flags[i] = value
+        counts = array.array("L", self.base.counts)
+        for i, value in self._counts.items():
+            counts[i] = value
+        return Checkpoint(state=self.state, flags=bytes(flags), counts=counts)
+
+    def num_changes(self) -> int:
+        """The number of entries that differ from the shared base."""
+        if self.active:
+            self.state._sync()
+        return len(self._flags) + len(self._counts)
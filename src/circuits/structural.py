@@ -0,0 +1,662 @@
+from __future__ import annotations
+import dataclasses
+import os
+import pathlib
+import re
+from typing import Mapping, Optional, Sequence, Union
+
+from .core import (
+    Cap,
+    Cell,
+    FinFET,
+    Via,
+    VDD,
+    Binding,
+    Interconnect,
+    TempComponents,
+)
+from .netlist import Netlist
+from .standard_cells import NOT, NOR2, OR2, OR3, NAND2, AND2, XOR2, XNOR2
+
+
+__all__ = (
+    "Gate",
+    "Circuit",
+    "StructuralCell",
+    "parse_bench",
+    "parse_blif",
+    "read_circuit",
+    "benchmark",
+    "array_multiplier",
+)
+
+
+PathLike = Union[str, os.PathLike]
+
+BENCHMARKS = pathlib.Path(__file__).parent / "benchmarks"
+
+# gate kinds and their number of inputs (None for any positive number)
+GATE_KINDS: dict[str, Optional[int]] = {
+    "AND": None,
+    "NAND": None,
+    "OR": None,
+    "NOR": None,
+    "XOR": None,
+    "XNOR": None,
+    "NOT": 1,
+    "BUF": 1,
+    "ONE": 0,
+    "ZERO": 0,
+}
+
+# standard cells exported as gates
+_CELL_KINDS: dict[type[Cell], str] = {
+    NOT: "NOT",
+    NOR2: "NOR",
+    OR2: "OR",
+    OR3: "OR",
+    NAND2: "NAND",
+    AND2: "AND",
+    XOR2: "XOR",
+    XNOR2: "XNOR",
+}
+
+_BENCH_LINE = re.compile(r"^(\S+)\s*=\s*(\w+)\s*\(([^)]*)\)$")
+_BENCH_PORT = re.compile(r"^(INPUT|OUTPUT)\s*\(\s*(\S+)\s*\)$", re.IGNORECASE)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Gate:
+    kind: str
+    """One of ``AND``, ``NAND``, ``OR``, ``NOR``, ``XOR``, ``XNOR``,
+    ``NOT``, ``BUF``, ``ONE`` and ``ZERO`` (constants)"""
+
+    output: str
+    inputs: tuple[str, ...] = ()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Circuit:
+    """A combinational gate-level netlist of named nets, as read from or
+    written to BLIF and ISCAS ``.bench`` files.
+
+    """
+
+    name: str
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+    gates: tuple[Gate, ...]
+
+    def __post_init__(self) -> None:
+        drivers = set(self.inputs)
+        if len(drivers) != len(self.inputs):
+            raise ValueError("Duplicate input")
+        if len(set(self.outputs)) != len(self.outputs):
+            raise ValueError("Duplicate output")
+
+        for g in self.gates:
+            arity = GATE_KINDS.get(g.kind, -1)
+            if arity == -1:
+                raise ValueError(f"Unknown gate kind {g.kind!r}")
+            if arity is None and not g.inputs or (
+                arity is not None and len(g.inputs) != arity
+            ):
+                raise ValueError(
+                    f"Wrong number of inputs for {g.kind} gate {g.output!r}"
+                )
+            if g.output in drivers:
+                raise ValueError(f"Net {g.output!r} has more than one driver")
+            drivers.add(g.output)
+
+        for n in (*self.outputs, *(i for g in self.gates for i in g.inputs)):
+            if n not in drivers:
+                raise ValueError(f"Net {n!r} is not driven")
+
+    @classmethod
+    def from_cell(
+        cls,
+        cell: Cell,
+        inputs: Mapping[str, Union[Via, Sequence[Via]]],
+        outputs: Mapping[str, Union[Via, Sequence[Via]]],
+        name: Optional[str] = None,
+    ) -> Circuit:
+        """Export a cell built from the gate standard cells (``NOT``,
+        ``NAND2``, ``NOR2``, ``AND2``, ``OR2``, ``OR3``, ``XOR2``,
+        ``XNOR2``, and buffers, which only join nets).
+
+        :param cell: The cell.
+        :type cell: Cell
+        :param inputs: The input ports, by name. Groups of vias (LSB
+            first) are named ``name[0]``, ``name[1]``, ...
+        :param outputs: The output ports, by name.
+        :param name: The circuit name (the cell's type name by default).
+
+        :raises ValueError: If the cell contains FinFETs outside of gate
+            cells, or a net driven by several gates.
+
+        """
+
+        netlist = Netlist(cell)
+        names: dict[int, str] = dict()
+        gates: list[Gate] = list()
+
+        def ports(
+            groups: Mapping[str, Union[Via, Sequence[Via]]]
+        ) -> list[tuple[str, int]]:
+            result = list()
+            for port, vias in groups.items():
+                if isinstance(vias, Via):
+                    result.append((port, netlist.net(vias)))
+                else:
+                    result.extend(
+                        (f"{port}[{i}]", n)
+                        for i, n in enumerate(netlist.nets(vias))
+                    )
+            return result
+
+        input_ports = ports(inputs)
+        for port, n in input_ports:
+            if n in names:
+                raise ValueError(f"Input {port!r} is joined with an input")
+            names[n] = port
+
+        # outputs joined with an input or another output get a buffer
+        output_ports = ports(outputs)
+        buffers: list[tuple[str, int]] = list()
+        for port, n in output_ports:
+            if n in names:
+                buffers.append((port, n))
+            else:
+                names[n] = port
+
+        # the gate cells, outermost first
+        found: list[Cell] = list()
+        stack = [cell]
+        while stack:
+            c = stack.pop()
+            if type(c) in _CELL_KINDS:
+                found.append(c)
+            elif isinstance(c, FinFET):
+                raise ValueError(
+                    f"{type(cell).__name__} has FinFETs outside of gate cells"
+                )
+            else:
+                stack.extend(reversed(c.components.cells))
+
+        def net_name(n: int) -> str:
+            return names.setdefault(n, f"n{n}")
+
+        driven: set[int] = {n for _, n in input_ports}
+        for c in found:
+            vias = c.i if isinstance(c.i, tuple) else (c.i,)
+            out = netlist.net(c.o)
+            if out in driven:
+                raise ValueError(
+                    f"Net {net_name(out)!r} has more than one driver"
+                )
+            driven.add(out)
+            gates.append(Gate(
+                _CELL_KINDS[type(c)],
+                net_name(out),
+                tuple(net_name(n) for n in netlist.nets(vias)),
+            ))
+
+        # constants (powered nets and nets nothing drives)
+        used = {i for g in gates for i in g.inputs} | {
+            names[n] for _, n in output_ports
+        }
+        for n, name_ in list(names.items()):
+            if n not in driven and name_ in used:
+                kind = "ONE" if n in netlist.powered else "ZERO"
+                gates.append(Gate(kind, name_))
+
+        gates.extend(Gate("BUF", port, (names[n],)) for port, n in buffers)
+
+        # order gates like the netlist (drivers first)
+        position = {n: i for i, n in enumerate(netlist.order)}
+        rank = {name_: position[n] for n, name_ in names.items()}
+        gates.sort(key=lambda g: rank.get(g.output, len(position)))
+
+        return cls(
+            name=type(cell).__name__ if name is None else name,
+            inputs=tuple(port for port, _ in input_ports),
+            outputs=tuple(port for port, _ in output_ports),
+            gates=tuple(gates),
+        )
+
+    def to_bench(self) -> str:
+        """Format as an ISCAS ``.bench`` netlist.
+
+        :raises ValueError: If the circuit has constant nets, which the
+            format cannot express.
+
+        """
+
+        lines = [f"# {self.name}"]
+        lines.extend(f"INPUT({n})" for n in self.inputs)
+        lines.extend(f"OUTPUT({n})" for n in self.outputs)
+        for g in self.gates:
+            if not g.inputs:
+                raise ValueError(f"Constant net {g.output!r} in .bench output")
+            kind = "BUFF" if g.kind == "BUF" else g.kind
+            lines.append(f"{g.output} = {kind}({', '.join(g.inputs)})")
+        return "\n".join(lines) + "\n"
+
+    def to_blif(self) -> str:
+        """Format as a BLIF model with one ``.names`` cover per gate."""
+        lines = [
+            f".model {self.name}",
+            ".inputs " + " ".join(self.inputs),
+            ".outputs " + " ".join(self.outputs),
+        ]
+        for g in self.gates:
+            lines.append(" ".join((".names", *g.inputs, g.output)))
+            lines.extend(_cover(g.kind, len(g.inputs)))
+        lines.append(".end")
+        return "\n".join(lines) + "\n"
+
+
+def _cover(kind: str, n: int) -> list[str]:
+    # the single-output cover rows of a gate
+    if kind == "ONE":
+        return ["1"]
+    if kind == "ZERO":
+        return []
+    if kind in ("AND", "BUF"):
+        return ["1" * n + " 1"]
+    if kind == "NAND":
+        return ["1" * n + " 0"]
+    if kind in ("NOR", "NOT"):
+        return ["0" * n + " 1"]
+    if kind == "OR":
+        return ["-" * i + "1" + "-" * (n - i - 1) + " 1" for i in range(n)]
+
+    rows = list()
+    for k in range(1 << n):
+        bits = format(k, f"0{n}b")
+        if bits.count("1") % 2 == (kind == "XOR"):
+            rows.append(bits + " 1")
+    return rows
+
+
+def parse_bench(text: str, name: str = "circuit") -> Circuit:
+    """Parse an ISCAS ``.bench`` netlist (``INPUT(a)``, ``OUTPUT(b)`` and
+    ``b = NAND(a, c)`` lines, ``#`` comments). ``BUFF`` is read as
+    ``BUF``.
+
+    :raises ValueError: On syntax errors, flip-flops and unknown gates.
+
+    """
+
+    inputs: list[str] = list()
+    outputs: list[str] = list()
+    gates: list[Gate] = list()
+    for k, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+
+        m = _BENCH_PORT.match(line)
+        if m is not None:
+            (inputs if m[1].upper() == "INPUT" else outputs).append(m[2])
+            continue
+
+        m = _BENCH_LINE.match(line)
+        if m is None:
+            raise ValueError(f"Line {k}: cannot parse {line!r}")
+        kind = m[2].upper()
+        kind = "BUF" if kind == "BUFF" else kind
+        if kind not in GATE_KINDS:
+            raise ValueError(f"Line {k}: unsupported gate {m[2]!r}")
+        gates.append(Gate(
+            kind, m[1], tuple(i.strip() for i in m[3].split(",") if i.strip())
+        ))
+
+    return Circuit(name, tuple(inputs), tuple(outputs), tuple(gates))
+
+
+def _cover_gates(
+    inputs: Sequence[str], output: str, rows: Sequence[tuple[str, str]]
+) -> list[Gate]:
+    # map a single-output cover onto gates, recognizing the common gates
+    # and falling back to a sum of products
+    n = len(inputs)
+    if not rows:
+        return [Gate("ZERO", output)]
+
+    values = {v for _, v in rows}
+    if len(values) != 1:
+        raise ValueError(f"Cover of {output!r} mixes on-set and off-set rows")
+    on = values.pop() == "1"
+    cubes = sorted(c for c, _ in rows)
+
+    if not n:
+        return [Gate("ONE" if on else "ZERO", output)]
+    if n == 1 and len(cubes) == 1 and cubes[0] != "-":
+        buffer = (cubes[0] == "1") == on
+        return [Gate("BUF" if buffer else "NOT", output, tuple(inputs))]
+    if len(cubes) == 1 and cubes[0] == "1" * n:
+        return [Gate("AND" if on else "NAND", output, tuple(inputs))]
+    if len(cubes) == 1 and cubes[0] == "0" * n:
+        return [Gate("NOR" if on else "OR", output, tuple(inputs))]
+    if n > 1 and cubes == sorted(
+        "-" * i + "1" + "-" * (n - i - 1) for i in range(n)
+    ):
+        return [Gate("OR" if on else "NOR", output, tuple(inputs))]
+    if n == 2 and cubes in (["01", "10"], ["00", "11"]):
+        xor = (cubes == ["01", "10"]) == on
+        return [Gate("XOR" if xor else "XNOR", output, tuple(inputs))]
+
+    gates: list[Gate] = list()
+    inverted: dict[str, str] = dict()
+    products: list[str] = list()
+    for k, cube in enumerate(cubes):
+        literals = list()
+        for i, c in zip(inputs, cube):
+            if c == "1":
+                literals.append(i)
+            elif c == "0":
+                if i not in inverted:
+                    inverted[i] = f"{output}.n{len(inverted)}"
+                    gates.append(Gate("NOT", inverted[i], (i,)))
+                literals.append(inverted[i])
+        if not literals:
+            # a tautology
+            return [Gate("ONE" if on else "ZERO", output)]
+        if len(literals) == 1:
+            products.append(literals[0])
+        else:
+            products.append(f"{output}.p{k}")
+            gates.append(Gate("AND", products[-1], tuple(literals)))
+
+    gates.append(Gate("OR" if on else "NOR", output, tuple(products)))
+    return gates
+
+
+def parse_blif(text: str) -> Circuit:
+    """Parse a combinational BLIF model (``.model``, ``.inputs``,
+    ``.outputs``, ``.names`` covers and ``.end``).
+
+    :raises ValueError: On syntax errors, latches, subcircuits and
+        library gates.
+
+    """
+
+    name = "circuit"
+    inputs: list[str] = list()
+    outputs: list[str] = list()
+    gates: list[Gate] = list()
+    cover: Optional[tuple[list[str], list[tuple[str, str]]]] = None
+
+    def flush() -> None:
+        if cover is not None:
+            nets, rows = cover
+            gates.extend(_cover_gates(nets[:-1], nets[-1], rows))
+
+    lines = text.replace("\\\n", " ").splitlines()
+    for k, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+
+        words = line.split()
+        if not words[0].startswith("."):
+            if cover is None:
+                raise ValueError(f"Line {k}: cover row outside of .names")
+            if len(cover[0]) == 1:
+                row = ("", words[0]) if len(words) == 1 else None
+            else:
+                row = (words[0], words[1]) if len(words) == 2 else None
+            if row is None or len(row[0]) != len(cover[0]) - 1 or (
+                row[1] not in "01" or set(row[0]) - set("01-")
+            ):
+                raise ValueError(f"Line {k}: invalid cover row {line!r}")
+            cover[1].append(row)
+            continue
+
+        flush()
+        cover = None
+        keyword = words[0]
+        if keyword == ".model":
+            name = words[1] if len(words) > 1 else name
+        elif keyword == ".inputs":
+            inputs.extend(words[1:])
+        elif keyword == ".outputs":
+            outputs.extend(words[1:])
+        elif keyword == ".names":
+            if len(words) < 2:
+                raise ValueError(f"Line {k}: .names without an output")
+            cover = (words[1:], list())
+        elif keyword == ".end":
+            break
+        else:
+            raise ValueError(f"Line {k}: unsupported construct {keyword!r}")
+    flush()
+
+    return Circuit(name, tuple(inputs), tuple(outputs), tuple(gates))
+
+
+def read_circuit(path: PathLike) -> Circuit:
+    """Read a ``.bench`` or ``.blif`` file (by suffix)."""
+    path = pathlib.Path(path)
+    text = path.read_text()
+    if path.suffix == ".bench":
+        return parse_bench(text, path.stem)
+    if path.suffix == ".blif":
+        return parse_blif(text)
+    raise ValueError(f"Unknown netlist format {path.suffix!r}")
+
+
+def benchmark(name: str) -> Circuit:
+    """Read a benchmark circuit bundled in the ``benchmarks`` directory
+    (e.g. ``"c17"``).
+
+    """
+
+    for suffix in (".bench", ".blif"):
+        path = BENCHMARKS / f"{name}{suffix}"
+        if path.exists():
+            return read_circuit(path)
+    raise FileNotFoundError(f"No benchmark named {name!r} in {BENCHMARKS}")
+
+
+def array_multiplier(width: int) -> Circuit:
+    """A ``width`` x ``width`` array multiplier (like the 16x16 ISCAS-85
+    c6288) with inputs ``a0..`` and ``b0..`` and outputs ``p0..``, bit 0
+    first. Each row of partial products is added to the running sum with
+    a ripple-carry adder, so it has about ``5.6 * width ** 2`` gates.
+
+    The bundled ``mult16`` benchmark is ``array_multiplier(16)``.
+
+    """
+
+    if width < 2:
+        raise ValueError("Width must be at least 2")
+
+    gates: list[Gate] = list()
+
+    def gate(output: str, kind: str, *inputs: str) -> str:
+        gates.append(Gate(kind, output, inputs))
+        return output
+
+    total = [gate(f"pp0_{i}", "AND", f"a{i}", "b0") for i in range(width)]
+    gate("p0", "BUF", total[0])
+    for j in range(1, width):
+        row = list()
+        carry = None
+        for i in range(width):
+            # the top bit of the sum is the previous row's carry
+            x = total[i + 1] if i + 1 < len(total) else carry
+            y = gate(f"pp{j}_{i}", "AND", f"a{i}", f"b{j}")
+            c = carry if i + 1 < len(total) else None
+            if c is None:
+                row.append(gate(f"s{j}_{i}", "XOR", x, y))
+                carry = gate(f"c{j}_{i}", "AND", x, y)
+                continue
+            h = gate(f"h{j}_{i}", "XOR", x, y)
+            row.append(gate(f"s{j}_{i}", "XOR", h, c))
+            carry = gate(
+                f"c{j}_{i}", "NAND",
+                gate(f"g{j}_{i}", "NAND", x, y),
+                gate(f"t{j}_{i}", "NAND", h, c),
+            )
+        total = [*row, carry]
+        gate(f"p{j}", "BUF", total[0])
+    for i, n in enumerate(total[1:], width):
+        gate(f"p{i}", "BUF", n)
+
+    return Circuit(
+        f"mult{width}",
+        (*(f"a{i}" for i in range(width)), *(f"b{i}" for i in range(width))),
+        tuple(f"p{i}" for i in range(2 * width)),
+        tuple(gates),
+    )
+
+
+class StructuralCell(Cell):
+    """A cell built from a :class:`Circuit`, with its gates mapped onto
+    the gate standard cells (wider gates become trees of two-input
+    cells, buffers join nets).
+
+    """
+
+    __slots__ = ("circuit", "inputs", "outputs")
+
+    circuit: Circuit
+    inputs: dict[str, Via]
+    """The input ports, by net name"""
+
+    outputs: dict[str, Via]
+    """The output ports, by net name"""
+
+    def __init__(self, vdd: VDD, circuit: Circuit) -> None:
+        """
+        :param vdd: The power rail.
+        :type vdd: VDD
+        :param circuit: The circuit.
+        :type circuit: Circuit
+
+        """
+
+        self.circuit = circuit
+        super().__init__(vdd)
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+        circuit = self.circuit
+
+        # buffers join their input and output net
+        alias: dict[str, str] = dict()
+
+        def find(n: str) -> str:
+            while n in alias:
+                n = alias[n]
+            return n
+
+        for g in circuit.gates:
+            if g.kind == "BUF" or (
+                len(g.inputs) == 1 and g.kind in ("AND", "OR", "XOR")
+            ):
+                alias[g.output] = g.inputs[0]
+
+        drivers: dict[str, Via] = dict()
+        constants: dict[str, Via] = dict()
+        sinks: dict[str, list[Via]] = dict()
+
+        def connect(source: Union[str, Via], via: Via) -> None:
+            if isinstance(source, Via):
+                cmp.add(Binding(source, via))
+            else:
+                sinks.setdefault(find(source), list()).append(via)
+
+        def cell(
+            cls: type[Cell], sources: Sequence[Union[str, Via]]
+        ) -> Via:
+            c = cls(vdd)
+            cmp.add(c)
+            vias = c.i if isinstance(c.i, tuple) else (c.i,)
+            for source, via in zip(sources, vias):
+                connect(source, via)
+            return c.o
+
+        def tree(
+            cls: type[Cell], sources: Sequence[Union[str, Via]]
+        ) -> Union[str, Via]:
+            sources = list(sources)
+            while len(sources) > 1:
+                if cls is OR2 and len(sources) == 3:
+                    return cell(OR3, sources)
+                merged = [
+                    cell(cls, sources[k:k + 2])
+                    for k in range(0, len(sources) - 1, 2)
+                ]
+                if len(sources) % 2:
+                    merged.append(sources[-1])
+                sources = merged
+            return sources[0]
+
+        inverted = {"NAND": (AND2, NAND2), "NOR": (OR2, NOR2), "XNOR": (
+            XOR2, XNOR2
+        )}
+        plain = {"AND": AND2, "OR": OR2, "XOR": XOR2}
+        for g in circuit.gates:
+            if g.output in alias:
+                continue
+
+            if g.kind in ("ONE", "ZERO"):
+                o = constants[g.output] = Via()
+                cmp.add(o)
+                if g.kind == "ONE":
+                    vdd.register(o)
+                else:
+                    o.register(Cap(self))
+            elif g.kind == "NOT" or len(g.inputs) == 1:
+                o = cell(NOT, g.inputs)
+            elif g.kind in plain:
+                o = tree(plain[g.kind], g.inputs)
+            else:
+                cls, last = inverted[g.kind]
+                half = len(g.inputs) // 2
+                o = cell(last, (
+                    tree(cls, g.inputs[:half]), tree(cls, g.inputs[half:])
+                ))
+            drivers[g.output] = o
+
+        outputs: dict[str, Via] = dict()
+        port_sinks: dict[str, list[str]] = dict()
+        for n in circuit.outputs:
+            port_sinks.setdefault(find(n), list()).append(n)
+
+        # join every net's driver with its sinks and output ports
+        inputs: dict[str, Via] = dict()
+        for n in (*circuit.inputs, *drivers):
+            vias = sinks.get(n, list())
+            names = port_sinks.get(n, list())
+            if n in drivers:
+                driver = drivers[n]
+                if not vias and len(names) == 1:
+                    outputs[names[0]] = driver
+                    continue
+                if not vias and not names:
+                    if driver is not constants.get(n):
+                        driver.register(Cap(self))
+                    continue
+            else:
+                if len(vias) == 1 and not names:
+                    inputs[n] = vias[0]
+                    continue
+                driver = inputs[n] = Via()
+                cmp.add(driver)
+                if not vias and not names:
+                    continue
+
+            for port in names:
+                outputs[port] = Via()
+                cmp.add(outputs[port])
+            vias = (driver, *vias, *(outputs[port] for port in names))
+            cmp.add(Binding(*vias) if len(vias) == 2 else Interconnect(*vias))
+
+        # expose vias
+        self.inputs = inputs
+        self.outputs = {n: outputs[n] for n in circuit.outputs}
+        self.components = cmp.to_components()
@@ -0,0 +1,276 @@
+from __future__ import annotations
+import dataclasses
+from typing import Any, Mapping, Optional
+
+from .netlist import Netlist
+
+
+__all__ = (
+    "BDD",
+    "EquivalenceResult",
+    "symbolic_evaluate",
+    "check_adder",
+)
+
+
+_AND = 0
+_OR = 1
+_XOR = 2
+
+
+class BDD:
+    """A minimal reduced ordered binary decision diagram manager.
+
+    Nodes are integers: ``BDD.FALSE`` (0) and ``BDD.TRUE`` (1) are the
+    terminals, and every other node is hash-consed, so two functions are
+    equivalent exactly when their nodes are equal. Variables are ordered
+    by their index.
+
+    """
+
+    __slots__ = ("_nodes", "_unique", "_cache", "_not_cache")
+
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self) -> None:
+        # (variable, low, high); terminals sort after every variable
+        self._nodes: list[tuple[float, int, int]] = [
+            (float("inf"), 0, 0), (float("inf"), 1, 1)
+        ]
+        self._unique: dict[tuple[int, int, int], int] = dict()
+        self._cache: dict[tuple[int, int, int], int] = dict()
+        self._not_cache: dict[int, int] = dict()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _mk(self, var: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+
+        key = (var, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = self._unique[key] = len(self._nodes)
+            self._nodes.append(key)
+        return node
+
+    def var(self, index: int) -> int:
+        return self._mk(index, self.FALSE, self.TRUE)
+
+    def not_(self, u: int) -> int:
+        if u < 2:
+            return 1 - u
+
+        result = self._not_cache.get(u)
+        if result is None:
+            var, low, high = self._nodes[u]
+            result = self._mk(var, self.not_(low), self.not_(high))
+            self._not_cache[u] = result
+        return result
+
+    def and_(self, u: int, v: int) -> int:
+        return self._apply(_AND, u, v)
+
+    def or_(self, u: int, v: int) -> int:
+        return self._apply(_OR, u, v)
+
+    def xor(self, u: int, v: int) -> int:
+        return self._apply(_XOR, u, v)
+
+    def _apply(self, op: int, u: int, v: int) -> int:
+        # terminal cases
+        if op == _AND:
+            if u == 0 or v == 0:
+                return 0
+            if u == 1 or u == v:
+                return v
+            if v == 1:
+                return u
+        elif op == _OR:
+            if u == 1 or v == 1:
+                return 1
+            if u == 0 or u == v:
+                return v
+            if v == 0:
+                return u
+        else:
+            if u == v:
+                return 0
+            if u == 0:
+                return v
+            if v == 0:
+                return u
+            if u == 1:
+                return self.not_(v)
+            if v == 1:
+                return self.not_(u)
+
+        # all operations are commutative
+        if u > v:
+            u, v = v, u
+
+        key = (op, u, v)
+        result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        uvar, ulow, uhigh = self._nodes[u]
+        vvar, vlow, vhigh = self._nodes[v]
+        var = min(uvar, vvar)
+        if uvar != var:
+            ulow = uhigh = u
+        if vvar != var:
+            vlow = vhigh = v
+
+        result = self._mk(
+            var,
+            self._apply(op, ulow, vlow),
+            self._apply(op, uhigh, vhigh),
+        )
+        self._cache[key] = result
+        return result
+
+    def satisfy(self, u: int) -> Optional[dict[int, bool]]:
+        """Return a variable assignment for which ``u`` is true (variables
+        not in the assignment may take any value), or ``None`` if ``u``
+        is unsatisfiable.
+
+        """
+
+        if u == self.FALSE:
+            return None
+
+        assignment = dict()
+        while u != self.TRUE:
+            var, low, high = self._nodes[u]
+            # every non-false node has a path to true
+            if high != self.FALSE:
+                assignment[var] = True
+                u = high
+            else:
+                assignment[var] = False
+                u = low
+        return assignment
+
+
+def symbolic_evaluate(
+    netlist: Netlist,
+    bdd: BDD,
+    inputs: Mapping[int, int],
+    overrides: Optional[Mapping[int, int]] = None,
+) -> list[int]:
+    """Evaluate every net of ``netlist`` as a BDD node.
+
+    :param inputs: The BDD node of each input net (unassigned, undriven
+        nets are false).
+    :param overrides: Nodes to force onto nets in place of their driven
+        function (e.g. ``BDD.FALSE`` to model a stuck-at-0 net).
+    :return: The node of every net, indexed by net.
+
+    """
+
+    overrides = dict() if overrides is None else overrides
+    values = [bdd.FALSE] * netlist.num_nets
+    transistors = netlist.transistors
+    powered = netlist.powered
+
+    for n in netlist.order:
+        if n in overrides:
+            values[n] = overrides[n]
+            continue
+
+        if n in powered:
+            values[n] = bdd.TRUE
+            continue
+
+        v = inputs.get(n, bdd.FALSE)
+        for t in netlist.drivers[n]:
+            gate, source, _, p_type = transistors[t]
+            g = values[gate]
+            v = bdd.or_(
+                v, bdd.and_(values[source], bdd.not_(g) if p_type else g)
+            )
+        values[n] = v
+
+    return values
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class EquivalenceResult:
+    equivalent: bool
+    counterexample: Optional[tuple[int, int, int]]
+    """An ``(i0, i1, cin)`` input for which the adder is wrong"""
+
+    output: Optional[str]
+    """The first mismatching output (e.g. ``"o[3]"`` or ``"cout"``)"""
+
+    num_nodes: int
+
+    def __bool__(self) -> bool:
+        return self.equivalent
+
+
+def check_adder(
+    cell: Any,
+    netlist: Optional[Netlist] = None,
+    overrides: Optional[Mapping[int, int]] = None,
+) -> EquivalenceResult:
+    """Prove ``o + (cout << n) == i0 + i1 + cin`` for every input of an
+    adder with the ``i0``, ``i1``, ``cin``, ``o`` and ``cout`` port
+    layout, by comparing its symbolic outputs with a ripple-carry
+    reference.
+
+    :param netlist: A precompiled netlist of ``cell``.
+    :param overrides: Nodes to force onto nets (see
+        :func:`symbolic_evaluate`); mainly useful for testing.
+
+    """
+
+    netlist = Netlist(cell) if netlist is None else netlist
+    width = len(cell.o)
+    bdd = BDD()
+
+    # interleaved order (cin, a0, b0, a1, b1, ...) keeps every carry
+    # function linear in size
+    cin = bdd.var(0)
+    a = tuple(bdd.var(1 + 2 * i) for i in range(width))
+    b = tuple(bdd.var(2 + 2 * i) for i in range(width))
+
+    inputs = {netlist.net(cell.cin): cin}
+    inputs.update(zip(netlist.nets(cell.i0), a))
+    inputs.update(zip(netlist.nets(cell.i1), b))
+    values = symbolic_evaluate(netlist, bdd, inputs, overrides)
+
+    # ripple-carry reference
+    carry = cin
+    expected = list()
+    for ai, bi in zip(a, b):
+        p = bdd.xor(ai, bi)
+        expected.append(bdd.xor(p, carry))
+        carry = bdd.or_(bdd.and_(ai, bi), bdd.and_(p, carry))
+
+    outputs = [
+        (f"o[{i}]", values[n], e)
+        for i, (n, e) in enumerate(zip(netlist.nets(cell.o), expected))
+    ]
+    outputs.append(("cout", values[netlist.net(cell.cout)], carry))
+
+    for name, actual, reference in outputs:
+        if actual == reference:
+            continue
+
+        assignment = bdd.satisfy(bdd.xor(actual, reference))
+        i0 = sum(assignment.get(1 + 2 * i, False) << i for i in range(width))
+        i1 = sum(assignment.get(2 + 2 * i, False) << i for i in range(width))
+        return EquivalenceResult(
+            equivalent=False,
+            counterexample=(i0, i1, int(assignment.get(0, False))),
+            output=name,
+            num_nodes=len(bdd),
+        )
+
+    return EquivalenceResult(
+        equivalent=True, counterexample=None, output=None, num_nodes=len(bdd)
+    )
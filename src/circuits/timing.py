@@ -0,0 +1,575 @@
+from __future__ import annotations
+from typing import Iterable, Mapping, Optional, Sequence
+
+from .core import Cell, FinFET
+from .netlist import Netlist, cell_paths
+
+
+__all__ = (
+    "TimedSimulator",
+    "StaticTiming",
+)
+
+
+def _delays(
+    netlist: Netlist,
+    delays: Optional[Sequence[int]],
+    finfet_delay: int,
+    interconnect_delay: int,
+) -> tuple[int, ...]:
+    if delays is None:
+        interconnected: set[int] = set()
+        if interconnect_delay:
+            interconnected.update(
+                netlist.net(i.vias[0])
+                for i in netlist.reachable.interconnects
+            )
+        delays = [
+            finfet_delay
+            + (interconnect_delay if drain in interconnected else 0)
+            for _, _, drain, _ in netlist.transistors
+        ]
+    delays = tuple(delays)
+    if len(delays) != len(netlist.transistors):
+        raise ValueError("Expected one delay per transistor")
+    if any(d < 1 for d in delays):
+        raise ValueError("Delays must be positive")
+    return delays
+
+
+class TimedSimulator:
+    """An event-driven simulator of a :class:`Netlist` with integer
+    propagation delays.
+
+    A transistor's conduction changes ``delays[t]`` time units after its
+    gate or source net does (transport delay), and a net is energized
+    when any of its driving transistors conducts (or it is powered or set
+    as an input). Events are kept on a timing wheel with one bucket per
+    time unit modulo a power of two larger than the longest delay, so
+    scheduling and advancing time are O(1) and events are plain integers
+    (encoding the transistor, its new conduction and the net that
+    triggered it) appended to reused lists.
+
+    With an ``inertial`` delay, a transistor ignores input pulses that
+    are narrower than it (and than its own delay): the pending event
+    that started the pulse is cancelled instead of spreading a glitch
+    to the fan-out. Every net change is counted in :attr:`transitions`,
+    and changes that are reversed before the net settles in
+    :attr:`glitches`.
+
+    """
+
+    def __init__(
+        self,
+        netlist: Netlist,
+        delays: Optional[Sequence[int]] = None,
+        *,
+        finfet_delay: int = 1,
+        interconnect_delay: int = 0,
+        inertial: int = 0,
+    ) -> None:
+        """
+        :param netlist: The netlist to simulate. Its ``reachable`` parts
+            are needed when ``interconnect_delay`` is not zero.
+        :type netlist: Netlist
+        :param delays: The delay of every transistor (overrides the
+            other delay parameters).
+        :param finfet_delay: The delay of every transistor.
+        :type finfet_delay: int
+        :param interconnect_delay: The extra delay of transistors whose
+            drain net is joined by an ``Interconnect``.
+        :type interconnect_delay: int
+        :param inertial: The narrowest input pulse a transistor passes on
+            (0 for transport delays, which pass on every pulse).
+        :type inertial: int
+
+        """
+
+        transistors = netlist.transistors
+        delays = _delays(netlist, delays, finfet_delay, interconnect_delay)
+        if inertial < 0:
+            raise ValueError("The inertial delay must not be negative")
+
+        self.netlist = netlist
+        self.delays = delays
+        self.inertial = inertial
+
+        fanout: list[list[int]] = [list() for _ in range(netlist.num_nets)]
+        for t, (gate, source, _, _) in enumerate(transistors):
+            fanout[gate].append(t)
+            if source != gate:
+                fanout[source].append(t)
+        self._fanout = tuple(tuple(f) for f in fanout)
+
+        size = 1
+        while size <= max(delays, default=0):
+            size *= 2
+        self._wheel: list[list[int]] = [list() for _ in range(size)]
+        self._mask = size - 1
+        self._pending = 0
+        # the time of each transistor's last pending event (-1 if none),
+        # and the cancelled events still on the wheel
+        self._due = [-1] * len(transistors)
+        self._cancelled: dict[int, int] = dict()
+
+        self.time = 0
+        self.num_events = 0
+        self.num_filtered = 0
+        """The number of events cancelled by the inertial delay"""
+
+        self.start = 0
+        """The time the last input change was applied at"""
+
+        self.values = [0] * netlist.num_nets
+        self.last_change = [0] * netlist.num_nets
+        """The time each net last changed at"""
+
+        # (time, transistor, triggering net) triples of every change of
+        # each net since the last input change (-1s for inputs)
+        self._history: list[list[int]] = [
+            list() for _ in range(netlist.num_nets)
+        ]
+        self._changed: list[int] = list()
+
+        self.transitions = [0] * netlist.num_nets
+        """The number of times each net changed since the last reset"""
+
+        self.glitches = [0] * netlist.num_nets
+        """The number of pulses on each net since the last reset (pairs
+        of changes that cancel out within one input change)"""
+
+        self._inputs = [0] * netlist.num_nets
+        self._conducting = [0] * len(transistors)
+        self._target = [0] * len(transistors)
+        self.reset()
+
+    def reset(self, inputs: Optional[Mapping[int, int]] = None) -> None:
+        """Settle the netlist instantly for ``inputs`` (all zero by
+        default) and clear all pending events.
+
+        """
+
+        inputs = dict() if inputs is None else inputs
+        values = self.netlist.evaluate(inputs)
+        self.values[:] = values
+        self._inputs = [0] * self.netlist.num_nets
+        for n, v in inputs.items():
+            self._inputs[n] = v & 1
+
+        for t, (gate, source, _, p_type) in enumerate(
+            self.netlist.transistors
+        ):
+            c = values[source] & (values[gate] ^ 1 if p_type else values[gate])
+            self._conducting[t] = self._target[t] = c
+
+        for bucket in self._wheel:
+            bucket.clear()
+        self._pending = 0
+        self._due = [-1] * len(self.netlist.transistors)
+        self._cancelled.clear()
+        self.start = self.time
+        self.last_change = [self.time] * self.netlist.num_nets
+        self.transitions = [0] * self.netlist.num_nets
+        self.glitches = [0] * self.netlist.num_nets
+        self._clear_history()
+
+    def _clear_history(self) -> None:
+        for n in self._changed:
+            self._history[n].clear()
+        self._changed.clear()
+
+    def _count_glitches(self) -> None:
+        # a net that changed k times since the last input change settled
+        # after k % 2 changes; the rest are k // 2 pulses
+        transitions = self.transitions
+        glitches = self.glitches
+        for n in self._changed:
+            k = len(self._history[n]) // 3
+            transitions[n] += k
+            glitches[n] += k // 2
+
+    def _update(self, n: int, cause: int = -1, trigger: int = -1) -> bool:
+        # re-evaluate net n and schedule the transistors it feeds
+        netlist = self.netlist
+        values = self.values
+        conducting = self._conducting
+
+        v = 1 if n in netlist.powered else self._inputs[n]
+        if not v:
+            for t in netlist.drivers[n]:
+                if conducting[t]:
+                    v = 1
+                    break
+        if v == values[n]:
+            return False
+
+        values[n] = v
+        self.last_change[n] = self.time
+        history = self._history[n]
+        if not history:
+            self._changed.append(n)
+        history += (self.time, cause, trigger)
+
+        transistors = netlist.transistors
+        num_transistors = len(transistors)
+        target = self._target
+        delays = self.delays
+        wheel = self._wheel
+        mask = self._mask
+        time = self.time
+        inertial = self.inertial
+        due = self._due
+
+        for t in self._fanout[n]:
+            gate, source, _, p_type = transistors[t]
+            c = values[source] & (values[gate] ^ 1 if p_type else values[gate])
+            if c != target[t]:
+                target[t] = c
+                at = time + delays[t]
+                if inertial:
+                    # the pending event this one reverses started a pulse
+                    # of `at - due[t]` at the transistor's inputs
+                    if due[t] > time and at - due[t] < inertial:
+                        key = due[t] * num_transistors + t
+                        self._cancelled[key] = self._cancelled.get(key, 0) + 1
+                        due[t] = -1
+                        continue
+                    due[t] = at
+
+                wheel[at & mask].append(((n * num_transistors + t) << 1) | c)
+                self._pending += 1
+
+        return True
+
+    def apply(self, inputs: Mapping[int, int]) -> int:
+        """Change input nets and run until no events are pending.
+
+        :return: The time it took for every net to settle.
+
+        """
+
+        self.start = self.time
+        self._clear_history()
+        for n, v in inputs.items():
+            if self._inputs[n] != (v & 1):
+                self._inputs[n] = v & 1
+                self._update(n)
+
+        drivers = self.netlist.transistors
+        num_transistors = len(drivers)
+        conducting = self._conducting
+        wheel = self._wheel
+        mask = self._mask
+        settled = self.time
+
+        while self._pending:
+            self.time += 1
+            bucket = wheel[self.time & mask]
+            if not bucket:
+                continue
+
+            events = bucket[:]
+            bucket.clear()
+            self._pending -= len(events)
+            self.num_events += len(events)
+
+            dirty: dict[int, tuple[int, int]] = dict()
+            cancelled = self._cancelled
+            for e in events:
+                trigger, t = divmod(e >> 1, num_transistors)
+                if cancelled:
+                    key = self.time * num_transistors + t
+                    count = cancelled.get(key, 0)
+                    if count:
+                        if count == 1:
+                            del cancelled[key]
+                        else:
+                            cancelled[key] = count - 1
+                        self.num_events -= 1
+                        self.num_filtered += 1
+                        continue
+
+                if conducting[t] != (e & 1):
+                    conducting[t] = e & 1
+                    dirty[drivers[t][2]] = (t, trigger)
+
+            for n, (t, trigger) in dirty.items():
+                if self._update(n, t, trigger):
+                    settled = self.time
+
+        self._count_glitches()
+        return settled - self.start
+
+    def apply_signals(
+        self, inputs: Sequence[Sequence[int]], signals: Sequence[int]
+    ) -> int:
+        """Like :meth:`apply`, using integer signals (nets map LSB
+        first).
+
+        """
+
+        assignment: dict[int, int] = dict()
+        for nets, signal in zip(inputs, signals):
+            for i, n in enumerate(nets):
+                assignment[n] = (signal >> i) & 1
+        return self.apply(assignment)
+
+    def signal(self, nets: Sequence[int]) -> int:
+        return sum(self.values[n] << i for i, n in enumerate(nets))
+
+    def settle_times(self, nets: Sequence[int]) -> list[int]:
+        """The time each net last changed at, relative to the last input
+        change (0 if it did not change).
+
+        """
+
+        return [max(0, self.last_change[n] - self.start) for n in nets]
+
+    def waveform(self, net: int) -> list[tuple[int, int]]:
+        """The ``(time, value)`` changes of ``net`` since the last input
+        change, starting with its value at that time.
+
+        """
+
+        history = self._history[net]
+        value = self.values[net] ^ (len(history) // 3 & 1)
+        waveform = [(self.start, value)]
+        for i in range(0, len(history), 3):
+            value ^= 1
+            waveform.append((history[i], value))
+        return waveform
+
+    def critical_path(self, net: int) -> list[int]:
+        """The chain of transistors (from the input side) whose events
+        led to the last change of ``net`` after the last input change.
+
+        Their delays add up to the settle time of ``net``.
+
+        """
+
+        path = list()
+        time = self.last_change[net]
+        while time > self.start:
+            # the change of the net at `time`
+            history = self._history[net]
+            k = len(history) - 3
+            while history[k] != time:
+                k -= 3
+            t, trigger = history[k + 1], history[k + 2]
+            if t < 0:
+                break
+
+            path.append(t)
+            net = trigger
+            time -= self.delays[t]
+
+        path.reverse()
+        return path
+
+    def glitches_by_cell_type(
+        self, cell: Cell, depth: int = 1
+    ) -> dict[str, int]:
+        """Total the :attr:`glitches` of every net by the type of the
+        cell driving it.
+
+        :param cell: The root cell the netlist was compiled from.
+        :type cell: Cell
+        :param depth: The level of the hierarchy to group by (1 for the
+            sub-cells of ``cell``, e.g. the ``PGMergeR2`` cells of an
+            adder). Drivers at a shallower level are grouped by their own
+            cell's type.
+        :type depth: int
+
+        """
+
+        if self.netlist.reachable is None:
+            raise ValueError("The netlist was unpickled (no reachable cells)")
+
+        # the type name of each FinFET's ancestor at `depth`
+        owner: dict[int, str] = dict()
+        stack: list[tuple[Cell, int, str]] = [(cell, 0, type(cell).__name__)]
+        while stack:
+            c, level, name = stack.pop()
+            for child in c.components.cells:
+                if isinstance(child, FinFET):
+                    owner[id(child)] = name
+                elif level < depth:
+                    stack.append((child, level + 1, type(child).__name__))
+                else:
+                    stack.append((child, level + 1, name))
+
+        finfets = self.netlist.reachable.finfets
+        totals: dict[str, int] = dict()
+        for n, drivers in enumerate(self.netlist.drivers):
+            if self.glitches[n] and drivers:
+                name = owner.get(id(finfets[drivers[0]]), type(cell).__name__)
+                totals[name] = totals.get(name, 0) + self.glitches[n]
+        return totals
+
+
+class StaticTiming:
+    """Static timing analysis of a :class:`Netlist`.
+
+    Arrival times are propagated once over the nets in topological order
+    (linear in the number of nets and transistors): a transistor's drain
+    can change ``delays[t]`` after the latest (or earliest) of its gate
+    and source, and a net after the latest (or earliest) of its drivers.
+    Only paths starting at an input count; powered nets never change.
+
+    """
+
+    def __init__(
+        self,
+        netlist: Netlist,
+        delays: Optional[Sequence[int]] = None,
+        *,
+        finfet_delay: int = 1,
+        interconnect_delay: int = 0,
+        inputs: Optional[Iterable[int]] = None,
+    ) -> None:
+        """
+        :param netlist: The netlist to analyze.
+        :type netlist: Netlist
+        :param delays: The delay of every transistor, as with
+            :class:`TimedSimulator` (one FinFET stage each by default).
+        :param finfet_delay: The delay of every transistor.
+        :type finfet_delay: int
+        :param interconnect_delay: The extra delay of transistors whose
+            drain net is joined by an ``Interconnect``.
+        :type interconnect_delay: int
+        :param inputs: The nets paths start at (by default
+            :meth:`Netlist.inputs`, which includes the outputs of the
+            cells excluded from the netlist).
+
+        """
+
+        self.netlist = netlist
+        self.delays = _delays(netlist, delays, finfet_delay, interconnect_delay)
+        self.inputs = tuple(netlist.inputs() if inputs is None else inputs)
+
+        num_nets = netlist.num_nets
+        self.latest = [-1] * num_nets
+        """The latest arrival time of every net (-1 if no input reaches
+        it)"""
+
+        self.earliest = [-1] * num_nets
+        """The earliest arrival time of every net (-1 if no input reaches
+        it)"""
+
+        # the transistor and net each arrival time came through
+        self._latest_from = [(-1, -1)] * num_nets
+        self._earliest_from = [(-1, -1)] * num_nets
+
+        latest = self.latest
+        earliest = self.earliest
+        for n in self.inputs:
+            latest[n] = earliest[n] = 0
+
+        transistors = netlist.transistors
+        drivers = netlist.drivers
+        delays = self.delays
+        for n in netlist.order:
+            if latest[n] >= 0 or n in netlist.powered:
+                continue
+
+            late = early = -1
+            late_from = early_from = (-1, -1)
+            for t in drivers[n]:
+                gate, source, _, _ = transistors[t]
+                d = delays[t]
+                for i in (gate, source):
+                    if latest[i] < 0:
+                        continue
+                    if latest[i] + d > late:
+                        late = latest[i] + d
+                        late_from = (t, i)
+                    if early < 0 or earliest[i] + d < early:
+                        early = earliest[i] + d
+                        early_from = (t, i)
+
+            latest[n] = late
+            earliest[n] = early
+            self._latest_from[n] = late_from
+            self._earliest_from[n] = early_from
+
+    def _path(self, net: int, sources: list[tuple[int, int]]) -> list[int]:
+        path = list()
+        t, net = sources[net]
+        while t >= 0:
+            path.append(t)
+            t, net = sources[net]
+        path.reverse()
+        return path
+
+    def critical_path(self, net: int) -> list[int]:
+        """The transistors (from the input side) of the longest path to
+        ``net``. Their delays add up to ``latest[net]``.
+
+        """
+
+        return self._path(net, self._latest_from)
+
+    def shortest_path(self, net: int) -> list[int]:
+        """The transistors (from the input side) of the shortest path to
+        ``net``. Their delays add up to ``earliest[net]``.
+
+        """
+
+        return self._path(net, self._earliest_from)
+
+    def longest(self, nets: Iterable[int]) -> int:
+        """The longest path to any of ``nets``."""
+        return max(self.latest[n] for n in nets)
+
+    def shortest(self, nets: Iterable[int]) -> int:
+        """The shortest path to any of ``nets`` reached by an input."""
+        return min(self.earliest[n] for n in nets if self.earliest[n] >= 0)
+
+    def histogram(self, nets: Iterable[int]) -> dict[int, int]:
+        """The number of ``nets`` with each latest arrival time, in order
+        of arrival.
+
+        """
+
+        counts: dict[int, int] = dict()
+        for n in nets:
+            counts[self.latest[n]] = counts.get(self.latest[n], 0) + 1
+        return dict(sorted(counts.items()))
+
+    def cells(
+        self, cell: Cell, path: Sequence[int], depth: int = 1
+    ) -> list[tuple[tuple[str, ...], Cell]]:
+        """The cells a path of transistors crosses, in order.
+
+        :param cell: The root cell the netlist was compiled from.
+        :type cell: Cell
+        :param path: The transistors (e.g. from :meth:`critical_path`).
+        :param depth: The level of the hierarchy to report (1 for the
+            sub-cells of ``cell``, e.g. the ``PGMergeR2`` cells in the
+            ``layers`` of an adder). Transistors at a shallower level are
+            reported with their own cell.
+        :type depth: int
+        :return: The ``(path, cell)`` pairs of :func:`cell_paths`, with
+            consecutive transistors in the same cell reported once.
+
+        """
+
+        if self.netlist.reachable is None:
+            raise ValueError("The netlist was unpickled (no reachable cells)")
+
+        parents: dict[tuple[str, ...], tuple[tuple[str, ...], Cell]] = dict()
+        owner: dict[int, tuple[tuple[str, ...], Cell]] = dict()
+        for names, c in cell_paths(cell):
+            if isinstance(c, FinFET):
+                parent = names[:-1][:depth + 1]
+                owner[id(c)] = parents[parent]
+            elif len(names) <= depth + 1:
+                parents[names] = (names, c)
+
+        cells: list[tuple[tuple[str, ...], Cell]] = list()
+        finfets = self.netlist.reachable.finfets
+        for t in path:
+            entry = owner[id(finfets[t])]
+            if not cells or cells[-1][1] is not entry[1]:
+                cells.append(entry)
+        return cells
@@ -0,0 +1,337 @@
+from __future__ import annotations
+import mmap
+import os
+import random
+import struct
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from .drivers import AdderInterface
+
+try:
+    import numpy
+except ImportError: # numpy is optional
+    numpy = None
+
+
+__all__ = (
+    "VectorFile",
+    "ResultFile",
+    "write_vectors",
+    "generate_vectors",
+    "run_vectors",
+)
+
+
+# file header: magic, format version, operand width (bits), record count
+HEADER = struct.Struct("<4sHHQ")
+VECTOR_MAGIC = b"CVEC"
+RESULT_MAGIC = b"CRES"
+VERSION = 1
+
+# records per bulk write
+CHUNK_RECORDS = 4096
+
+PathLike = Union[str, os.PathLike]
+
+
+def _operand_size(width: int) -> int:
+    return (width + 7) // 8
+
+
+def _vector_record_size(width: int) -> int:
+    # i0, i1, cin, o, cout
+    return 3 * _operand_size(width) + 2
+
+
+def _result_record_size(width: int) -> int:
+    # o, cout
+    return _operand_size(width) + 1
+
+
+def _numpy_dtype(width: int, names: tuple[str, ...]) -> Any:
+    size = _operand_size(width)
+    operand = f"<u{size}" if size in (1, 2, 4, 8) else f"V{size}"
+    return numpy.dtype([
+        (n, "u1" if n in ("cin", "cout") else operand) for n in names
+    ])
+
+
+class _MappedFile:
+    __slots__ = ("width", "count", "record_size", "_file", "_mmap", "_view")
+
+    magic = b""
+
+    width: int
+    count: int
+    record_size: int
+
+    def __init__(self, path: PathLike, *, writable: bool = False) -> None:
+        self._view = None
+        self._file = open(path, "r+b" if writable else "rb")
+        try:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0,
+                access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            )
+        except BaseException:
+            self._file.close()
+            raise
+
+        try:
+            if len(self._mmap) < HEADER.size:
+                raise ValueError(f"{path!r} is truncated")
+
+            magic, version, width, count = HEADER.unpack_from(self._mmap)
+            if magic != self.magic or version != VERSION:
+                raise ValueError(f"{path!r} is not a version {VERSION} file")
+
+            self.width = width
+            self.count = count
+            self.record_size = self._record_size(width)
+            self._view = memoryview(self._mmap)[HEADER.size:]
+
+            if len(self._view) < count * self.record_size:
+                raise ValueError(f"{path!r} is truncated")
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> Any:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    @staticmethod
+    def _record_size(width: int) -> int:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Close the file.
+
+        Views returned by :meth:`records` and ``array`` (and unfinished
+        iterators, which hold one) stay valid after closing: the mapping
+        is only unmapped once the last of them is released.
+
+        """
+
+        try:
+            if self._view is not None:
+                self._view.release()
+                self._view = None
+            try:
+                self._mmap.close()
+            except BufferError:
+                # still exported; unmapped with the last view
+                pass
+        finally:
+            self._file.close()
+
+    def records(self) -> memoryview:
+        """A zero-copy view of the raw record bytes."""
+        return self._view[:self.count * self.record_size]
+
+    def _record(self, index: int) -> memoryview:
+        if not (0 <= index < self.count):
+            raise IndexError("Record index out of range")
+        start = index * self.record_size
+        return self._view[start:start + self.record_size]
+
+
+class VectorFile(_MappedFile):
+    """A memory-mapped file of fixed-width adder test vectors.
+
+    Each record holds the little-endian operands ``i0`` and ``i1``, a
+    ``cin`` byte, and the expected ``o`` and ``cout``. Records are read
+    from the mapping on demand, so files may be far larger than memory.
+
+    """
+
+    __slots__ = ()
+
+    magic = VECTOR_MAGIC
+
+    @staticmethod
+    def _record_size(width: int) -> int:
+        return _vector_record_size(width)
+
+    def __getitem__(self, index: int) -> tuple[int, int, int, int, bool]:
+        """Return the ``(i0, i1, cin, o, cout)`` record at ``index``."""
+        return self._unpack(self._record(index))
+
+    def __iter__(self) -> Iterator[tuple[int, int, int, int, bool]]:
+        size = self.record_size
+        view = self.records()
+        unpack = self._unpack
+        for start in range(0, len(view), size):
+            yield unpack(view[start:start + size])
+
+    def _unpack(self, record: memoryview) -> tuple[int, int, int, int, bool]:
+        n = _operand_size(self.width)
+        return (
+            int.from_bytes(record[:n], "little"),
+            int.from_bytes(record[n:2 * n], "little"),
+            record[2 * n],
+            int.from_bytes(record[2 * n + 1:3 * n + 1], "little"),
+            not not record[3 * n + 1],
+        )
+
+    def array(self) -> Any:
+        """A zero-copy NumPy structured array view of the records (with
+        the fields ``i0``, ``i1``, ``cin``, ``o`` and ``cout``). Requires
+        NumPy.
+
+        """
+
+        if numpy is None:
+            raise ImportError("NumPy is required for array views")
+
+        return numpy.frombuffer(
+            self.records(),
+            dtype=_numpy_dtype(self.width, ("i0", "i1", "cin", "o", "cout"))
+        )
+
+
+class ResultFile(_MappedFile):
+    """A memory-mapped file of fixed-width adder results (``o`` and
+    ``cout``), written in place by index.
+
+    """
+
+    __slots__ = ()
+
+    magic = RESULT_MAGIC
+
+    @staticmethod
+    def _record_size(width: int) -> int:
+        return _result_record_size(width)
+
+    @classmethod
+    def create(cls, path: PathLike, width: int, count: int) -> ResultFile:
+        """Create a zero-filled result file for ``count`` records and open
+        it for writing.
+
+        """
+
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(RESULT_MAGIC, VERSION, width, count))
+            f.truncate(HEADER.size + count * _result_record_size(width))
+
+        return cls(path, writable=True)
+
+    def __getitem__(self, index: int) -> tuple[int, bool]:
+        record = self._record(index)
+        n = _operand_size(self.width)
+        return int.from_bytes(record[:n], "little"), not not record[n]
+
+    def __setitem__(self, index: int, result: tuple[int, bool]) -> None:
+        record = self._record(index)
+        n = _operand_size(self.width)
+        o, cout = result
+        record[:n] = o.to_bytes(n, "little")
+        record[n] = int(cout)
+
+    def __iter__(self) -> Iterator[tuple[int, bool]]:
+        for i in range(self.count):
+            yield self[i]
+
+    def array(self) -> Any:
+        """A zero-copy NumPy structured array view of the records (with
+        the fields ``o`` and ``cout``). Requires NumPy.
+
+        """
+
+        if numpy is None:
+            raise ImportError("NumPy is required for array views")
+
+        return numpy.frombuffer(
+            self.records(), dtype=_numpy_dtype(self.width, ("o", "cout"))
+        )
+
+    def flush(self) -> None:
+        self._mmap.flush()
+
+
+def write_vectors(
+    path: PathLike, width: int, vectors: Iterable[tuple[int, int, int]]
+) -> int:
+    """Write ``(i0, i1, cin)`` operands to a vector file, computing the
+    expected outputs arithmetically. Returns the number of records.
+
+    """
+
+    n = _operand_size(width)
+    mask = (1 << width) - 1
+    count = 0
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(VECTOR_MAGIC, VERSION, width, 0))
+        chunk = bytearray()
+
+        for i0, i1, cin in vectors:
+            total = i0 + i1 + cin
+            chunk += i0.to_bytes(n, "little")
+            chunk += i1.to_bytes(n, "little")
+            chunk.append(cin)
+            chunk += (total & mask).to_bytes(n, "little")
+            chunk.append(total >> width)
+            count += 1
+
+            if not count % CHUNK_RECORDS:
+                f.write(chunk)
+                chunk.clear()
+
+        f.write(chunk)
+
+        # patch in the final record count
+        f.seek(0)
+        f.write(HEADER.pack(VECTOR_MAGIC, VERSION, width, count))
+
+    return count
+
+
+def generate_vectors(
+    path: PathLike, width: int, count: int, seed: Optional[int] = None
+) -> int:
+    """Write ``count`` random vectors to a vector file."""
+    rng = random.Random(seed)
+    getrandbits = rng.getrandbits
+
+    return write_vectors(path, width, (
+        (getrandbits(width), getrandbits(width), getrandbits(1))
+        for _ in range(count)
+    ))
+
+
+def run_vectors(
+    adder: AdderInterface,
+    vectors: VectorFile,
+    results: Optional[ResultFile] = None,
+) -> list[int]:
+    """Run every vector through ``adder``, optionally storing the outputs
+    in ``results``, and return the indices of mismatching vectors.
+
+    """
+
+    if vectors.width != adder.width:
+        raise ValueError("Vector width does not match the adder width")
+
+    if results is not None and len(results) < len(vectors):
+        raise ValueError("Result file is smaller than the vector file")
+
+    add = adder.add
+    mismatches = list()
+
+    for index, (i0, i1, cin, o, cout) in enumerate(vectors):
+        result = add(i0, i1, cin)
+
+        if results is not None:
+            results[index] = result
+
+        if result != (o, cout):
+            mismatches.append(index)
+
+    return mismatches
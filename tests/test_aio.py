@@ -0,0 +1,95 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from .utils import ksa_16r2
+from src.circuits import *
+
+
+def test_async_adder_batches(ksa_16r2: AdderInterface) -> None:
+    operands = [
+        (
+            random.randint(0, (1 << 16) - 1),
+            random.randint(0, (1 << 16) - 1),
+            random.randint(0, 1),
+        )
+        for _ in range(100)
+    ]
+
+    async def run() -> tuple[list[tuple[int, bool]], AsyncAdder]:
+        async with AsyncAdder(ksa_16r2, max_batch=32) as adder:
+            results = await asyncio.gather(
+                *(adder.add(*ops) for ops in operands)
+            )
+        return results, adder
+
+    results, adder = asyncio.run(run())
+
+    # check output(s)
+    for (i0, i1, cin), result in zip(operands, results):
+        total = i0 + i1 + cin
+        assert result == (total & ksa_16r2.mask, not not (total >> 16))
+
+    assert adder.num_requests == 100
+    assert adder.num_batches < 100
+
+
+def test_async_adder_propagates_errors(ksa_16r2: AdderInterface) -> None:
+    def evaluate(operands):
+        raise RuntimeError("failed")
+
+    async def run() -> None:
+        async with AsyncAdder(ksa_16r2, evaluate=evaluate) as adder:
+            await adder.add(1, 2)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+
+def test_async_adder_checks_result_count(ksa_16r2: AdderInterface) -> None:
+    def evaluate(operands):
+        return [ksa_16r2.add(*ops) for ops in operands[1:]]
+
+    async def run() -> list[object]:
+        async with AsyncAdder(ksa_16r2, evaluate=evaluate) as adder:
+            return await asyncio.gather(
+                *(adder.add(i, 1) for i in range(4)), return_exceptions=True
+            )
+
+    results = asyncio.run(asyncio.wait_for(run(), 5))
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_async_adder_cancel(ksa_16r2: AdderInterface) -> None:
+    def evaluate(operands):
+        time.sleep(0.05)
+        return [ksa_16r2.add(*ops) for ops in operands]
+
+    async def run() -> list[object]:
+        adder = AsyncAdder(ksa_16r2, max_batch=2, evaluate=evaluate)
+        calls = [asyncio.ensure_future(adder.add(i, 1)) for i in range(5)]
+        await asyncio.sleep(0.01)
+        adder._task.cancel()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        await adder.close()
+        return results
+
+    results = asyncio.run(asyncio.wait_for(run(), 5))
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+def test_async_adder_reopen(ksa_16r2: AdderInterface) -> None:
+    async def run() -> list[tuple[int, bool]]:
+        adder = AsyncAdder(ksa_16r2)
+        results = list()
+        for _ in range(2):
+            async with adder:
+                results.append(await adder.add(1, 2))
+            assert adder._executor is None
+        results.append(await adder.add(0xffff, 1))
+        await adder.close()
+        return results
+
+    assert asyncio.run(run()) == [(3, False), (3, False), (0, True)]
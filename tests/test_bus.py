@@ -0,0 +1,74 @@
+import random
+
+from src.circuits import *
+
+
+def test_bus() -> None:
+    bus = Bus(8)
+    assert isinstance(bus, tuple) and bus.width == len(bus) == 8
+    assert all(isinstance(v, Via) for v in bus)
+    assert isinstance(bus[2:6], Bus) and bus[2:6] == bus[2:6]
+    assert bus[3] is tuple(bus)[3]
+    assert Bus(bus) == bus
+
+    # unconnected vias are never energized
+    assert bus.get_signal() == 0
+    assert repr(bus) == "Bus[0x0/8]"
+
+
+def test_bus_signal() -> None:
+    a, b = Bus(16), Bus(16)
+    bindings = a.bind(b)
+    assert len(bindings) == 16 and all(isinstance(x, Binding) for x in bindings)
+
+    driver = object()
+    for v in a:
+        v.register(Cap(driver))
+    for v in b:
+        v.register(Cap())
+
+    rng = random.Random(0)
+    for _ in range(20):
+        signal = rng.getrandbits(16)
+        a.set_signal(driver, signal)
+        assert a.get_signal() == b.get_signal() == signal
+
+    # bits above the width are ignored
+    a.set_signal(driver, 0x1ffff)
+    assert b.get_signal() == 0xffff
+    assert b[8:].get_signal() == 0xff
+
+
+def test_bus_interconnect() -> None:
+    vdd = VDD()
+    nots = [NOT(vdd) for _ in range(4)]
+    o, p = Bus(4), Bus(4)
+    Bus(n.o for n in nots).interconnect(o, p)
+    for v in (*o, *p):
+        v.register(Cap())
+    i = SignalInterface(Bus(n.i for n in nots))
+    vdd.energize()
+
+    for signal in range(16):
+        i.set_signal(signal)
+        assert o.get_signal() == p.get_signal() == ~signal & 0xf
+
+
+def test_adder_buses() -> None:
+    vdd = VDD()
+    adder = KSA16R2Cin(vdd)
+    assert isinstance(adder.i0, Bus) and isinstance(adder.o, Bus)
+
+    interface = AdderInterface(adder)
+    assert interface.i0.vias is adder.i0
+    vdd.energize()
+    assert interface.add(0x1234, 0x4321, 1) == (0x5556, False)
+    assert adder.o.get_signal() == 0x5556
+
+    # state restored underneath the interface is picked up
+    state = CircuitState(adder)
+    base = state.capture()
+    interface.add(0xffff, 0xffff, 1)
+    state.restore(base)
+    assert interface.i0.get_signal() == 0x1234
+    assert interface.add(0x1234, 0x4321, 1) == (0x5556, False)
@@ -0,0 +1,56 @@
+import pytest
+
+from .utils import energized_adder
+from src.circuits import *
+
+
+@pytest.fixture
+def cached_ksa_16r2() -> CachedAdder:
+    return CachedAdder(energized_adder(), maxsize=2)
+
+
+def test_cached_adder_hits(cached_ksa_16r2: CachedAdder) -> None:
+    assert cached_ksa_16r2.add(1, 2, 0) == (3, False)
+    assert cached_ksa_16r2.add(0xffff, 1, 0) == (0, True)
+    assert cached_ksa_16r2.add(1, 2, 0) == (3, False)
+
+    info = cached_ksa_16r2.cache_info()
+    assert (info.hits, info.misses, info.size) == (1, 2, 2)
+
+    # the circuit is left in the state of the last miss
+    assert cached_ksa_16r2.adder.get_outputs() == (0, True)
+
+
+def test_cached_adder_evicts_lru(cached_ksa_16r2: CachedAdder) -> None:
+    cached_ksa_16r2.add(1, 2, 0)
+    cached_ksa_16r2.add(3, 4, 0)
+    cached_ksa_16r2.add(1, 2, 0)
+    cached_ksa_16r2.add(5, 6, 1)
+    assert cached_ksa_16r2.add(1, 2, 0) == (3, False)
+    assert cached_ksa_16r2.add(3, 4, 0) == (7, False)
+
+    info = cached_ksa_16r2.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (2, 4, 2)
+
+
+def test_cached_adder_invalidates_on_rewire() -> None:
+    vdd = VDD()
+    ksa = KSA16R2Cin(vdd)
+    cached = CachedAdder(AdderInterface(ksa), maxsize=2)
+    vdd.energize()
+    cached.add(1, 2, 0)
+
+    # modifying another netlist leaves the cache intact
+    Binding(Via(), Via())
+    KSA16R2Cin(VDD())
+    assert cached.add(1, 2, 0) == (3, False)
+    info = cached.cache_info()
+    assert (info.hits, info.misses, info.invalidations) == (1, 1, 0)
+
+    # modifying this one invalidates it
+    merge = next(c for c in ksa.layers[2] if isinstance(c, PGMergeR2))
+    CircuitEditor(ksa, vdd).replace(merge, PGMergeR2)
+
+    assert cached.add(1, 2, 0) == (3, False)
+    info = cached.cache_info()
+    assert (info.hits, info.misses, info.invalidations) == (1, 2, 1)
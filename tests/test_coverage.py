@@ -0,0 +1,87 @@
+import pathlib
+
+import pytest
+
+from .utils import CellBuilder, register_caps, IN2
+from src.circuits import *
+
+
+def test_exhaustive_vectors_cover_nand2() -> None:
+    with CellBuilder(NAND2) as cell:
+        register_caps(*cell.i, cell.o)
+    collector = CoverageCollector(cell)
+
+    for i0, i1 in IN2:
+        cell.i[0].set_state(Cap, i0)
+        cell.i[1].set_state(Cap, i1)
+        collector.sample()
+
+    assert all(collector.covered_transistors())
+    assert collector.uncovered_by_hierarchy() == {}
+
+
+def test_effectors_registered_after_the_collector() -> None:
+    with CellBuilder(NAND2) as cell:
+        register_caps(cell.o)
+    collector = CoverageCollector(cell)
+    register_caps(*cell.i)
+
+    for i0, i1 in IN2:
+        cell.i[0].set_state(Cap, i0)
+        cell.i[1].set_state(Cap, i1)
+        collector.sample()
+
+    assert all(collector.covered_transistors())
+
+
+def test_partial_coverage_by_hierarchy() -> None:
+    with CellBuilder(HalfAdder) as cell:
+        register_caps(*cell.i, cell.s, cell.c)
+    collector = CoverageCollector(cell, "ha")
+
+    # the carry never rises
+    for i0, i1 in ((False, False), (True, False), (False, True)):
+        cell.i[0].set_state(Cap, i0)
+        cell.i[1].set_state(Cap, i1)
+        collector.sample()
+
+    uncovered = collector.uncovered_by_hierarchy()
+    assert "ha/AND2_0" in uncovered
+    assert collector.netlist.net(cell.c) in uncovered["ha/AND2_0"]
+    assert "uncovered nets:" in collector.report()
+
+
+def test_merge_and_serialize(tmp_path: pathlib.Path) -> None:
+    with CellBuilder(XOR2) as cell:
+        register_caps(*cell.i, cell.o)
+    collectors = (CoverageCollector(cell), CoverageCollector(cell))
+
+    # split the vectors between two "workers"
+    for collector, vectors in zip(collectors, (IN2[:2], IN2[2:])):
+        for i0, i1 in vectors:
+            cell.i[0].set_state(Cap, i0)
+            cell.i[1].set_state(Cap, i1)
+            collector.sample()
+        collector.coverage.save(tmp_path / f"{id(collector)}.cov")
+
+    merged = Coverage.load(tmp_path / f"{id(collectors[0])}.cov")
+    merged.merge(Coverage.load(tmp_path / f"{id(collectors[1])}.cov"))
+
+    full = CoverageCollector(cell)
+    for i0, i1 in IN2:
+        cell.i[0].set_state(Cap, i0)
+        cell.i[1].set_state(Cap, i1)
+        full.sample()
+
+    assert merged.to_bytes() == full.coverage.to_bytes()
+
+
+def test_from_bytes_checks_length() -> None:
+    with CellBuilder(XOR2) as cell:
+        register_caps(*cell.i, cell.o)
+    data = CoverageCollector(cell).coverage.to_bytes()
+    assert Coverage.from_bytes(data).to_bytes() == data
+
+    for corrupted in (data[:-1], data + b"\x00", data[:10], b""):
+        with pytest.raises(ValueError):
+            Coverage.from_bytes(corrupted)
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from .utils import ksa_16r2
+from src.circuits import *
+
+
+@pytest.mark.parametrize(
+    ("i0", "i1", "cin"),
+    zip(
+        (random.randint(0, (1 << 16) - 1) for _ in range(50)),
+        (random.randint(0, (1 << 16) - 1) for _ in range(50)),
+        (random.randint(0, 1) for _ in range(50))
+    )
+)
+def test_adder_interface(
+    i0: int, i1: int, cin: int, ksa_16r2: AdderInterface
+) -> None:
+    # calculate the expected output(s)
+    total = i0 + i1 + cin
+
+    # check output(s)
+    assert ksa_16r2.add(i0, i1, cin) == (
+        total & ksa_16r2.mask, not not (total >> 16)
+    )
+
+
+def _vectors(width: int, count: int) -> list[tuple[int, int, int]]:
+    rng = random.Random(width)
+    return [
+        (rng.getrandbits(width), rng.getrandbits(width), rng.getrandbits(1))
+        for _ in range(count)
+    ]
+
+
+def _expected(
+    vectors: list[tuple[int, int, int]], width: int
+) -> list[tuple[int, bool]]:
+    return [
+        ((a + b + c) & ((1 << width) - 1), not not ((a + b + c) >> width))
+        for a, b, c in vectors
+    ]
+
+
+@pytest.mark.parametrize("compiled", (False, True))
+@pytest.mark.parametrize("tp", (KSA16R2Cin, PKSA16R2Cin))
+def test_streaming_adder(tp: type, compiled: bool) -> None:
+    vdd = VDD()
+    adder = StreamingAdder(tp(vdd), compiled)
+    vdd.energize()
+
+    vectors = _vectors(16, 20)
+    assert list(adder.stream(vectors)) == _expected(vectors, 16)
+    assert adder.latency == (2 if tp is PKSA16R2Cin else 0)
+    assert adder.cycles == len(vectors) + adder.latency
+
+
+def test_streaming_adder_empty() -> None:
+    vdd = VDD()
+    adder = StreamingAdder(PKSA16R2Cin(vdd))
+    vdd.energize()
+
+    assert list(adder.stream(())) == []
+    assert adder.cycles == 0
+
+
+@pytest.mark.parametrize("compiled", (False, True))
+@pytest.mark.parametrize("n", (1, 2, 3))
+def test_streaming_adder_short(n: int, compiled: bool) -> None:
+    vdd = VDD()
+    adder = StreamingAdder(PKSA16R2Cin(vdd), compiled)
+    vdd.energize()
+
+    vectors = _vectors(16, n)
+    assert list(adder.stream(vectors)) == _expected(vectors, 16)
+    assert adder.cycles == n + adder.latency
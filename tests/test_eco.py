@@ -0,0 +1,188 @@
+import random
+
+import pytest
+
+from src.circuits import *
+
+
+class MergeAND(Cell):
+    """A (wrong) PG merge generating ``g[i:k] & g[k-1:j]``."""
+
+    __slots__ = ("i0", "i1", "o")
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+        and2_p = AND2(vdd)
+        and2_g = AND2(vdd)
+        cmp.add(and2_p, and2_g)
+
+        self.i0 = (and2_p.i[0], and2_g.i[0])
+        self.i1 = (and2_p.i[1], and2_g.i[1])
+        self.o = (and2_p.o, and2_g.o)
+        self.components = cmp.to_components()
+
+
+def _check(ksa: KSA16R2Cin, adder: AdderInterface, a: int, b: int) -> None:
+    # the live circuit agrees with a netlist compiled from scratch
+    netlist = Netlist(ksa)
+    inputs = (
+        netlist.nets(ksa.i0), netlist.nets(ksa.i1), (netlist.net(ksa.cin),)
+    )
+    outputs = ((*netlist.nets(ksa.o), netlist.net(ksa.cout)),)
+    o, cout = adder.get_outputs()
+    assert netlist.evaluate_signals(inputs, (a, b, 0), outputs) == (
+        o | cout << 16,
+    )
+
+
+@pytest.fixture
+def energized() -> tuple[VDD, KSA16R2Cin, AdderInterface]:
+    vdd = VDD()
+    ksa = KSA16R2Cin(vdd)
+    adder = AdderInterface(ksa)
+    vdd.energize()
+    return vdd, ksa, adder
+
+
+def test_replace(energized: tuple[VDD, KSA16R2Cin, AdderInterface]) -> None:
+    vdd, ksa, adder = energized
+    editor = CircuitEditor(ksa, vdd)
+    assert adder.add(0x7fff, 1, 0) == (0x8000, False)
+
+    # swapping in a variant re-propagates the current inputs
+    layer = ksa.layers[2]
+    merges = [c for c in layer if isinstance(c, PGMergeR2)]
+    assert merges
+    variants = [editor.replace(m, MergeAND) for m in merges]
+    assert all(isinstance(c, MergeAND) for c in ksa.layers[2] if c in variants)
+    assert not any(c in ksa.components.cells for c in merges)
+    _check(ksa, adder, 0x7fff, 1)
+
+    rng = random.Random(0)
+    for _ in range(20):
+        a, b = rng.getrandbits(16), rng.getrandbits(16)
+        adder.add(a, b, 0)
+        _check(ksa, adder, a, b)
+
+    # and back
+    for v in variants:
+        assert editor.parent(v) is ksa
+        editor.replace(v, PGMergeR2)
+    for _ in range(20):
+        a, b, c = rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(1)
+        s = a + b + c
+        assert adder.add(a, b, c) == (s & 0xffff, bool(s >> 16))
+
+    netlist = Netlist(ksa)
+    fresh = Netlist(KSA16R2Cin(VDD()))
+    assert len(netlist.transistors) == len(fresh.transistors)
+    assert len(netlist.inputs()) == 33
+
+
+def test_remove_and_add(
+    energized: tuple[VDD, KSA16R2Cin, AdderInterface]
+) -> None:
+    vdd, ksa, adder = energized
+    editor = CircuitEditor(ksa, vdd)
+    merge = next(c for c in ksa.layers[3] if isinstance(c, PGMergeR2))
+    ports = {"i0": merge.i0, "i1": merge.i1, "o": merge.o}
+
+    adder.add(0xffff, 1, 0)
+    boundary = editor.remove(merge)
+    assert {id(v) for v in boundary} == {
+        id(v) for group in ports.values() for v in group
+    }
+    assert merge not in ksa.layers[3] and None in ksa.layers[3]
+    _check(ksa, adder, 0xffff, 1)
+
+    cell = editor.add(PGMergeR2, ports, parent=ksa)
+    assert editor.parent(cell) is ksa
+    assert adder.get_outputs() == (0, True)
+    assert adder.add(0x1234, 0x4321, 1) == (0x5556, False)
+
+    with pytest.raises(ValueError):
+        editor.add(PGMergeR2, {"x": ksa.cin})
+
+
+class Chain(Cell):
+    """Two inverters in a row."""
+
+    __slots__ = ("a", "b", "binding")
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+        self.a, self.b = NOT(vdd), NOT(vdd)
+        self.binding = Binding(self.a.o, self.b.i)
+        cmp.add(self.a, self.b, self.binding)
+        self.components = cmp.to_components()
+
+
+def test_connections() -> None:
+    vdd = VDD()
+    pair = Chain(vdd)
+    a, b, binding = pair.a, pair.b, pair.binding
+    i = SignalInterface((a.i,))
+    o = SignalInterface((b.o,))
+    vdd.energize()
+
+    editor = CircuitEditor(pair, vdd)
+    i.set_signal(1)
+    assert o.get_signal() == 1
+
+    # b's input loses a's output, and a's output is left open
+    assert editor.disconnect(binding) == (a.o, b.i)
+    assert o.get_signal() == 1 and b.i.energized is False
+    i.set_signal(0)
+    assert a.o.energized and o.get_signal() == 1
+    assert binding not in pair.components.bindings
+
+    x = editor.connect(a.o, b.i)
+    assert x in pair.components.interconnects
+    assert o.get_signal() == 0
+    i.set_signal(1)
+    assert o.get_signal() == 1
+
+    with pytest.raises(ValueError):
+        editor.connect(a.o)
+    with pytest.raises(ValueError):
+        editor.replace(a, NAND2)
+    with pytest.raises(KeyError):
+        editor.remove(pair)
+
+
+class CappedMerge(PGMergeR2):
+    """A PG merge whose outputs cannot be connected (already capped)."""
+
+    __slots__ = ()
+
+    def _init(self, vdd: VDD) -> None:
+        super()._init(vdd)
+        for v in self.o:
+            v.register(Cap())
+
+
+def test_failed_edits_leave_circuit_working(
+    energized: tuple[VDD, KSA16R2Cin, AdderInterface]
+) -> None:
+    vdd, ksa, adder = energized
+    editor = CircuitEditor(ksa, vdd)
+    adder.add(0xffff, 1, 0)
+
+    merge = next(c for c in ksa.layers[2] if isinstance(c, PGMergeR2))
+    with pytest.raises(ValueError):
+        editor.replace(merge, CappedMerge)
+    assert merge in ksa.layers[2] and editor.parent(merge) is ksa
+
+    # wires have no effectors of their own to detach
+    buf = next(c for c in ksa.layers[2] if isinstance(c, BUF1))
+    with pytest.raises(ValueError, match="wire"):
+        editor.replace(buf, BUF1)
+    with pytest.raises(ValueError, match="wire"):
+        editor.remove(buf)
+
+    _check(ksa, adder, 0xffff, 1)
+    rng = random.Random(1)
+    for _ in range(20):
+        a, b, c = rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(1)
+        s = a + b + c
+        assert adder.add(a, b, c) == (s & 0xffff, bool(s >> 16))
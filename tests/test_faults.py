@@ -0,0 +1,67 @@
+import itertools
+import random
+
+import pytest
+
+from src.circuits import *
+
+
+def _full_adder_sim() -> FaultSimulator:
+    vdd = VDD()
+    cell = FullAdder(vdd)
+    return FaultSimulator(
+        cell, (cell.i[:1], cell.i[1:], (cell.cin,)), ((cell.s,), (cell.cout,))
+    )
+
+
+@pytest.fixture(scope="session")
+def ksa_16r2_sim() -> FaultSimulator:
+    vdd = VDD()
+    ksa = KSA16R2Cin(vdd)
+    return FaultSimulator(ksa, (ksa.i0, ksa.i1, (ksa.cin,)), (ksa.o, (ksa.cout,)))
+
+
+@pytest.mark.parametrize(
+    ("i0", "i1", "cin"),
+    zip(
+        (random.randint(0, (1 << 16) - 1) for _ in range(50)),
+        (random.randint(0, (1 << 16) - 1) for _ in range(50)),
+        (random.randint(0, 1) for _ in range(50))
+    )
+)
+def test_fault_free_evaluation(
+    i0: int, i1: int, cin: int, ksa_16r2_sim: FaultSimulator
+) -> None:
+    total = i0 + i1 + cin
+    assert ksa_16r2_sim.evaluate((i0, i1, cin)) == (
+        total & 0xffff, total >> 16
+    )
+
+
+def test_stuck_cout(ksa_16r2_sim: FaultSimulator) -> None:
+    cout = ksa_16r2_sim.outputs[1][0]
+    fault = Fault("net", cout, False)
+
+    report = ksa_16r2_sim.run([(1, 2, 0)], [fault])
+    assert report.undetected == (fault,)
+
+    report = ksa_16r2_sim.run([(1, 2, 0), (0xffff, 1, 0)], [fault])
+    assert report.detected == (fault,)
+    assert report.coverage == 1.0
+
+
+def test_lanes_match_serial_simulation() -> None:
+    sim = _full_adder_sim()
+    vectors = tuple(itertools.product((0, 1), (0, 1), (0, 1)))
+    faults = sim.faults()
+
+    # small batches exercise lane packing across batch boundaries
+    report = sim.run(vectors, lanes=7)
+    assert report.num_faults == len(faults)
+
+    expected = {
+        f for f in faults
+        if any(sim.evaluate(v, f) != sim.evaluate(v) for v in vectors)
+    }
+    assert set(report.detected) == expected
+    assert report.coverage == len(expected) / len(faults)
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from src.circuits import *
+
+
+@pytest.mark.parametrize(
+    "params",
+    (
+        RandomNetlistParams(10, seed=0),
+        RandomNetlistParams(100, seed=100),
+        RandomNetlistParams(200, num_inputs=16, seed=200, window=8),
+        RandomNetlistParams(200, seed=300, powered=0.9, wired=0.5),
+    )
+)
+def test_fuzz(params: RandomNetlistParams) -> None:
+    result = fuzz(params, num_netlists=5, num_vectors=20)
+    assert result.mismatches == ()
+    assert result.num_vectors == 100
+
+
+def test_random_netlist_is_reproducible() -> None:
+    params = RandomNetlistParams(50, seed=7)
+    a = RandomNetlist(VDD(), params)
+    b = RandomNetlist(VDD(), params)
+
+    assert a.spec == b.spec
+    assert a.outputs == b.outputs
+    assert len(Netlist(a).transistors) == 50
+
+
+def test_random_netlist_build_is_linear() -> None:
+    def build(num_transistors: int) -> float:
+        params = RandomNetlistParams(num_transistors, seed=0)
+        elapsed = float("inf")
+        with no_gc():
+            for _ in range(3):
+                start = time.perf_counter()
+                RandomNetlist(VDD(), params)
+                elapsed = min(elapsed, time.perf_counter() - start)
+        return elapsed
+
+    # 4 times the transistors; a quadratic build takes about 8 times as
+    # long at these sizes (and 16 times asymptotically)
+    assert build(20_000) < 6 * build(5_000)
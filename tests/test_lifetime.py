@@ -0,0 +1,86 @@
+import gc
+import multiprocessing
+import weakref
+
+import pytest
+
+from src.circuits import *
+
+
+def _build() -> tuple[VDD, KSA16R2Cin, AdderInterface]:
+    vdd = VDD()
+    ksa = KSA16R2Cin(vdd)
+    adder = AdderInterface(ksa)
+    vdd.energize()
+    return vdd, ksa, adder
+
+
+def test_release() -> None:
+    vdd, ksa, adder = _build()
+    assert adder.add(1, 2, 0) == (3, False)
+    refs = [weakref.ref(c) for c in (ksa, *ksa.components.all_cells())]
+
+    with no_gc():
+        assert release(ksa) == ksa.components.num_vias()
+        del vdd, ksa, adder
+        assert all(r() is None for r in refs)
+
+
+def test_caps_are_not_cycles() -> None:
+    with no_gc():
+        via = Via()
+        via.register(Cap())
+        ref = weakref.ref(via.effectors[id(Cap)])
+        del via
+        assert ref() is None
+
+
+def test_no_gc() -> None:
+    assert gc.isenabled()
+    with no_gc():
+        assert not gc.isenabled()
+        with no_gc():
+            pass
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with no_gc():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_freeze() -> None:
+    _build()
+    try:
+        assert freeze() > 0
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+_adder = None
+
+
+def _add(a: int, b: int) -> tuple[int, bool]:
+    return _adder.add(a, b, 0)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork is not available",
+)
+def test_fork_executor() -> None:
+    global _adder
+    _, _, _adder = _build()
+    try:
+        with fork_executor(2) as executor:
+            assert gc.get_freeze_count() == 0
+            assert list(executor.map(_add, (1, 0xffff), (2, 1))) == [
+                (3, False), (0, True)
+            ]
+    finally:
+        _adder = None
@@ -1,9 +1,12 @@
 import random
+import sys
+import time
+import tracemalloc
 from typing import Union, TypeVar
 
 import pytest
 
-from .utils import register_caps
+from .utils import energized_adder, register_caps
 from src.circuits import *
 
 
@@ -128,3 +131,233 @@ def test_ksa_64r2(
     # check output(s)
     assert ksa_64r2[3].get_signal() == expected_o
     assert ksa_64r2[0].cout.energized == expected_cout
+
+
+def test_ksa_r2cin_existing_widths() -> None:
+    assert ksa_r2cin(16) is KSA16R2Cin
+    assert ksa_r2cin(32) is KSA32R2Cin
+    assert ksa_r2cin(64) is KSA64R2Cin
+    assert ksa_r2cin(128) is ksa_r2cin(128)
+    assert ksa_r2cin(128).__name__ == "KSA128R2Cin"
+
+
+@pytest.mark.parametrize("width", (0, 1, 3, 24, 100))
+def test_ksa_r2cin_invalid_width(width: int) -> None:
+    with pytest.raises(ValueError):
+        ksa_r2cin(width)
+
+
+@pytest.mark.parametrize("width", (2, 4, 8, 16, 32, 64, 128, 256))
+def test_ksa_r2cin_scaling(width: int) -> None:
+    ksa = ksa_r2cin(width)(VDD())
+    netlist = Netlist(ksa)
+    height = width.bit_length() - 1
+
+    assert len(ksa.o) == len(ksa.i0) == len(ksa.i1) == width
+    assert len(ksa.layers) == height + 2
+    assert len(netlist.transistors) == 9 * width * height + width + 24
+
+
+@pytest.mark.parametrize("width", (2, 4, 8, 128))
+def test_ksa_r2cin_equivalence(width: int) -> None:
+    assert check_adder(ksa_r2cin(width)(VDD()))
+
+
+@pytest.mark.parametrize("width", (2, 128))
+def test_ksa_r2cin_event_model(width: int) -> None:
+    _check_event_model(ksa_r2cin(width))
+
+
+def test_ksa_r2cin_build_cost() -> None:
+    def build(width: int) -> tuple[float, int]:
+        tp = ksa_r2cin(width)
+        elapsed = float("inf")
+        with no_gc():
+            for _ in range(3):
+                start = time.perf_counter()
+                tp(VDD())
+                elapsed = min(elapsed, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            ksa = tp(VDD())
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        del ksa
+        return elapsed, size
+
+    # both grow as n log n, by a factor of 5.3 from 64 to 256 bits (an
+    # n^2 build would grow by 16); timings are noisy, so their bound is
+    # looser (collections of the other tests' garbage are excluded)
+    time64, size64 = build(64)
+    time256, size256 = build(256)
+    assert size256 < 1.25 * 5.3 * size64
+    assert time256 < 2 * 5.3 * time64
+
+
+_ADDERS = (
+    BKA16R2Cin, BKA32R2Cin, BKA64R2Cin,
+    SKA16R2Cin, SKA32R2Cin, SKA64R2Cin,
+    HCA16R2Cin, HCA32R2Cin, HCA64R2Cin,
+    RCA16Cin, RCA32Cin, RCA64Cin,
+)
+
+
+@pytest.mark.parametrize("tp", _ADDERS)
+def test_adder_equivalence(tp: type) -> None:
+    assert check_adder(tp(VDD()))
+
+
+def _check_event_model(tp: type) -> None:
+    ksa, i0_int, i1_int, o_int = _ksa(tp)
+    width = len(ksa.o)
+    mask = (1 << width) - 1
+    rng = random.Random(width)
+
+    for _ in range(25):
+        i0 = rng.getrandbits(width)
+        i1 = rng.getrandbits(width)
+        cin = rng.getrandbits(1)
+        total = i0 + i1 + cin
+
+        ksa.cin.set_state(Cap, not not cin)
+        i0_int.set_signal(i0)
+        i1_int.set_signal(i1)
+
+        assert o_int.get_signal() == total & mask
+        assert ksa.cout.energized == (not not (total >> width))
+
+    ksa.diagram()
+    ksa.state_diagram()
+
+
+@pytest.mark.parametrize("tp", _ADDERS)
+def test_adder_event_model(tp: type) -> None:
+    _check_event_model(tp)
+
+
+@pytest.mark.parametrize("tp", (*_ADDERS, KSA64R2Cin, KSA64R4Cin))
+def test_adder_worst_case_carry(tp: type) -> None:
+    adder = energized_adder(tp)
+    ones = adder.mask
+
+    # a carry rippling through every bit (the recursion limit is only
+    # raised while inputs are set)
+    limit = sys.getrecursionlimit()
+    assert adder.add(ones, 0, 1) == (0, True)
+    assert adder.add(0, ones, 1) == (0, True)
+    assert adder.add(ones, ones, 1) == (ones, True)
+    assert adder.add(ones, 0, 0) == (ones, False)
+    assert sys.getrecursionlimit() == limit
+
+
+@pytest.mark.parametrize(
+    ("tp", "num_layers"),
+    (
+        (KSA16R2Cin, 4),
+        (BKA16R2Cin, 7),
+        (SKA16R2Cin, 4),
+        (HCA16R2Cin, 5),
+    ),
+)
+def test_prefix_adder_layers(tp: type, num_layers: int) -> None:
+    ksa = tp(VDD())
+
+    # generate and sum layers
+    assert len(ksa.layers) == num_layers + 2
+    assert all(len(l) == 16 for l in ksa.layers)
+
+
+def test_prefix_adder_invalid_graph() -> None:
+    from src.circuits.macrocells import _PrefixAdderCin
+
+    class Gap(_PrefixAdderCin):
+        height = 2
+
+        @classmethod
+        def _prefix(cls, width: int):
+            yield ((3, 1),)
+
+    class Incomplete(_PrefixAdderCin):
+        height = 2
+
+        @classmethod
+        def _prefix(cls, width: int):
+            yield ((1, 0), (3, 2))
+
+    with pytest.raises(ValueError):
+        Gap(VDD())
+    with pytest.raises(ValueError):
+        Incomplete(VDD())
+
+
+@pytest.mark.parametrize(
+    ("tp", "num_layers"),
+    ((KSA16R4Cin, 2), (KSA32R4Cin, 3), (KSA64R4Cin, 3)),
+)
+def test_ksa_r4cin(tp: type, num_layers: int) -> None:
+    ksa = tp(VDD())
+
+    # generate and sum layers
+    assert len(ksa.layers) == num_layers + 2
+    assert check_adder(ksa)
+    ksa.diagram()
+
+
+@pytest.mark.parametrize("tp", (KSA16R4Cin, KSA64R4Cin))
+def test_ksa_r4cin_event_model(tp: type) -> None:
+    _check_event_model(tp)
+
+
+def test_ksa_r4cin_depth() -> None:
+    r2 = Netlist(KSA64R2Cin(VDD()))
+    r4 = Netlist(KSA64R4Cin(VDD()))
+    assert max(r4.levels()) < max(r2.levels())
+
+
+@pytest.mark.parametrize(
+    ("pipeline", "latency"), (((), 0), ((0,), 1), ((1, 3), 2), ((0, 4), 2))
+)
+def test_pksa_r2cin_pipeline(pipeline: tuple[int, ...], latency: int) -> None:
+    class PKSA(PKSA16R2Cin):
+        pass
+
+    PKSA.pipeline = pipeline
+    vdd = VDD()
+    ksa = PKSA(vdd)
+    adder = StreamingAdder(ksa, compiled=True)
+
+    assert ksa.latency == latency
+    assert len(ksa.registers) == latency
+    assert len(ksa.layers) == 6 + latency
+    assert (ksa.clk is None) == (not latency)
+    assert all(len(stage) == 16 for stage in ksa.registers)
+
+    rng = random.Random(latency)
+    vectors = [
+        (rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(1))
+        for _ in range(30)
+    ]
+    assert list(adder.stream(vectors)) == [
+        ((a + b + c) & 0xffff, not not ((a + b + c) >> 16))
+        for a, b, c in vectors
+    ]
+
+
+def test_pksa_r2cin_combinational_logic() -> None:
+    class KSA(PKSA64R2Cin):
+        pipeline = ()
+
+    ksa = KSA(VDD())
+    reference = KSA64R2Cin(VDD())
+    assert len(Netlist(ksa).transistors) == len(
+        Netlist(reference).transistors
+    )
+    assert check_adder(ksa)
+
+    # the same cells, layer by layer
+    def cells(layer: tuple[Cell, ...]) -> list[str]:
+        return sorted(type(c).__name__ for c in layer)
+
+    assert list(map(cells, ksa.layers)) == list(map(cells, reference.layers))
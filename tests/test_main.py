@@ -0,0 +1,92 @@
+import argparse
+import io
+import pathlib
+
+import pytest
+
+import main
+
+
+def run_batch(
+    tmp_path: pathlib.Path, data: bytes, format: str = "text"
+) -> bytes:
+    infile = tmp_path / "in"
+    outfile = tmp_path / "out"
+    infile.write_bytes(data)
+    main.batch(argparse.Namespace(
+        input=str(infile), output=str(outfile), format=format, quiet=True
+    ))
+    return outfile.read_bytes()
+
+
+def test_text_round_trip(tmp_path: pathlib.Path) -> None:
+    data = b"1 2 0\n\n0xffffffffffffffff 1 0\n3 0b101 1"
+
+    assert run_batch(tmp_path, data) == b"3 0\n0 1\n9 0\n"
+
+
+def test_binary_round_trip(tmp_path: pathlib.Path) -> None:
+    vectors = ((1, 2, 0), ((1 << 64) - 1, 1, 0), (3, 5, 1))
+    data = b"".join(main.IN_RECORD.pack(*v) for v in vectors)
+
+    out = run_batch(tmp_path, data, "binary")
+    assert list(main.OUT_RECORD.iter_unpack(out)) == [(3, 0), (0, 1), (9, 0)]
+
+
+def test_read_text_crlf() -> None:
+    stream = io.BytesIO(b"1 2 0\r\n3 4 1\r\n")
+
+    assert [v for c in main.read_text(stream) for v in c] == [
+        (1, 2, 0), (3, 4, 1)
+    ]
+
+
+@pytest.mark.parametrize("line, message", (
+    (b"1 2", "line 2: expected 'A B cin'"),
+    (b"1 x 0", "line 2: invalid integer"),
+    (b"1 2 2", "line 2: operand out of range"),
+    (b"-1 2 0", "line 2: operand out of range"),
+))
+def test_read_text_malformed(line: bytes, message: str) -> None:
+    stream = io.BytesIO(b"1 2 0\n" + line + b"\n")
+
+    with pytest.raises(ValueError, match=message):
+        list(main.read_text(stream))
+
+
+def test_read_binary_truncated() -> None:
+    stream = io.BytesIO(main.IN_RECORD.pack(1, 2, 0) + b"\x01\x02")
+
+    with pytest.raises(ValueError, match="Truncated"):
+        list(main.read_binary(stream))
+
+
+def test_read_binary_checks_cin() -> None:
+    records = [(1, 2, 0), (3, 4, 1), (5, 6, 2)]
+    stream = io.BytesIO(b"".join(main.IN_RECORD.pack(*r) for r in records))
+
+    with pytest.raises(ValueError, match="record 2: carry-in out of range"):
+        list(main.read_binary(stream))
+
+
+def test_batch_rejects_binary_cin(tmp_path: pathlib.Path) -> None:
+    data = main.IN_RECORD.pack(1, 2, 0) + main.IN_RECORD.pack(1, 2, 255)
+
+    with pytest.raises(SystemExit) as info:
+        run_batch(tmp_path, data, "binary")
+    assert info.value.code == "error: record 1: carry-in out of range: 255"
+
+
+def test_batch_exits_with_error(tmp_path: pathlib.Path) -> None:
+    with pytest.raises(SystemExit) as info:
+        run_batch(tmp_path, b"1 2 0\n1 2\n")
+    assert info.value.code == "error: line 2: expected 'A B cin', got b'1 2'"
+
+    with pytest.raises(SystemExit) as info:
+        main.batch(argparse.Namespace(
+            input=str(tmp_path / "missing"),
+            output=str(tmp_path / "out"),
+            format="text",
+            quiet=True,
+        ))
+    assert info.value.code.startswith("error: ")
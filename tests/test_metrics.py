@@ -0,0 +1,103 @@
+import pytest
+
+from .utils import register_caps
+from src.circuits import *
+
+
+def test_event_counter() -> None:
+    vdd = VDD()
+    cell = AND2(vdd)
+    i = SignalInterface(cell.i)
+    register_caps(cell.o)
+    vdd.energize()
+
+    with EventCounter(cell) as counter:
+        i.set_signal(0b11)
+        assert counter.count > 0
+        count = counter.count
+        i.set_signal(0b11)
+        assert counter.count == count
+
+    # callbacks are restored
+    i.set_signal(0b00)
+    assert counter.count == count
+    assert cell.o.energized is False
+
+
+def test_event_counter_keeps_circuit_forkable() -> None:
+    vdd = VDD()
+    ksa = KSA16R2Cin(vdd)
+    adder = AdderInterface(ksa)
+    vdd.energize()
+    adder.add(0x1234, 0x4321, 1)
+
+    with EventCounter(ksa) as counter:
+        base = ksa.fork()
+        with base.fork() as fork:
+            assert adder.add(0xffff, 1, 0) == (0, True)
+            assert fork.num_changes() > 0
+        assert adder.get_outputs() == (0x5556, False)
+        assert base.checkpoint() == CircuitState.of(ksa).capture()
+
+        merge = next(c for c in ksa.layers[2] if isinstance(c, PGMergeR2))
+        CircuitEditor(ksa, vdd).replace(merge, PGMergeR2)
+        assert adder.add(0xffff, 0, 1) == (0, True)
+
+    assert counter.count > 0
+
+
+def test_levels() -> None:
+    vdd = VDD()
+    cell = FullAdder(vdd)
+    netlist = Netlist(cell)
+    levels = netlist.levels()
+
+    for n in netlist.inputs():
+        assert levels[n] == 0
+    assert levels[netlist.net(cell.cout)] > levels[netlist.net(cell.i[0])]
+
+
+@pytest.mark.parametrize(
+    "tp", (KSA16R2Cin, BKA16R2Cin, SKA16R2Cin, HCA16R2Cin, RCA16Cin)
+)
+def test_adder_metrics(tp: type) -> None:
+    vdd = VDD()
+    cell = tp(vdd)
+    vdd.energize()
+    metrics = adder_metrics(cell, 20, seed=0)
+
+    assert metrics.name == tp.__name__
+    assert metrics.width == 16
+    assert metrics.num_transistors == len(Netlist(cell).transistors)
+    assert metrics.events_per_addition > 0
+    assert tp.__name__ in str(metrics)
+
+
+def test_adder_metrics_ordering() -> None:
+    def measure(tp: type) -> AdderMetrics:
+        vdd = VDD()
+        cell = tp(vdd)
+        vdd.energize()
+        return adder_metrics(cell, 20, seed=0)
+
+    ksa = measure(KSA32R2Cin)
+    bka = measure(BKA32R2Cin)
+    rca = measure(RCA32Cin)
+
+    # the classic area/depth trade-off
+    assert rca.num_transistors < bka.num_transistors < ksa.num_transistors
+    assert ksa.depth < bka.depth < rca.depth
+
+    report = compare_adders((ksa, bka, rca))
+    assert len(report.splitlines()) == 4
+    assert "KSA32R2Cin" in report
+
+
+def test_adder_metrics_pipelined() -> None:
+    combinational = adder_metrics(KSA16R2Cin(VDD()), 10, seed=0)
+    pipelined = adder_metrics(PKSA16R2Cin(VDD()), 10, seed=0)
+
+    assert combinational.latency == 0
+    assert pipelined.latency == 2
+    assert pipelined.depth < combinational.depth
+    assert pipelined.num_transistors > combinational.num_transistors
@@ -0,0 +1,110 @@
+import pytest
+
+from src.circuits import *
+
+
+@pytest.fixture
+def ksa() -> KSA16R2Cin:
+    return KSA16R2Cin(VDD())
+
+
+def test_names(ksa: KSA16R2Cin) -> None:
+    index = NameIndex(ksa, "ksa")
+    assert index["ksa"] is ksa
+    assert index.name(ksa) == "ksa"
+
+    # ports, and the ports of sub-cells they are shared with
+    assert index["ksa.i0[3]"] is ksa.i0[3]
+    assert index.name(ksa.o[3]) == "ksa.o[3]"
+    assert index.name(ksa.cout) == "ksa.cout"
+
+    # every cell of cell_paths, by its path
+    for path, cell in cell_paths(ksa, "ksa"):
+        assert index[".".join(path)] is cell
+        assert index.name(cell) == ".".join(path)
+
+    # attribute aliases of cells
+    merge = ksa.layers[1][2]
+    assert index["ksa.layers[1][2]"] is merge
+    assert index.name(merge).startswith("ksa.PGMergeR2_")
+    and2 = index.name(merge) + ".AND2_0"
+    assert index[and2 + ".o"] is index[and2].o
+    assert index.via(and2 + ".o") is index[and2].o
+    with pytest.raises(TypeError):
+        index.via(and2)
+
+    # every via, interconnect and binding has a name
+    for v in ksa.components.all_vias():
+        assert index[index.name(v)] is v
+    for x in ksa.components.all_interconnects():
+        assert index[index.name(x)] is x
+    for x in ksa.components.all_bindings():
+        assert index[index.name(x)] is x
+
+    assert "ksa.nothing" not in index
+    assert index.get("ksa.nothing") is None
+    assert len(index) == len(list(index))
+
+
+def test_mapping_ports() -> None:
+    cell = StructuralCell(VDD(), benchmark("c17"))
+    index = NameIndex(cell, "c17")
+
+    assert index["c17.inputs.1"] is cell.inputs["1"]
+    assert index.name(cell.outputs["22"]) == "c17.outputs.22"
+    assert index.glob("c17.outputs.*") == ["c17.outputs.22", "c17.outputs.23"]
+
+    probes = index.probes("c17.inputs.*")
+    assert len(probes) == 5
+
+
+def test_add_and_glob(ksa: KSA16R2Cin) -> None:
+    index = NameIndex(ksa)
+    v = Via()
+    index.add("probe", v)
+    index.add("probe", v)
+    assert index["probe"] is v and index.name(v) == "probe"
+    with pytest.raises(ValueError):
+        index.add("probe", Via())
+
+    outputs = index.glob("KSA16R2Cin.o[[]*]")
+    assert outputs == [f"KSA16R2Cin.o[{i}]" for i in range(16)]
+
+
+def test_probes(ksa: KSA16R2Cin) -> None:
+    index = NameIndex(ksa, "ksa")
+    probes = index.probes("ksa.o[[]*]", "ksa.cout")
+    assert len(probes) == 17
+    assert list(probes)[-1] == "ksa.cout"
+    with pytest.raises(KeyError):
+        index.probes("ksa.nothing*")
+
+    # compiled netlist
+    netlist = Netlist(ksa)
+    assert probes.nets(netlist) == (*netlist.nets(ksa.o), netlist.net(ksa.cout))
+    names = index.net_names(netlist)
+    assert names[netlist.net(ksa.cout)] == "ksa.cout"
+
+    inputs = (netlist.nets(ksa.i0), netlist.nets(ksa.i1))
+    assignment = {n: 1 for n in inputs[0]}
+    values = probes.values(netlist, netlist.evaluate(assignment))
+    assert values["ksa.o[0]"] == 1 and values["ksa.cout"] == 0
+
+    # waveforms
+    simulator = TimedSimulator(netlist)
+    simulator.apply_signals(inputs, (0xffff, 1))
+    waveforms = probes.waveforms(simulator)
+    assert waveforms["ksa.cout"][0] == (simulator.start, 0)
+    assert waveforms["ksa.cout"][-1][1] == 1
+    for name, n in zip(probes, probes.nets(netlist)):
+        assert waveforms[name][-1][1] == simulator.values[n]
+
+    # live circuit
+    vdd = VDD()
+    ksa = KSA16R2Cin(vdd)
+    adder = AdderInterface(ksa)
+    vdd.energize()
+    probes = NameIndex(ksa, "ksa").probes("ksa.o[[]0]", "ksa.cout")
+    adder.add(0xffff, 1, 0)
+    assert probes.sample() == {"ksa.o[0]": False, "ksa.cout": True}
+    assert probes.get_signal() == 0b10
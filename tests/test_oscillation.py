@@ -0,0 +1,151 @@
+import pytest
+
+from .utils import energized_adder
+from src.circuits import *
+from src.circuits import core
+
+
+class RingOscillator(Cell):
+    """A NAND2 with its output fed back to an input (oscillates while
+    ``en`` is high).
+
+    """
+
+    __slots__ = ("en", "o")
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+
+        nand2 = NAND2(vdd)
+        o = Via()
+        cmp.add(nand2, o)
+        cmp.add(Interconnect(o, nand2.o, nand2.i[1]))
+
+        self.en = nand2.i[0]
+        self.o = o
+        self.components = cmp.to_components()
+
+
+@pytest.fixture
+def ring() -> tuple[RingOscillator, SignalInterface]:
+    vdd = VDD()
+    cell = RingOscillator(vdd)
+    en = SignalInterface((cell.en,))
+    SignalInterface((cell.o,))
+    vdd.energize()
+    return cell, en
+
+
+def test_oscillation_error(ring: tuple[RingOscillator, SignalInterface]) -> None:
+    cell, en = ring
+    assert cell.o.energized
+
+    state = CircuitState(cell)
+    base = state.capture()
+    with PropagationGuard() as guard:
+        with pytest.raises(OscillationError) as info:
+            en.set_signal(1)
+
+    vias = {id(v) for v in cell.components.all_vias()}
+    assert info.value.vias
+    assert all(id(v) in vias for v in info.value.vias)
+    assert info.value.events == guard.events
+    assert core._guard is None
+
+    # the circuit works again once restored
+    state.restore(base)
+    en.set_signal(0)
+    assert cell.o.energized
+
+
+def test_unguarded_oscillation(
+    ring: tuple[RingOscillator, SignalInterface]
+) -> None:
+    _, en = ring
+    with pytest.raises(RecursionError):
+        en.set_signal(1)
+
+
+def test_event_budget() -> None:
+    adder = energized_adder()
+
+    with PropagationGuard() as guard:
+        assert adder.add(0xffff, 1, 0) == (0, True)
+        assert 0 < guard.events
+        with PropagationGuard(max_events=5) as inner:
+            with pytest.raises(OscillationError) as info:
+                adder.add(0, 0, 0)
+        assert core._guard is guard
+
+    # no loop, just too many events
+    assert info.value.vias == ()
+    assert inner.events == 6
+
+
+def test_converging_loop() -> None:
+    vdd = VDD()
+    latch = SRLatch(vdd)
+    s, r = SignalInterface((latch.s,)), SignalInterface((latch.r,))
+    SignalInterface((latch.q,))
+    SignalInterface((latch.qn,))
+
+    with PropagationGuard(max_events=1000):
+        vdd.energize()
+        s.set_signal(1)
+        s.set_signal(0)
+        assert latch.q.energized and not latch.qn.energized
+        r.set_signal(1)
+        r.set_signal(0)
+        assert not latch.q.energized and latch.qn.energized
+
+
+def test_combinational_loop_error() -> None:
+    cell = RingOscillator(VDD())
+    with pytest.raises(CombinationalLoopError) as info:
+        Netlist(cell)
+    assert isinstance(info.value, ValueError)
+
+    assert len(info.value.nets) == len(info.value.vias) >= 1
+    assert len(set(info.value.nets)) == len(info.value.nets)
+
+    vias = {id(v) for v in cell.components.all_vias()}
+    assert all(id(v) in vias for v in info.value.vias)
+
+    # cutting the loop open compiles
+    netlist = Netlist(cell, exclude=cell.components.cells)
+    assert netlist.transistors == ()
+
+
+def test_inverter_ring_loop() -> None:
+    vdd = VDD()
+    inverters = [NOT(vdd) for _ in range(3)]
+    for a, b in zip(inverters, inverters[1:] + inverters[:1]):
+        Binding(a.o, b.i)
+
+    with pytest.raises(CombinationalLoopError) as info:
+        Netlist(*inverters)
+    assert len(info.value.nets) == 3
+
+    # each via of the loop is an inverter's output (and the next input)
+    outputs = {id(n.o) for n in inverters} | {id(n.i) for n in inverters}
+    assert all(id(v) in outputs for v in info.value.vias)
+
+
+@pytest.mark.parametrize("cls", (RCA32Cin, RCA64Cin))
+def test_deep_propagation(cls: type) -> None:
+    adder = energized_adder(cls)
+
+    # a carry through every bit nests deeper than max_depth, but never
+    # passes a via twice
+    with PropagationGuard() as guard:
+        assert adder.add(adder.mask, 0, 1) == (0, True)
+        assert guard.events > guard.max_depth
+
+
+def test_event_budget_message() -> None:
+    adder = energized_adder()
+
+    with PropagationGuard(max_events=5):
+        with pytest.raises(OscillationError) as info:
+            adder.add(0xffff, 1, 0)
+    assert "feedback loop" not in str(info.value)
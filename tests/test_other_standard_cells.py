@@ -1,3 +1,5 @@
+import itertools
+
 import pytest
 
 from .utils import CellBuilder, register_caps, IN2, IN3, IN4
@@ -193,3 +195,143 @@ def test_pg_half_merge_r2(
     assert pg_half_merge_r2.o.energized == expected
     assert pg_half_merge_r2_2.o.energized == expected
     assert pg_half_merge_r2_2.o.energized == expected
+
+
+def _merge_rn(tp: type) -> Cell:
+    with CellBuilder(tp) as cell:
+        for port in cell.i:
+            register_caps(*(port if isinstance(port, tuple) else (port,)))
+        register_caps(*(cell.o if isinstance(cell.o, tuple) else (cell.o,)))
+
+    return cell
+
+
+@pytest.mark.parametrize(
+    "tp",
+    (PGMergeR3, PGMergeR4, PGHalfMergeR3, PGHalfMergeR4, pg_merge(5)),
+)
+def test_pg_merge_rn(tp: type) -> None:
+    cell = _merge_rn(tp)
+    ports = tuple(p if isinstance(p, tuple) else (None, p) for p in cell.i)
+
+    for bits in itertools.product((False, True), repeat=2 * len(ports)):
+        pgs = tuple(zip(bits[::2], bits[1::2]))
+        if tp.half:
+            pgs = (*pgs[:-1], (False, pgs[-1][1]))
+
+        # calculate the expected output(s), from the highest group down
+        expected_p = True
+        expected_g = False
+        for p, g in pgs:
+            expected_g = expected_g or (expected_p and g)
+            expected_p = expected_p and p
+
+        # set input(s)
+        for (p_via, g_via), (p, g) in zip(ports, pgs):
+            if p_via is not None:
+                p_via.set_state(Cap, p)
+            g_via.set_state(Cap, g)
+
+        # check output(s)
+        if tp.half:
+            assert cell.o.energized == expected_g
+        else:
+            assert cell.o[0].energized == expected_p
+            assert cell.o[1].energized == expected_g
+
+
+def test_pg_merge_factory() -> None:
+    assert pg_merge(3) is PGMergeR3
+    assert pg_merge(4, True) is PGHalfMergeR4
+    assert pg_merge(6) is pg_merge(6)
+    assert pg_merge(6).__name__ == "PGMergeR6"
+    assert pg_merge(6, True).__name__ == "PGHalfMergeR6"
+
+    with pytest.raises(ValueError):
+        pg_merge(2)
+
+
+def _sr_latch() -> SRLatch:
+    with CellBuilder(SRLatch) as cell:
+        register_caps(cell.s, cell.r, cell.q, cell.qn)
+
+    return cell
+
+
+def _d_latch() -> DLatch:
+    with CellBuilder(DLatch) as cell:
+        register_caps(cell.d, cell.e, cell.q, cell.qn)
+
+    return cell
+
+
+def _dff() -> DFF:
+    with CellBuilder(DFF) as cell:
+        register_caps(cell.d, cell.clk, cell.clkn, cell.q, cell.qn)
+
+    return cell
+
+
+def test_sr_latch() -> None:
+    cell = _sr_latch()
+
+    for s, r, expected in (
+        (True, False, True),
+        (False, False, True),
+        (False, True, False),
+        (False, False, False),
+        (True, False, True),
+    ):
+        cell.s.set_state(Cap, s)
+        cell.r.set_state(Cap, r)
+
+        assert cell.q.energized == expected
+        assert cell.qn.energized == (not expected)
+
+
+def test_d_latch() -> None:
+    cell = _d_latch()
+
+    # transparent
+    cell.e.set_state(Cap, True)
+    for d in (True, False, True):
+        cell.d.set_state(Cap, d)
+        assert cell.q.energized == d
+        assert cell.qn.energized == (not d)
+
+    # hold
+    cell.e.set_state(Cap, False)
+    cell.d.set_state(Cap, False)
+    assert cell.q.energized
+    assert not cell.qn.energized
+
+
+@pytest.mark.parametrize("d", (False, True))
+def test_dff(d: bool) -> None:
+    cell = _dff()
+
+    def rise() -> None:
+        cell.clkn.set_state(Cap, False)
+        cell.clk.set_state(Cap, True)
+
+    def fall() -> None:
+        cell.clk.set_state(Cap, False)
+        cell.clkn.set_state(Cap, True)
+
+    fall()
+    cell.d.set_state(Cap, not d)
+    rise()
+    fall()
+    assert cell.q.energized == (not d)
+
+    # only captured on the rising edge
+    cell.d.set_state(Cap, d)
+    assert cell.q.energized == (not d)
+    rise()
+    assert cell.q.energized == d
+    assert cell.qn.energized == (not d)
+
+    cell.d.set_state(Cap, not d)
+    assert cell.q.energized == d
+    fall()
+    assert cell.q.energized == d
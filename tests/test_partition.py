@@ -0,0 +1,78 @@
+import concurrent.futures
+import random
+
+import pytest
+
+from src.circuits import *
+
+
+@pytest.mark.parametrize("num_partitions", (1, 2, 3, 8))
+def test_partitioned_netlist(num_partitions: int) -> None:
+    ksa = KSA16R2Cin(VDD())
+    netlist = Netlist(ksa)
+    outputs = (*netlist.nets(ksa.o), netlist.net(ksa.cout))
+    inputs = (
+        netlist.nets(ksa.i0), netlist.nets(ksa.i1), (netlist.net(ksa.cin),)
+    )
+
+    with PartitionedNetlist(
+        netlist, num_partitions, outputs, parallel=True
+    ) as partitioned:
+        assert len(partitioned.partitions) == num_partitions
+        assert partitioned.duplication >= 1
+        assert all(partitioned.owner[n] >= 0 for n in outputs)
+
+        rng = random.Random(num_partitions)
+        for _ in range(20):
+            a, b = rng.getrandbits(16), rng.getrandbits(16)
+            assert partitioned.evaluate_signals(
+                inputs, (a, b, 1), (outputs,)
+            ) == (a + b + 1,)
+
+        # lanes
+        assignment = {n: rng.getrandbits(64) for n in netlist.inputs()}
+        expected = netlist.evaluate(assignment, (1 << 64) - 1)
+        values = partitioned.evaluate(assignment, (1 << 64) - 1)
+        assert [values[n] for n in outputs] == [expected[n] for n in outputs]
+
+
+def test_independent_partitions() -> None:
+    vdd = VDD()
+    adders = (KSA16R2Cin(vdd), RCA16Cin(vdd))
+    netlist = Netlist(*adders)
+    outputs = [
+        (*netlist.nets(a.o), netlist.net(a.cout)) for a in adders
+    ]
+
+    executor = concurrent.futures.ThreadPoolExecutor(2)
+    partitioned = PartitionedNetlist(
+        netlist, 2, outputs[0] + outputs[1], parallel=True, executor=executor
+    )
+    assert partitioned.duplication == 1
+    assert {partitioned.owner[n] for n in outputs[0]} == {0}
+    assert {partitioned.owner[n] for n in outputs[1]} == {1}
+
+    assignment = {n: 1 for n in netlist.inputs()}
+    assert partitioned.evaluate(assignment) == netlist.evaluate(assignment)
+
+    # the executor is not shut down with the partitioned netlist
+    partitioned.close()
+    assert executor.submit(int).result() == 0
+    executor.shutdown()
+
+
+def test_fallback() -> None:
+    ksa = KSA16R2Cin(VDD())
+    netlist = Netlist(ksa)
+    partitioned = PartitionedNetlist(netlist, 4, parallel=False)
+    assert partitioned._executor is None
+
+    assignment = {n: 1 for n in netlist.inputs()}
+    assert partitioned.evaluate(assignment) == netlist.evaluate(assignment)
+    assert partitioned._executor is None
+
+    assert isinstance(gil_enabled(), bool)
+    assert PartitionedNetlist(netlist).parallel is not gil_enabled()
+
+    with pytest.raises(ValueError):
+        PartitionedNetlist(netlist, 0)
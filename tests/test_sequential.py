@@ -0,0 +1,128 @@
+import random
+
+import pytest
+
+from .utils import register_caps
+from src.circuits import *
+
+
+class Counter4(Cell):
+    """A 4-bit counter with an enable input."""
+
+    __slots__ = ("en", "clk", "clkn", "q", "registers")
+
+    en: Via
+    clk: Via
+    clkn: Via
+    q: tuple[Via, ...]
+    registers: tuple[DFF, ...]
+
+    def _init(self, vdd: VDD) -> None:
+        cmp = TempComponents()
+
+        dffs = tuple(DFF(vdd) for _ in range(4))
+        has = tuple(HalfAdder(vdd) for _ in range(4))
+        en = Via()
+        clk = Via()
+        clkn = Via()
+        q = tuple(Via() for _ in range(4))
+        cmp.add(*dffs, *has, en, clk, clkn, *q)
+
+        cmp.add(
+            Interconnect(clk, *(dff.clk for dff in dffs)),
+            Interconnect(clkn, *(dff.clkn for dff in dffs)),
+            Binding(en, has[0].i[1]),
+        )
+        for k, (dff, ha) in enumerate(zip(dffs, has)):
+            cmp.add(
+                Interconnect(dff.q, ha.i[0], q[k]),
+                Binding(ha.s, dff.d),
+            )
+            if k < 3:
+                cmp.add(Binding(ha.c, has[k + 1].i[1]))
+        has[3].c.register(Cap())
+        for dff in dffs:
+            dff.qn.register(Cap())
+
+        self.en = en
+        self.clk = clk
+        self.clkn = clkn
+        self.q = q
+        self.registers = dffs
+        self.components = cmp.to_components()
+
+
+@pytest.fixture
+def counter() -> tuple[Counter4, Clock, SignalInterface]:
+    vdd = VDD()
+    cell = Counter4(vdd)
+    clock = Clock(cell.clk, cell.clkn)
+    register_caps(cell.en)
+    q = SignalInterface(cell.q)
+    vdd.energize()
+
+    return cell, clock, q
+
+
+def test_clock(counter: tuple[Counter4, Clock, SignalInterface]) -> None:
+    cell, clock, q = counter
+    cell.en.set_state(Cap, True)
+
+    start = q.get_signal()
+    clock.tick(5)
+    assert clock.cycles == 5
+    assert not clock.level
+    assert q.get_signal() == (start + 5) % 16
+
+    # disabled
+    cell.en.set_state(Cap, False)
+    clock.tick(3)
+    assert q.get_signal() == (start + 5) % 16
+
+    clock.rise()
+    assert clock.level
+
+
+def test_cycle_simulator(
+    counter: tuple[Counter4, Clock, SignalInterface]
+) -> None:
+    cell, clock, q = counter
+    sim = CycleSimulator(cell, ((cell.en,),), (cell.q,))
+    assert set(map(id, sim.registers)) == set(map(id, cell.registers))
+
+    sim.read_state()
+    assert sim.state == sum(
+        r.q.energized << k for k, r in enumerate(cell.registers)
+    )
+
+    rng = random.Random(0)
+    for _ in range(40):
+        en = rng.getrandbits(1)
+        cell.en.set_state(Cap, not not en)
+        (expected,) = sim.step(en)
+        assert expected == q.get_signal()
+        clock.tick()
+
+    assert sim.cycles == 40
+    assert sim.step(0) == (q.get_signal(),)
+
+
+def test_cycle_simulator_run(
+    counter: tuple[Counter4, Clock, SignalInterface]
+) -> None:
+    cell, _, _ = counter
+    sim = CycleSimulator(cell, ((cell.en,),), (cell.q,), cell.registers)
+    sim.state = 0
+
+    outputs = sim.run([(1,)] * 20)
+    assert [o for (o,) in outputs] == [k % 16 for k in range(20)]
+    assert sim.state == 20 % 16
+
+
+def test_cycle_simulator_loop() -> None:
+    vdd = VDD()
+    latch = SRLatch(vdd)
+    register_caps(latch.s, latch.r, latch.q, latch.qn)
+
+    with pytest.raises(ValueError):
+        CycleSimulator(latch, ((latch.s, latch.r),), ((latch.q,),))
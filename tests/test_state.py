@@ -0,0 +1,145 @@
+import pytest
+
+from .utils import energized_adder
+from src.circuits import *
+
+
+@pytest.fixture
+def ksa_16r2() -> tuple[AdderInterface, CircuitState]:
+    adder = energized_adder()
+    return adder, CircuitState(adder.cell)
+
+
+def test_reachable_covers_components(
+    ksa_16r2: tuple[AdderInterface, CircuitState]
+) -> None:
+    adder, state = ksa_16r2
+    components = adder.cell.components
+
+    assert len(state.reachable.vias) == components.num_vias()
+    assert len(state.reachable.interconnects) == components.num_interconnects()
+    assert len(state.reachable.bindings) >= components.num_bindings()
+    assert len(state.reachable.finfets) == sum(
+        isinstance(c, FinFET) for c in components.all_cells()
+    )
+    assert len(state.reachable.rails) == 1
+
+
+def test_restore_checkpoint(
+    ksa_16r2: tuple[AdderInterface, CircuitState]
+) -> None:
+    adder, state = ksa_16r2
+
+    adder.add(0x1234, 0x4321, 1)
+    base = state.capture()
+
+    assert adder.add(0xffff, 1, 0) == (0, True)
+    assert state.capture() != base
+
+    state.restore(base)
+    assert state.capture() == base
+    assert adder.get_outputs() == (0x5556, False)
+
+    # propagation continues correctly from the restored state
+    assert adder.add(0xffff, 0, 1) == (0, True)
+    assert adder.add(0x1234, 0x4321, 1) == (0x5556, False)
+    assert state.capture() == base
+
+
+def test_restore_rejects_foreign_checkpoint(
+    ksa_16r2: tuple[AdderInterface, CircuitState]
+) -> None:
+    adder, state = ksa_16r2
+
+    with pytest.raises(ValueError):
+        CircuitState(adder.cell).restore(state.capture())
+
+
+def test_forks_are_independent(
+    ksa_16r2: tuple[AdderInterface, CircuitState]
+) -> None:
+    adder, _ = ksa_16r2
+
+    adder.add(0x1234, 0x4321, 1)
+    base = adder.cell.fork()
+    fork_a = base.fork()
+    fork_b = base.fork()
+
+    with fork_a:
+        assert adder.add(0xffff, 1, 0) == (0, True)
+
+    # the parent state is restored when the fork is exited
+    assert adder.get_outputs() == (0x5556, False)
+
+    with fork_b:
+        assert adder.get_outputs() == (0x5556, False)
+        assert adder.add(0x00ff, 0x0f00, 0) == (0x0fff, False)
+
+    with fork_a:
+        assert adder.get_outputs() == (0, True)
+        child = fork_a.fork()
+        assert adder.add(0x0001, 0x0001, 1) == (0x0003, False)
+
+    with child:
+        assert adder.get_outputs() == (0, True)
+        assert child.num_changes() > 0
+
+    with fork_b:
+        assert adder.get_outputs() == (0x0fff, False)
+
+        # propagation continues correctly in the fork
+        assert adder.add(0x1234, 0x4321, 1) == (0x5556, False)
+        assert fork_b.num_changes() == 0
+
+    assert adder.get_outputs() == (0x5556, False)
+    assert base.checkpoint() == CircuitState.of(adder.cell).capture()
+
+
+def test_fork_deltas_track_writes(
+    ksa_16r2: tuple[AdderInterface, CircuitState]
+) -> None:
+    adder, state = ksa_16r2
+    base = state.fork()
+    fork = base.fork()
+    other = AdderInterface(KSA16R2Cin(VDD()))
+
+    with fork:
+        for a, b, c in ((0xffff, 1, 0), (0x1234, 0x4321, 1), (3, 5, 0)):
+            adder.add(a, b, c)
+            other.add(a, b, c)
+            assert fork.num_changes() > 0
+            assert fork.fork().checkpoint() == state.capture()
+
+        # the delta only covers the writes that still differ
+        adder.add(0, 0, 0)
+        assert fork.num_changes() == 0
+
+        # restoring a checkpoint bypasses propagation
+        state.restore(base.checkpoint())
+        adder.add(0xffff, 1, 0)
+        state.restore(base.checkpoint())
+        assert fork.num_changes() == 0
+
+    assert adder.get_outputs() == (0, False)
+
+
+def test_fork_only_logs_own_writes(
+    ksa_16r2: tuple[AdderInterface, CircuitState]
+) -> None:
+    adder, state = ksa_16r2
+    vdd = VDD()
+    other = AdderInterface(KSA16R2Cin(vdd))
+    vdd.energize()
+    fork = state.fork()
+
+    other.add(0xffff, 1, 0)
+    assert not state._touched
+    assert all(v.log is None for v in Reachable.from_roots(other.cell).vias)
+
+    adder.add(0xffff, 1, 0)
+    assert state._touched
+
+    # the log is dropped with the last fork
+    del fork
+    assert state._touched is None
+    assert all(v.log is None for v in state.reachable.vias)
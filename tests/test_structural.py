@@ -0,0 +1,274 @@
+import functools
+import itertools
+import operator
+import random
+
+import pytest
+
+from src.circuits import *
+
+
+def _truth_table(circuit: Circuit) -> list[tuple[int, ...]]:
+    cell = StructuralCell(VDD(), circuit)
+    netlist = Netlist(cell)
+    inputs = netlist.nets(cell.inputs[n] for n in circuit.inputs)
+    outputs = netlist.nets(cell.outputs[n] for n in circuit.outputs)
+    table = list()
+    for bits in itertools.product((0, 1), repeat=len(inputs)):
+        values = netlist.evaluate(dict(zip(inputs, bits)))
+        table.append(tuple(values[n] for n in outputs))
+    return table
+
+
+def _reference(circuit: Circuit) -> list[tuple[int, ...]]:
+    functions = {
+        "AND": lambda *i: all(i),
+        "NAND": lambda *i: not all(i),
+        "OR": lambda *i: any(i),
+        "NOR": lambda *i: not any(i),
+        "XOR": lambda *i: functools.reduce(operator.xor, i),
+        "XNOR": lambda *i: not functools.reduce(operator.xor, i),
+        "NOT": lambda i: not i,
+        "BUF": lambda i: i,
+        "ONE": lambda: 1,
+        "ZERO": lambda: 0,
+    }
+    table = list()
+    for bits in itertools.product((0, 1), repeat=len(circuit.inputs)):
+        values = dict(zip(circuit.inputs, bits))
+        pending = list(circuit.gates)
+        while pending:
+            g = pending.pop(0)
+            if all(i in values for i in g.inputs):
+                values[g.output] = int(functions[g.kind](
+                    *(values[i] for i in g.inputs)
+                ))
+            else:
+                pending.append(g)
+        table.append(tuple(values[n] for n in circuit.outputs))
+    return table
+
+
+def test_c17() -> None:
+    c17 = benchmark("c17")
+    assert c17.name == "c17"
+    assert c17.inputs == ("1", "2", "3", "6", "7")
+    assert c17.outputs == ("22", "23")
+    assert [g.kind for g in c17.gates] == ["NAND"] * 6
+    assert _truth_table(c17) == _reference(c17)
+
+    # live circuit
+    vdd = VDD()
+    cell = StructuralCell(vdd, c17)
+    inputs = SignalInterface(cell.inputs.values())
+    outputs = SignalInterface(cell.outputs.values())
+    vdd.energize()
+    for k, expected in enumerate(_reference(c17)):
+        inputs.set_signal(sum(b << i for i, b in enumerate(
+            (k >> (4 - i)) & 1 for i in range(5)
+        )))
+        assert outputs.get_signal() == expected[0] | expected[1] << 1
+
+
+def test_round_trip() -> None:
+    c17 = benchmark("c17")
+    assert parse_bench(c17.to_bench(), "c17") == c17
+    assert parse_blif(c17.to_blif()) == c17
+
+
+def test_wide_gates() -> None:
+    gates = (
+        Gate("AND", "and5", ("a", "b", "c", "d", "e")),
+        Gate("NAND", "nand3", ("a", "b", "c")),
+        Gate("OR", "or3", ("c", "d", "e")),
+        Gate("NOR", "nor4", ("a", "b", "c", "d")),
+        Gate("XOR", "xor5", ("a", "b", "c", "d", "e")),
+        Gate("XNOR", "xnor3", ("a", "c", "e")),
+        Gate("NAND", "nand1", ("b",)),
+        Gate("AND", "and1", ("d",)),
+        Gate("BUF", "buf", ("and5",)),
+        Gate("NOT", "not", ("xor5",)),
+        Gate("ONE", "one"),
+        Gate("ZERO", "zero"),
+        Gate("AND", "mixed", ("one", "a", "nand3")),
+        Gate("OR", "or_zero", ("zero", "b")),
+    )
+    circuit = Circuit(
+        "wide",
+        ("a", "b", "c", "d", "e"),
+        (*(g.output for g in gates), "a"),
+        gates,
+    )
+    assert _truth_table(circuit) == _reference(circuit)
+    assert _truth_table(parse_blif(circuit.to_blif())) == _reference(circuit)
+    with pytest.raises(ValueError):
+        circuit.to_bench()
+
+
+def test_blif_covers() -> None:
+    circuit = parse_blif("""
+# a multiplexer and other covers
+.model covers
+.inputs s a \\
+    b
+.outputs mux xor xnor nand off one zero
+.names s a b mux
+01- 1
+1-1 1
+.names a b xor
+10 1
+01 1
+.names a b xnor
+01 0
+10 0
+.names a b nand
+11 0
+.names s a off
+0- 0
+-1 0
+.names one
+1
+.names zero
+.end
+""")
+    assert circuit.name == "covers"
+    assert circuit.inputs == ("s", "a", "b")
+    kinds = {g.output: g.kind for g in circuit.gates}
+    assert kinds["xor"] == "XOR"
+    assert kinds["xnor"] == "XNOR"
+    assert kinds["nand"] == "NAND"
+    assert kinds["one"] == "ONE" and kinds["zero"] == "ZERO"
+
+    table = _truth_table(circuit)
+    assert table == _reference(circuit)
+    for (s, a, b), row in zip(itertools.product((0, 1), repeat=3), table):
+        assert row == (
+            b if s else a, a ^ b, 1 - (a ^ b), 1 - (a & b), s & (1 - a), 1, 0
+        )
+
+
+def test_array_multiplier() -> None:
+    circuit = benchmark("mult16")
+    assert circuit == array_multiplier(16)
+    assert len(circuit.gates) == 1440
+    assert parse_blif(circuit.to_blif()) == circuit
+
+    cell = StructuralCell(VDD(), circuit)
+    netlist = Netlist(cell)
+    assert len(netlist.transistors) == 4480
+
+    inputs = (
+        netlist.nets(cell.inputs[f"a{i}"] for i in range(16)),
+        netlist.nets(cell.inputs[f"b{i}"] for i in range(16)),
+    )
+    outputs = (netlist.nets(cell.outputs[f"p{i}"] for i in range(32)),)
+    rng = random.Random(0)
+    for a, b in (
+        (0, 0), (0xffff, 0xffff), (0xffff, 1),
+        *((rng.getrandbits(16), rng.getrandbits(16)) for _ in range(50)),
+    ):
+        assert netlist.evaluate_signals(inputs, (a, b), outputs) == (a * b,)
+
+
+@pytest.mark.parametrize("width", (2, 3, 5))
+def test_small_array_multipliers(width: int) -> None:
+    circuit = array_multiplier(width)
+    table = _truth_table(circuit)
+    assert table == _reference(circuit)
+
+    # inputs are ordered a0.. then b0.., the first varying slowest
+    for k, row in enumerate(table):
+        bits = [(k >> (2 * width - 1 - i)) & 1 for i in range(2 * width)]
+        a = sum(b << i for i, b in enumerate(bits[:width]))
+        b = sum(b << i for i, b in enumerate(bits[width:]))
+        assert sum(p << i for i, p in enumerate(row)) == a * b
+
+
+def test_array_multiplier_invalid_width() -> None:
+    with pytest.raises(ValueError):
+        array_multiplier(1)
+
+
+@pytest.mark.parametrize("cls", (KSA16R2Cin, RCA16Cin, KSA16R4Cin))
+def test_export_adder(cls: type) -> None:
+    adder = cls(VDD())
+    circuit = Circuit.from_cell(
+        adder,
+        {"i0": adder.i0, "i1": adder.i1, "cin": adder.cin},
+        {"o": adder.o, "cout": adder.cout},
+    )
+    assert circuit.name == cls.__name__
+    assert circuit.inputs[:2] == ("i0[0]", "i0[1]")
+    assert circuit.outputs[-1] == "cout"
+    assert parse_bench(circuit.to_bench(), circuit.name) == circuit
+    assert parse_blif(circuit.to_blif()) == circuit
+
+    # the imported adder has the same transistors and adds
+    cell = StructuralCell(VDD(), circuit)
+    netlist = Netlist(cell)
+    assert len(netlist.transistors) == len(Netlist(adder).transistors)
+
+    inputs = (
+        netlist.nets(cell.inputs[f"i0[{i}]"] for i in range(16)),
+        netlist.nets(cell.inputs[f"i1[{i}]"] for i in range(16)),
+        (netlist.net(cell.inputs["cin"]),),
+    )
+    outputs = (netlist.nets(
+        (*(cell.outputs[f"o[{i}]"] for i in range(16)), cell.outputs["cout"])
+    ),)
+    rng = random.Random(0)
+    for _ in range(50):
+        a, b, c = rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(1)
+        assert netlist.evaluate_signals(inputs, (a, b, c), outputs) == (
+            a + b + c,
+        )
+
+
+def test_export_errors() -> None:
+    with pytest.raises(ValueError):
+        latch = SRLatch(VDD())
+        Circuit.from_cell(latch, {"s": latch.s, "r": latch.r}, {"q": latch.q})
+
+    vdd = VDD()
+    finfet = PTypeFinFET()
+    vdd.register(finfet.source)
+    with pytest.raises(ValueError):
+        Circuit.from_cell(finfet, {"g": finfet.gate}, {"d": finfet.drain})
+
+
+@pytest.mark.parametrize("text", (
+    "INPUT(a)\nOUTPUT(b)\nb = DFF(a)\n",
+    "INPUT(a)\nOUTPUT(b)\nb = NAND(a, c)\n",
+    "INPUT(a)\nOUTPUT(b)\nb = NOT(a)\nb = NOT(a)\n",
+    "INPUT(a)\nOUTPUT(b)\nb = NOT(a, a)\n",
+    "INPUT(a)\nOUTPUT(b)\nb NOT a\n",
+    "INPUT(a)\nOUTPUT(b)\nOUTPUT(b)\nb = NOT(a)\n",
+))
+def test_invalid_bench(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_bench(text)
+
+
+@pytest.mark.parametrize("text", (
+    ".model m\n.inputs a\n.outputs b\n.latch a b 0\n.end\n",
+    ".model m\n.inputs a\n.outputs b\n.names a b\n1 1\n0 0\n.end\n",
+    ".model m\n.inputs a\n.outputs b\n.names a b\n11 1\n.end\n",
+    ".model m\n.inputs a\n.outputs b\n1 1\n.end\n",
+))
+def test_invalid_blif(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_blif(text)
+
+
+def test_read_circuit(tmp_path) -> None:
+    c17 = benchmark("c17")
+    (tmp_path / "c17.blif").write_text(c17.to_blif())
+    (tmp_path / "c17.bench").write_text(c17.to_bench())
+    (tmp_path / "c17.v").write_text("")
+
+    assert read_circuit(tmp_path / "c17.blif") == c17
+    assert read_circuit(tmp_path / "c17.bench") == c17
+    with pytest.raises(ValueError):
+        read_circuit(tmp_path / "c17.v")
+    with pytest.raises(FileNotFoundError):
+        benchmark("c0")
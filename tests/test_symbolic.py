@@ -0,0 +1,41 @@
+import pytest
+
+from src.circuits import *
+
+
+def test_bdd_canonical() -> None:
+    bdd = BDD()
+    a, b = bdd.var(0), bdd.var(1)
+
+    # de morgan
+    assert bdd.not_(bdd.and_(a, b)) == bdd.or_(bdd.not_(a), bdd.not_(b))
+    assert bdd.xor(a, a) == BDD.FALSE
+    assert bdd.satisfy(BDD.FALSE) is None
+    assert bdd.satisfy(bdd.and_(a, bdd.not_(b))) == {0: True, 1: False}
+
+
+@pytest.mark.parametrize("tp", (KSA16R2Cin, KSA32R2Cin, KSA64R2Cin))
+def test_ksa_equivalence(tp: type) -> None:
+    vdd = VDD()
+    assert check_adder(tp(vdd))
+
+
+def test_counterexample() -> None:
+    vdd = VDD()
+    ksa = KSA16R2Cin(vdd)
+    netlist = Netlist(ksa)
+
+    # break an internal carry: the sum xor input of bit 9
+    net = netlist.net(ksa.layers[-1][9].i[1])
+    result = check_adder(ksa, netlist, overrides={net: BDD.FALSE})
+    assert not result
+    assert result.output == "o[9]"
+
+    # the counterexample really does fail with the equivalent fault
+    sim = FaultSimulator(ksa, (ksa.i0, ksa.i1, (ksa.cin,)), (ksa.o, (ksa.cout,)))
+    i0, i1, cin = result.counterexample
+    total = i0 + i1 + cin
+    assert sim.evaluate(result.counterexample) == (total & 0xffff, total >> 16)
+    assert sim.evaluate(
+        result.counterexample, Fault("net", net, False)
+    ) != (total & 0xffff, total >> 16)
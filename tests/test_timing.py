@@ -0,0 +1,193 @@
+import random
+
+import pytest
+
+from src.circuits import *
+
+
+@pytest.fixture(scope="module")
+def ksa() -> tuple[KSA16R2Cin, Netlist]:
+    cell = KSA16R2Cin(VDD())
+    return cell, Netlist(cell)
+
+
+def _ports(cell: KSA16R2Cin, netlist: Netlist):
+    inputs = (netlist.nets(cell.i0), netlist.nets(cell.i1), (netlist.net(cell.cin),))
+    outputs = (*netlist.nets(cell.o), netlist.net(cell.cout))
+    return inputs, outputs
+
+
+@pytest.mark.parametrize("seed", (0, 1))
+def test_timed_simulator(seed: int, ksa: tuple[KSA16R2Cin, Netlist]) -> None:
+    cell, netlist = ksa
+    inputs, outputs = _ports(cell, netlist)
+    rng = random.Random(seed)
+    delays = (
+        None if not seed
+        else [rng.randint(1, 40) for _ in netlist.transistors]
+    )
+    sim = TimedSimulator(netlist, delays)
+    depth = max(netlist.levels())
+
+    for _ in range(50):
+        a, b, c = rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(1)
+        settled = sim.apply_signals(inputs, (a, b, c))
+
+        # same result as the zero-delay evaluation
+        assert sim.signal(outputs) == a + b + c
+        assert max(sim.settle_times(outputs)) <= settled
+        if delays is None:
+            assert settled <= depth
+
+        # the critical path accounts for the settle time of each output
+        for n, time in zip(outputs, sim.settle_times(outputs)):
+            path = sim.critical_path(n)
+            assert sum(sim.delays[t] for t in path) == time
+            if path:
+                assert netlist.transistors[path[-1]][2] == n
+
+    assert sim.num_events > 0
+
+
+def test_timed_simulator_reset(ksa: tuple[KSA16R2Cin, Netlist]) -> None:
+    cell, netlist = ksa
+    inputs, outputs = _ports(cell, netlist)
+    sim = TimedSimulator(netlist)
+
+    assert sim.apply_signals(inputs, (0, 0, 0)) == 0
+    assert sim.apply_signals(inputs, (0xffff, 0, 1)) > 0
+    assert sim.signal(outputs) == 0x10000
+
+    sim.reset()
+    assert sim.signal(outputs) == 0
+    assert sim.settle_times(outputs) == [0] * len(outputs)
+    assert sim.apply_signals(inputs, (1, 2, 0)) > 0
+    assert sim.signal(outputs) == 3
+
+
+def test_interconnect_delay(ksa: tuple[KSA16R2Cin, Netlist]) -> None:
+    cell, netlist = ksa
+    inputs, _ = _ports(cell, netlist)
+    fast = TimedSimulator(netlist)
+    slow = TimedSimulator(netlist, finfet_delay=3, interconnect_delay=2)
+
+    assert set(slow.delays) == {3, 5}
+    assert (
+        slow.apply_signals(inputs, (0xffff, 0, 1))
+        > fast.apply_signals(inputs, (0xffff, 0, 1))
+    )
+
+
+def test_glitch_statistics(ksa: tuple[KSA16R2Cin, Netlist]) -> None:
+    cell, netlist = ksa
+    inputs, outputs = _ports(cell, netlist)
+    sim = TimedSimulator(netlist)
+    rng = random.Random(0)
+
+    for _ in range(20):
+        before = list(sim.values)
+        sim.apply_signals(
+            inputs, (rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(1))
+        )
+        for n in range(netlist.num_nets):
+            changed = sim.values[n] != before[n]
+            assert sim.transitions[n] >= changed
+
+    assert all(
+        g <= t // 2 for g, t in zip(sim.glitches, sim.transitions)
+    )
+    by_type = sim.glitches_by_cell_type(cell)
+    assert sum(by_type.values()) == sum(sim.glitches) > 0
+    assert "PGMergeR2" in by_type
+    assert set(sim.glitches_by_cell_type(cell, depth=2)) <= {
+        "AND2", "OR2", "NOT", "NOR2", "NAND2", "XOR2", "XNOR2", "BUF1",
+    }
+
+    sim.reset()
+    assert sum(sim.glitches) == sum(sim.transitions) == 0
+
+
+def test_inertial_delay(ksa: tuple[KSA16R2Cin, Netlist]) -> None:
+    cell, netlist = ksa
+    inputs, outputs = _ports(cell, netlist)
+    rng = random.Random(2)
+    delays = [rng.randint(1, 4) for _ in netlist.transistors]
+    transport = TimedSimulator(netlist, delays)
+    inertial = TimedSimulator(netlist, delays, inertial=4)
+
+    for _ in range(50):
+        signals = (rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(1))
+        transport.apply_signals(inputs, signals)
+        inertial.apply_signals(inputs, signals)
+        assert inertial.signal(outputs) == transport.signal(outputs)
+        assert inertial.values == transport.values
+
+    assert transport.num_filtered == 0
+    assert inertial.num_filtered > 0
+    assert inertial.num_events < transport.num_events
+    assert sum(inertial.glitches) < sum(transport.glitches)
+
+
+def test_invalid_delays(ksa: tuple[KSA16R2Cin, Netlist]) -> None:
+    _, netlist = ksa
+
+    with pytest.raises(ValueError):
+        TimedSimulator(netlist, [1])
+    with pytest.raises(ValueError):
+        TimedSimulator(netlist, [0] * len(netlist.transistors))
+    with pytest.raises(ValueError):
+        TimedSimulator(netlist, inertial=-1)
+
+
+def test_static_timing(ksa: tuple[KSA16R2Cin, Netlist]) -> None:
+    cell, netlist = ksa
+    inputs, outputs = _ports(cell, netlist)
+    sta = StaticTiming(netlist)
+    levels = netlist.levels()
+
+    assert sta.longest(outputs) == max(levels[n] for n in outputs)
+    assert 0 < sta.shortest(outputs) <= sta.longest(outputs)
+    assert sum(sta.histogram(outputs).values()) == len(outputs)
+    assert list(sta.histogram(outputs)) == sorted(sta.histogram(outputs))
+
+    for n in outputs:
+        for path, arrival in (
+            (sta.critical_path(n), sta.latest[n]),
+            (sta.shortest_path(n), sta.earliest[n]),
+        ):
+            assert sum(sta.delays[t] for t in path) == arrival
+            assert netlist.transistors[path[-1]][2] == n
+            gate, source, _, _ = netlist.transistors[path[0]]
+            assert {gate, source} & set(sta.inputs)
+
+    # the carry-out crosses one cell per layer (except the sum layer)
+    crossed = [c for _, c in sta.cells(cell, sta.critical_path(outputs[-1]))]
+    layers = [
+        k for c in crossed for k, layer in enumerate(cell.layers)
+        if any(c is m for m in layer)
+    ]
+    assert layers == list(range(len(cell.layers) - 1))
+    assert len(crossed) == len(layers)
+    names, _ = sta.cells(cell, sta.critical_path(outputs[-1]), depth=2)[0]
+    assert names[0] == "KSA16R2Cin" and len(names) == 3
+
+
+@pytest.mark.parametrize("seed", (0, 1))
+def test_static_timing_bounds(seed: int, ksa: tuple[KSA16R2Cin, Netlist]) -> None:
+    cell, netlist = ksa
+    inputs, outputs = _ports(cell, netlist)
+    rng = random.Random(seed)
+    delays = [rng.randint(1, 10) for _ in netlist.transistors]
+    sta = StaticTiming(netlist, delays)
+    sim = TimedSimulator(netlist, delays)
+
+    # simulated settle times never exceed the static bound
+    for _ in range(50):
+        settled = sim.apply_signals(
+            inputs, (rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(1))
+        )
+        assert settled <= sta.longest(outputs)
+        for n, time in zip(outputs, sim.settle_times(outputs)):
+            assert time <= sta.latest[n]
+            if time:
+                assert time >= sta.earliest[n]
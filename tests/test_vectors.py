@@ -0,0 +1,86 @@
+import pathlib
+from typing import IO, Any
+
+import pytest
+
+from .utils import ksa_16r2
+from src.circuits import *
+from src.circuits import vectors as vectors_module
+
+
+def test_vector_file_round_trip(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "vectors.bin"
+    operands = [(0, 0, 0), (0xffff, 1, 0), (0x1234, 0x4321, 1)]
+
+    assert write_vectors(path, 16, operands) == 3
+
+    with VectorFile(path) as vectors:
+        assert len(vectors) == 3
+        assert vectors.width == 16
+        assert list(vectors) == [
+            (0, 0, 0, 0, False),
+            (0xffff, 1, 0, 0, True),
+            (0x1234, 0x4321, 1, 0x5556, False),
+        ]
+        assert vectors[1] == (0xffff, 1, 0, 0, True)
+
+        with pytest.raises(IndexError):
+            vectors[3]
+
+
+def test_run_vectors(tmp_path: pathlib.Path, ksa_16r2: AdderInterface) -> None:
+    vector_path = tmp_path / "vectors.bin"
+    result_path = tmp_path / "results.bin"
+    generate_vectors(vector_path, 16, 250, seed=0)
+
+    with VectorFile(vector_path) as vectors:
+        with ResultFile.create(result_path, 16, len(vectors)) as results:
+            assert run_vectors(ksa_16r2, vectors, results) == []
+
+    with VectorFile(vector_path) as vectors, ResultFile(result_path) as results:
+        assert [r[3:] for r in vectors] == list(results)
+
+
+def test_rejects_foreign_files(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "vectors.bin"
+    write_vectors(path, 16, [(1, 2, 0)])
+
+    with pytest.raises(ValueError):
+        ResultFile(path)
+
+
+def test_close_with_live_views(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "vectors.bin"
+    write_vectors(path, 16, [(1, 2, 0), (0xffff, 1, 0), (3, 4, 1)])
+
+    vectors = VectorFile(path)
+    records = iter(vectors)
+    view = vectors.records()
+    assert next(records) == (1, 2, 0, 3, False)
+
+    vectors.close()
+    assert vectors._file.closed
+    assert list(records) == [(0xffff, 1, 0, 0, True), (3, 4, 1, 8, False)]
+    assert len(view) == 3 * vectors.record_size
+    view.release()
+
+
+@pytest.mark.parametrize("size", (4, 20, -1))
+def test_truncated_files_are_closed(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch, size: int
+) -> None:
+    path = tmp_path / "vectors.bin"
+    write_vectors(path, 16, [(1, 2, 0), (3, 4, 1)])
+    path.write_bytes(path.read_bytes()[:size])
+
+    files = list()
+
+    def record(*args: Any, **kwargs: Any) -> IO[bytes]:
+        files.append(open(*args, **kwargs))
+        return files[-1]
+
+    monkeypatch.setattr(vectors_module, "open", record, raising=False)
+
+    with pytest.raises(ValueError, match="truncated"):
+        VectorFile(path)
+    assert files and all(f.closed for f in files)
@@ -1,7 +1,9 @@
 import itertools
 from typing import TypeVar, Any, Generic, Union
 
-from src.circuits import Cell, VDD, Via, Cap
+import pytest
+
+from src.circuits import Cell, VDD, Via, Cap, AdderInterface, KSA16R2Cin
 
 
 IN2 = tuple(itertools.product((False, True), (False, True)))
@@ -29,3 +31,16 @@ class CellBuilder(Generic[_SC]):
 def register_caps(*vias: Via, identity: Union[Any, None] = None) -> None:
     for v in vias:
         v.register(Cap(identity))
+
+
+def energized_adder(cell_type: type[Cell] = KSA16R2Cin) -> AdderInterface:
+    vdd = VDD()
+    adder = AdderInterface(cell_type(vdd))
+    vdd.energize()
+
+    return adder
+
+
+@pytest.fixture(scope="session")
+def ksa_16r2() -> AdderInterface:
+    return energized_adder()